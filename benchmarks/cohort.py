@@ -0,0 +1,77 @@
+"""코호트 탐색 페이지 집계 벤치마크.
+
+기준 코호트를 N 배로 복제한 Parquet 파일(16k -> 수백만 행)에 대해
+큐브 생성 시간(파일당 한 번)과 필터 조회 시간(상호작용마다)을 측정합니다.
+조회 시간은 큐브 크기에만 의존하므로 환자 수가 늘어도 거의 일정해야 합니다.
+
+    python -m benchmarks.cohort --scales 1 16 128
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pyarrow.parquet as pq
+
+from qaqc.cohort_cube import CohortCube, build_cube
+from qaqc.cohort_store import COHORT_PATH, ROW_GROUP_SIZE, ensure_cohort
+
+QUERIES = [
+    ((20, 85), ["Underweight", "Normal", "Overweight", "Obesity"], None),
+    ((40, 60), ["Overweight", "Obesity"], True),
+    ((30, 45), ["Normal"], False),
+]
+
+
+def scaled_cohort(path, scale):
+    """기준 코호트를 scale 배로 이어 붙인 Parquet 파일을 만듭니다."""
+    table = pq.read_table(ensure_cohort(COHORT_PATH))
+    with pq.ParquetWriter(path, table.schema) as writer:
+        for _ in range(scale):
+            writer.write_table(table, row_group_size=ROW_GROUP_SIZE * 16)
+    return table.num_rows * scale
+
+
+def query(cube, age_range, bmi_categories, liver_abnormal):
+    cells = cube.select(age_range, bmi_categories, liver_abnormal)
+    CohortCube.histogram(cells)
+    CohortCube.summarize(cells, ["age_band", "BMI_category"])
+    CohortCube.summarize(cells, "liver_abnormal")
+
+
+def run(scales, repeat=20):
+    """{행 수: (큐브 생성 ms, 조회 중앙값 ms, 큐브 행 수)}"""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in scales:
+            path = os.path.join(tmp, f"cohort_x{scale}.parquet")
+            rows = scaled_cohort(path, scale)
+            started = time.perf_counter()
+            cube = CohortCube(build_cube(path), None)
+            build = time.perf_counter() - started
+            timings = []
+            for _ in range(repeat):
+                for filters in QUERIES:
+                    started = time.perf_counter()
+                    query(cube, *filters)
+                    timings.append(time.perf_counter() - started)
+            timings.sort()
+            results[rows] = (build * 1000, timings[len(timings) // 2] * 1000, len(cube.cube))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 16, 128])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    print(f"{'rows':>11s} {'cube build':>11s} {'query':>9s} {'cube rows':>10s}")
+    for rows, (build, query_ms, cells) in run(args.scales, args.repeat).items():
+        print(f"{rows:11,d} {build:9.1f}ms {query_ms:7.2f}ms {cells:10,d}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
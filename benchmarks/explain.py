@@ -0,0 +1,64 @@
+"""SHAP 기여도 계산 비용 벤치마크.
+
+- 클릭당: predict_patient (예측) 대비 explain_patient (SHAP) 추가 시간 (캐시 미적용)
+- 코호트 중요도: global_importance 첫 계산 시간 (표본 GLOBAL_SAMPLE 행, 앱 시작 시 백그라운드에서 실행)
+- 배치: 청크 크기별 explain_chunk 처리량 (rows/s)
+
+    python -m benchmarks.explain --repeat 20
+"""
+import argparse
+import sys
+import time
+
+import pandas as pd
+
+from benchmarks import standin
+from benchmarks.inference import sample_rows, time_call
+from qaqc.explain import GLOBAL_SAMPLE, clear_importances, explain_chunk, explain_patient, global_importance
+from qaqc.features import INPUT_COLUMNS
+from qaqc.inference import predict_patient
+from qaqc.model_registry import get_model
+from qaqc.patient import PatientRecord
+
+CHUNK_SIZES = [1_000, 10_000, 50_000]
+
+
+def run(model_path=None, repeat=20):
+    """(예측 ms, SHAP ms, 코호트 중요도 첫 계산 ms, {청크 크기: rows/s})"""
+    model = get_model(model_path or standin.model_path())
+    rows = sample_rows(max(CHUNK_SIZES))
+    patients = [PatientRecord.from_columns(dict(zip(INPUT_COLUMNS, row))) for row in rows[:repeat]]
+
+    predict_patient(model, patients[0])
+    explain_patient(model, patients[0])
+    predict_ms = sum(time_call(lambda: predict_patient(model, p), 1) for p in patients) / len(patients) * 1000
+    explain_ms = sum(time_call(lambda: explain_patient(model, p), 1) for p in patients) / len(patients) * 1000
+
+    clear_importances()
+    global_ms = time_call(lambda: global_importance(model), 1) * 1000
+
+    throughput = {}
+    for size in CHUNK_SIZES:
+        chunk = pd.DataFrame(rows[:size], columns=INPUT_COLUMNS)
+        started = time.perf_counter()
+        explain_chunk(model, chunk)
+        throughput[size] = size / (time.perf_counter() - started)
+    return predict_ms, explain_ms, global_ms, throughput
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default=None, help="모델 경로 (기본: 실제 모델, 없으면 대체 모델)")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    predict_ms, explain_ms, global_ms, throughput = run(args.model, args.repeat)
+    print(f"per click: predict {predict_ms:.2f}ms  + SHAP {explain_ms:.2f}ms")
+    print(f"global importance ({GLOBAL_SAMPLE:,} rows, cold): {global_ms:.0f}ms")
+    for size, rate in throughput.items():
+        print(f"batch chunk {size:>7,d}: {rate:10,.0f} rows/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""CatBoost 추론 경로 마이크로 벤치마크.
+
+예전 방식(DataFrame 입력으로 predict + predict_proba 두 번 호출)과
+qaqc.inference.Predictor(float32 행렬, predict_proba 한 번)를 1 / 1k / 100k 행에서 비교합니다.
+
+    python -m benchmarks.inference --repeat 20
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks import standin
+from qaqc.features import FEATURE_COLUMNS, INPUT_COLUMNS, transform_array
+from qaqc.inference import BULK_THREADS, LOW_LATENCY_THREADS, Predictor
+from qaqc.model_registry import get_model
+
+COHORT_CSV = "files/test_with_predictions.csv"
+SIZES = [1, 1_000, 100_000]
+
+
+def sample_rows(n, seed=0):
+    """코호트 CSV 에서 n 행을 (중복 허용) 뽑아 입력 행렬로 반환합니다."""
+    data = pd.read_csv(COHORT_CSV, usecols=INPUT_COLUMNS)[INPUT_COLUMNS].to_numpy(dtype=np.float64)
+    return data[np.random.default_rng(seed).integers(0, len(data), n)]
+
+
+def legacy_predict(model, rows):
+    features = pd.DataFrame(transform_array(rows), columns=FEATURE_COLUMNS)
+    return model.predict(features), model.predict_proba(features)[:, 0]
+
+
+def time_call(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+
+def run(model_path=None, repeat=10):
+    """{행 수: (예전 ms, Predictor ms)} 중앙값을 반환합니다."""
+    model = get_model(model_path or standin.model_path())
+    pool = sample_rows(max(SIZES))
+    results = {}
+    for n in SIZES:
+        rows = pool[:n]
+        predictor = Predictor(model, thread_count=LOW_LATENCY_THREADS if n == 1 else BULK_THREADS)
+        labels, prob0 = predictor.predict(rows)
+        legacy_labels, legacy_prob0 = legacy_predict(model, rows)
+        # 두 경로의 결과가 같아야 비교 의미가 있음
+        assert np.array_equal(labels, legacy_labels) and np.allclose(prob0, legacy_prob0)
+        reps = max(1, repeat // 5) if n >= 100_000 else repeat
+        old = time_call(lambda: legacy_predict(model, rows), reps)
+        new = time_call(lambda: predictor.predict(rows), reps)
+        results[n] = (old * 1000, new * 1000)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default=None, help="모델 경로 (기본: 실제 모델, 없으면 대체 모델)")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    print(f"{'rows':>8s} {'legacy':>10s} {'predictor':>10s} {'speedup':>8s}")
+    for n, (old, new) in run(args.model, args.repeat).items():
+        print(f"{n:8,d} {old:8.2f}ms {new:8.2f}ms {old / new:7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""페이지 그래프 생성 + JSON 직렬화 시간 마이크로 벤치마크.
+
+배경 캐시가 비어 있는 경우(매 rerun 마다 전체 생성)와 캐시된 경우를 비교합니다.
+st.plotly_chart 와 같이 fig.to_dict() 후 plotly.io.to_json(validate=False) 로 직렬화합니다.
+
+    python -m benchmarks.page_render --repeat 200
+"""
+import argparse
+import importlib
+import sys
+import time
+
+import plotly.io as pio
+
+from qaqc.figures import clear_templates
+
+# (페이지 모듈, 그래프 함수, 인자)
+CASES = [
+    ("bmi", "bmi_figure", (25.7,)),
+    ("bmi", "waist_figure", (84.0,)),
+    ("hemoglobin", "hemoglobin_figure", (12.0,)),
+    ("blood_pressure", "blood_pressure_figure", (114.0, 68.0)),
+    ("liver(AST, ALT, Gtp)", "liver_figure", (26.0, 11.0, 12.0)),
+    ("cholesterol etc", "cholesterol_figure", ({"Cholesterol": 230.0, "LDL": 144.0, "HDL": 72.0, "triglyceride": 71.0},)),
+    ("serum creatinine_urine protein", "kidney_figure", ({"혈청 크레아티닌": 0.6, "요단백": 1.0, "혈당": 86.0},)),
+]
+
+
+def render(figure_fn, args):
+    return pio.to_json(figure_fn(*args).to_dict(), validate=False)
+
+
+def time_case(figure_fn, args, repeat, cold):
+    timings = []
+    for _ in range(repeat):
+        if cold:
+            clear_templates()
+        started = time.perf_counter()
+        render(figure_fn, args)
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+
+def run(repeat=100):
+    """{이름: (캐시 없음 ms, 캐시 ms)} 중앙값을 반환합니다."""
+    results = {}
+    for module_name, fn_name, args in CASES:
+        figure_fn = getattr(importlib.import_module(f"pages.{module_name}"), fn_name)
+        render(figure_fn, args)  # import/첫 호출 비용 제외
+        cold = time_case(figure_fn, args, repeat, cold=True)
+        warm = time_case(figure_fn, args, repeat, cold=False)
+        results[fn_name] = (cold * 1000, warm * 1000)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    print(f"{'figure':24s} {'uncached':>10s} {'cached':>10s} {'speedup':>8s}")
+    for name, (cold, warm) in run(args.repeat).items():
+        print(f"{name:24s} {cold:8.2f}ms {warm:8.2f}ms {cold / warm:7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
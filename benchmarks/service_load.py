@@ -0,0 +1,115 @@
+"""qaqc.service 지연 시간(p50/p99)과 처리량 부하 테스트.
+
+서비스를 별도 프로세스로 띄운 뒤, 동시 연결 N개로 /predict 를 반복 호출하고
+/predict/batch (NDJSON) 처리량을 측정합니다. 예산을 넘으면 exit 1.
+
+    python -m benchmarks.service_load --requests 2000 --concurrency 32 --p99-budget-ms 250
+"""
+import argparse
+import asyncio
+import json
+import socket
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from tornado.httpclient import AsyncHTTPClient, HTTPClientError
+
+from qaqc.cohort_store import COHORT_CSV
+from qaqc.features import INPUT_COLUMNS
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _wait_ready(client, base_url, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            await client.fetch(f"{base_url}/healthz")
+            return
+        except (OSError, HTTPClientError):
+            await asyncio.sleep(0.1)
+    raise RuntimeError("service did not become ready")
+
+
+async def single_requests(client, base_url, bodies, concurrency):
+    latencies = []
+    queue = asyncio.Queue()
+    for body in bodies:
+        queue.put_nowait(body)
+
+    async def worker():
+        while not queue.empty():
+            body = queue.get_nowait()
+            started = time.perf_counter()
+            await client.fetch(f"{base_url}/predict", method="POST", body=body)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return np.array(latencies), time.perf_counter() - started
+
+
+async def batch_stream(client, base_url, body):
+    started = time.perf_counter()
+    response = await client.fetch(
+        f"{base_url}/predict/batch", method="POST", body=body,
+        headers={"Content-Type": "application/x-ndjson"}, request_timeout=600,
+    )
+    return response.body.count(b"\n"), time.perf_counter() - started
+
+
+async def run(args):
+    records = pd.read_csv(COHORT_CSV, usecols=INPUT_COLUMNS)[INPUT_COLUMNS].to_dict("records")
+    bodies = [json.dumps(records[i % len(records)]) for i in range(args.requests)]
+    ndjson = "\n".join(json.dumps(records[i % len(records)]) for i in range(args.batch_rows)).encode()
+
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = subprocess.Popen([sys.executable, "-m", "qaqc.service", "--port", str(port)])
+    client = AsyncHTTPClient(max_clients=args.concurrency)
+    try:
+        await _wait_ready(client, base_url)
+        await single_requests(client, base_url, bodies[:100], args.concurrency)  # 워밍업
+        latencies, elapsed = await single_requests(client, base_url, bodies, args.concurrency)
+        rows, batch_elapsed = await batch_stream(client, base_url, ndjson)
+        health = json.loads((await client.fetch(f"{base_url}/healthz")).body)
+    finally:
+        server.terminate()
+        server.wait()
+
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+    print(f"/predict       {len(latencies):,} req, concurrency {args.concurrency}: "
+          f"p50 {p50:.1f}ms  p99 {p99:.1f}ms  {len(latencies) / elapsed:,.0f} req/s")
+    print(f"/predict/batch {rows:,} rows (NDJSON): {rows / batch_elapsed:,.0f} rows/s")
+    print(f"micro-batching: {health['batches']:,} batches, mean {health['mean_batch_rows']:.1f} rows/batch")
+
+    failed = False
+    if p99 > args.p99_budget_ms:
+        print(f"🚨 p99 지연 시간이 예산({args.p99_budget_ms}ms)을 초과했습니다.")
+        failed = True
+    if len(latencies) / elapsed < args.min_rps:
+        print(f"🚨 처리량이 최소 기준({args.min_rps} req/s)보다 낮습니다.")
+        failed = True
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--batch-rows", type=int, default=100_000)
+    parser.add_argument("--p99-budget-ms", type=float, default=250.0)
+    parser.add_argument("--min-rps", type=float, default=200.0)
+    args = parser.parse_args(argv)
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+"""실제 모델(pickle)이 없을 때 벤치마크에 쓰는 작은 대체 모델.
+
+기준 코호트 CSV 의 smoking_pred 를 정답으로 작은 CatBoost 모델을 학습해 임시 디렉터리에 저장합니다.
+(네트워크 없이 저장소 파일만으로 동작, 한 번 만든 뒤에는 재사용)
+"""
+import os
+import pickle
+import tempfile
+
+import pandas as pd
+
+from qaqc.cohort_store import COHORT_CSV
+from qaqc.features import FEATURE_COLUMNS, INPUT_COLUMNS, transform_array
+from qaqc.model_registry import MODEL_PATH
+
+STANDIN_PATH = os.path.join(tempfile.gettempdir(), "qaqc-standin-model.pkl")
+
+
+def build_standin(path=STANDIN_PATH, csv_path=COHORT_CSV, iterations=100, depth=6):
+    from catboost import CatBoostClassifier
+
+    cohort = pd.read_csv(csv_path)
+    features = pd.DataFrame(transform_array(cohort[INPUT_COLUMNS]).astype("float32"), columns=FEATURE_COLUMNS)
+    model = CatBoostClassifier(
+        iterations=iterations, depth=depth, random_seed=0, verbose=0, allow_writing_files=False, thread_count=-1,
+    )
+    model.fit(features, cohort["smoking_pred"])
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(model, f)
+    os.replace(tmp_path, path)
+    return path
+
+
+def model_path(path=MODEL_PATH):
+    """실제 모델이 있으면 그 경로, 없으면 대체 모델 경로 (없으면 학습)."""
+    if os.path.exists(path):
+        return path
+    if not os.path.exists(STANDIN_PATH):
+        build_standin()
+    return STANDIN_PATH
+
+
+def is_standin(path):
+    return path == STANDIN_PATH
@@ -0,0 +1,87 @@
+"""추론 앱(main.py + pages)의 콜드 스타트 import 시간 벤치마크.
+
+`python -X importtime` 으로 새 인터프리터에서 import 시간을 측정하고,
+예산(--budget)을 넘거나 학습 전용 패키지가 import 되면 실패(exit 1)합니다.
+
+    python -m benchmarks.startup --budget 2.5
+"""
+import argparse
+import ast
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+ENTRY_FILES = [ROOT / "main.py", *sorted((ROOT / "pages").glob("*.py"))]
+
+# 추론 경로에서 절대 import 되면 안 되는 학습/시각화 전용 패키지
+FORBIDDEN = ("sklearn", "imblearn", "seaborn", "matplotlib", "joblib")
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def collect_imports(paths):
+    # 모듈 최상단의 import 문만 수집 (함수 내부의 지연 import는 제외)
+    modules = set()
+    for path in paths:
+        tree = ast.parse(path.read_text(encoding="utf-8"))
+        for node in tree.body:
+            if isinstance(node, ast.Import):
+                modules.update(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+                modules.add(node.module)
+    return sorted(modules)
+
+
+def measure(modules):
+    code = "import " + ", ".join(modules)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    top_level = {}
+    imported = set()
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if not match:
+            continue
+        _, cumulative, indent, name = match.groups()
+        imported.add(name.split(".")[0])
+        if not indent:
+            top_level[name] = int(cumulative) / 1e6
+    return top_level, imported
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget", type=float, default=2.5, help="허용 콜드 스타트 시간(초)")
+    parser.add_argument("--repeat", type=int, default=3, help="반복 측정 횟수 (최솟값 사용)")
+    args = parser.parse_args(argv)
+
+    modules = collect_imports(ENTRY_FILES)
+    runs = [measure(modules) for _ in range(args.repeat)]
+    top_level, imported = min(runs, key=lambda run: sum(run[0].values()))
+    total = sum(top_level.values())
+
+    print(f"import {', '.join(modules)}")
+    for name, seconds in sorted(top_level.items(), key=lambda item: -item[1])[:10]:
+        print(f"  {seconds * 1000:8.1f} ms  {name}")
+    print(f"cold start: {total:.3f}s (budget {args.budget:.3f}s)")
+
+    failed = False
+    leaked = sorted(imported.intersection(FORBIDDEN))
+    if leaked:
+        print(f"🚨 학습 전용 패키지가 import 되었습니다: {', '.join(leaked)}")
+        failed = True
+    if total > args.budget:
+        print("🚨 콜드 스타트 시간이 예산을 초과했습니다.")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+"""대시보드 성능 벤치마크 모음 + JSON 기준값(baseline) 비교.
+
+    python -m benchmarks.suite --save benchmarks/baseline.json     # 기준값 저장
+    python -m benchmarks.suite --compare benchmarks/baseline.json  # 비교 (회귀 시 종료 코드 1)
+    python -m benchmarks.suite --filter features --quick
+    QAQC_BENCH_BASELINE=benchmarks/baseline.json python -m pytest tests/bench_suite.py  # 같은 항목을 pytest 로
+
+실제 모델(files/catboost_model(final).pkl)이 없으면 benchmarks.standin 의 대체 모델로 측정합니다.
+기준값은 같은 기계/같은 모델에서 만든 것끼리만 비교해야 의미가 있습니다.
+"""
+import argparse
+import importlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from benchmarks import standin
+from benchmarks.page_render import CASES as PAGE_CASES, render
+from qaqc.audit import AuditLog, audit_record
+from qaqc.cohort_store import COHORT_CSV, COHORT_PATH, ensure_cohort, read_cohort
+from qaqc.drift import DriftMonitor, get_reference
+from qaqc.explain import clear_importances, explain_patient, global_importance
+from qaqc.features import INPUT_COLUMNS, transform, transform_array
+from qaqc.figures import clear_templates
+from qaqc.inference import BULK_THREADS, LOW_LATENCY_THREADS, Predictor, predict_patient
+from qaqc.model_registry import clear_cache, get_model
+from qaqc.patient import PatientRecord
+from qaqc.profiler import Profile
+from qaqc.report import ReportRenderer, generate_reports
+from qaqc.whatif import sweep, sweep_values
+
+# 기준값 대비 이 비율보다 느려지면 회귀 (공유 CI 기계의 잡음을 고려한 값, 항목별로 조정 가능)
+DEFAULT_THRESHOLD = 1.5
+NOISY_THRESHOLD = 2.0
+# 이보다 작은 차이는 측정 잡음으로 보고 회귀로 판정하지 않음
+NOISE_FLOOR_MS = 1.0
+# report.generate 에서 리포트를 만들 환자 수
+REPORT_PATIENTS = 200
+
+
+@dataclass
+class Case:
+    name: str
+    fn: object
+    rounds: int = 20
+    threshold: float = DEFAULT_THRESHOLD
+    setup: object = None
+    # 처리량(건/초)을 함께 표시할 때 한 번 실행에서 처리하는 건수
+    items: int = None
+
+
+def cohort_rows(n, seed=0):
+    """기준 코호트 입력값을 복원 추출한 (n, 22) 행렬 (1M 행 등 큰 합성 코호트용)."""
+    data = pd.read_csv(COHORT_CSV, usecols=INPUT_COLUMNS)[INPUT_COLUMNS].to_numpy(dtype=np.float64)
+    return data[np.random.default_rng(seed).integers(0, len(data), n)]
+
+
+def build_cases(model_path, quick=False):
+    big = 100_000 if quick else 1_000_000
+    big_label = "100k" if quick else "1M"
+    rows = cohort_rows(big)
+    frame_10k = pd.DataFrame(rows[:10_000], columns=INPUT_COLUMNS)
+    frame_100k = pd.DataFrame(rows[:100_000], columns=INPUT_COLUMNS).assign(Patient_ID=np.arange(1, 100_001))
+    model = get_model(model_path)
+    single = Predictor(model, thread_count=LOW_LATENCY_THREADS)
+    bulk = Predictor(model, thread_count=BULK_THREADS)
+    patient = PatientRecord.from_columns(dict(zip(INPUT_COLUMNS, rows[0])))
+    grid = {"weight(kg)": sweep_values("weight(kg)", 50), "Gtp": sweep_values("Gtp", 50)}
+    ensure_cohort(COHORT_PATH)
+    drift = DriftMonitor(get_reference())
+    audit_log = AuditLog(os.path.join(tempfile.gettempdir(), "qaqc_bench_audit.sqlite3"))
+    prediction = predict_patient(model, patient)
+    renderer = ReportRenderer(model_path)
+    report_input = os.path.join(tempfile.gettempdir(), "qaqc_bench_report_patients.csv")
+    report_output = os.path.join(tempfile.gettempdir(), "qaqc_bench_reports.zip")
+    pd.DataFrame(rows[:REPORT_PATIENTS], columns=INPUT_COLUMNS).to_csv(report_input, index=False)
+
+    def cold_model_load():
+        clear_cache()
+        get_model(model_path)
+
+    cases = [
+        Case("features.transform_array[1]", lambda: transform_array(rows[:1])),
+        Case("features.transform_array[10k]", lambda: transform_array(rows[:10_000])),
+        Case(f"features.transform_array[{big_label}]", lambda: transform_array(rows), rounds=3),
+        Case("features.transform[10k DataFrame]", lambda: transform(frame_10k)),
+        Case("model.load[cold]", cold_model_load, rounds=5, threshold=NOISY_THRESHOLD),
+        Case("model.get[warm]", lambda: get_model(model_path)),
+        Case("predict_proba[1]", lambda: single.predict_proba(rows[:1])),
+        Case("predict_proba[10k]", lambda: bulk.predict_proba(rows[:10_000]), rounds=5),
+        Case("predict_proba[100k]", lambda: bulk.predict_proba(rows[:100_000]), rounds=3),
+        Case("predict_patient", lambda: predict_patient(model, patient)),
+        Case("explain_patient", lambda: explain_patient(model, patient)),
+        Case("explain.global_importance[cold]", lambda: global_importance(model), rounds=3, setup=clear_importances,
+             threshold=NOISY_THRESHOLD),
+        Case("whatif.sweep[50x50]", lambda: sweep(model, patient, grid)),
+        Case("audit.log[1]", lambda: audit_log.log(audit_record(prediction, model.version, "P-1"))),
+        Case("drift.update[1]", lambda: drift.update(rows[0], 0.9)),
+        Case("drift.update[100k]", lambda: drift.update(rows[:100_000]), rounds=5),
+        Case("drift.report", drift.report),
+        Case("report.render[1]", lambda: renderer.render(1, patient, prediction.probability), items=1),
+        Case(f"report.generate[{REPORT_PATIENTS} -> zip]", lambda: generate_reports(
+            report_input, report_output, model_path, workers=1, log=io.StringIO()), rounds=3, items=REPORT_PATIENTS),
+        Case("profiler.update[100k]", lambda: Profile().update(frame_100k), rounds=5),
+        Case("cohort.read_csv", lambda: pd.read_csv(COHORT_CSV), rounds=5, threshold=NOISY_THRESHOLD),
+        Case("cohort.parquet[pandas]", lambda: read_cohort(path=COHORT_PATH).to_pandas(), rounds=5),
+        Case("cohort.parquet[arrow, 3 cols]", lambda: read_cohort(["age", "BMI", "smoking_prob_0"], path=COHORT_PATH)),
+    ]
+    for module_name, fn_name, args in PAGE_CASES:
+        figure_fn = getattr(importlib.import_module(f"pages.{module_name}"), fn_name)
+        cases.append(Case(f"page.{fn_name}[cold]", lambda f=figure_fn, a=args: render(f, a), setup=clear_templates,
+                          threshold=NOISY_THRESHOLD))
+        cases.append(Case(f"page.{fn_name}[warm]", lambda f=figure_fn, a=args: render(f, a)))
+    return cases
+
+
+def time_case(case):
+    case.fn()  # 첫 호출(import, 캐시 생성) 제외
+    timings = []
+    for _ in range(case.rounds):
+        if case.setup is not None:
+            case.setup()
+        started = time.perf_counter()
+        case.fn()
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return {
+        "median_ms": timings[len(timings) // 2] * 1000,
+        "min_ms": timings[0] * 1000,
+        **({"per_second": case.items / timings[len(timings) // 2]} if case.items else {}),
+        "rounds": case.rounds,
+        "threshold": case.threshold,
+    }
+
+
+def run(model_path=None, name_filter=None, quick=False, log=sys.stderr):
+    model_path = model_path or standin.model_path()
+    results = {}
+    for case in build_cases(model_path, quick):
+        if name_filter and name_filter not in case.name:
+            continue
+        results[case.name] = time_case(case)
+        throughput = f"  {results[case.name]['per_second']:,.1f}/s" if case.items else ""
+        print(f"  {case.name:42s} {results[case.name]['median_ms']:10.3f}ms{throughput}", file=log)
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "model": "stand-in" if standin.is_standin(model_path) else model_path,
+            "model_version": get_model(model_path).version,
+            "quick": quick,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold=None):
+    """(이름, 기준 ms, 현재 ms, 비율, 회귀 여부) 목록. 기준값에 없는 항목은 건너뜁니다.
+
+    다른 프로세스의 간섭은 시간을 늘리기만 하므로, 중앙값보다 안정적인 최솟값(min_ms)으로 비교합니다.
+    """
+    rows = []
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        ratio = result["min_ms"] / base["min_ms"] if base["min_ms"] else float("inf")
+        regressed = ratio > (threshold or result["threshold"]) and result["min_ms"] - base["min_ms"] > NOISE_FLOOR_MS
+        rows.append((name, base["min_ms"], result["min_ms"], ratio, regressed))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default=None, help="모델 경로 (기본: 실제 모델, 없으면 대체 모델)")
+    parser.add_argument("--filter", default=None, help="이름에 이 문자열이 포함된 항목만 실행")
+    parser.add_argument("--quick", action="store_true", help="1M 행 대신 100k 행")
+    parser.add_argument("--save", default=None, help="결과를 JSON 기준값으로 저장할 경로")
+    parser.add_argument("--compare", default=None, help="비교할 JSON 기준값 경로")
+    parser.add_argument("--threshold", type=float, default=None, help="모든 항목에 같은 회귀 비율 적용 (예: 1.2)")
+    args = parser.parse_args(argv)
+
+    current = run(args.model, args.filter, args.quick)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(current, f, ensure_ascii=False, indent=2)
+        print(f"✅ baseline saved -> {args.save}")
+    if not args.compare:
+        return 0
+
+    with open(args.compare, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline["meta"].get("model_version") != current["meta"]["model_version"]:
+        print("⚠️ 기준값과 모델 버전이 다릅니다. 예측 관련 항목의 비교는 참고용입니다.")
+    rows = compare(current, baseline, args.threshold)
+    print(f"{'case':42s} {'baseline':>10s} {'current':>10s} {'ratio':>7s}")
+    for name, base_ms, current_ms, ratio, regressed in rows:
+        mark = "🚨" if regressed else "  "
+        print(f"{mark}{name:40s} {base_ms:8.3f}ms {current_ms:8.3f}ms {ratio:6.2f}x")
+    regressions = [row for row in rows if row[4]]
+    if regressions:
+        print(f"🚨 {len(regressions)} regression(s)")
+        return 1
+    print("✅ no regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,20 +1,19 @@
-import importlib
-import pickle
-import joblib
-from sklearn.utils import resample
-from sklearn.model_selection import train_test_split, StratifiedKFold
-from sklearn.preprocessing import StandardScaler
-from imblearn.over_sampling import SMOTE
-from sklearn.model_selection import RandomizedSearchCV
-from catboost import CatBoostClassifier
+# 추론 전용 엔트리 - 학습용 의존성(sklearn, imblearn, joblib 등)은 training 패키지에서 지연 import
+import os
 import streamlit as st
 import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import plotly.express as px
-import plotly.graph_objects as go
-import seaborn as sns
 import warnings
+from qaqc.audit import audit_record, get_audit_log
+from qaqc.drift import get_monitor
+from qaqc.explain import cached_importance, explain_patient, get_explanation_cache, warm_global_importance
+from qaqc.inference import predict_patient
+from qaqc.instrumentation import begin_request, count, end_request, flame_table, is_enabled, stage
+from qaqc.model_registry import get_model
+from qaqc.page_registry import load_pages, render_page, timings
+from qaqc.patient import PatientRecord
+from qaqc.prediction_cache import get_prediction_cache, prediction_key
+from qaqc.shadow import get_shadow
+from qaqc.widgets import explanation_panel
 warnings.filterwarnings('ignore')
 
 # `st.set_page_config()` 실행
@@ -32,37 +31,52 @@ hide_menu_style = """
 """
 st.markdown(hide_menu_style, unsafe_allow_html=True)
 
+# 🔬 관리자 전용 프로파일링 (QAQC_ADMIN=1 일 때만 토글 표시, 꺼져 있으면 측정 비용 없음)
+# 토글 값은 st.session_state["profiling"] 에 세션별로 저장되고 이 세션의 요청만 측정
+# (프로세스 전체 측정은 QAQC_PROFILE=1)
+admin = os.environ.get("QAQC_ADMIN") == "1"
+if admin:
+    st.sidebar.toggle("🔬 구간별 프로파일링", value=is_enabled(), key="profiling")
+profiling = is_enabled() or (admin and st.session_state.get("profiling", False))
+begin_request("main", enabled=profiling)
+
+# 🔍 코호트 전체 Feature 중요도(표본 SHAP)는 앱 시작 시 백그라운드에서 계산 (첫 클릭이 기다리지 않도록)
+warm_global_importance()
+
 st.title('🚭환자 금연 확률 예측 모델')
 
 # 사용자가 입력할 수 있는 양식 만들기
-st.sidebar.title("환자 정보를 입력해주세요.")
-age = st.sidebar.number_input('나이', value=25)
-height = st.sidebar.number_input('키(cm)', value=172)
-weight = st.sidebar.number_input('몸무게(kg)', value=76)
-waist = st.sidebar.number_input('허리 둘레(cm)', value=84.0)
-eyesight_left = st.sidebar.number_input('시력(왼쪽)', value=1.0)
-eyesight_right = st.sidebar.number_input('시력(오른쪽)', value=1.1)
-hearing_left = st.sidebar.number_input('청력(왼쪽)', value=1)
-hearing_right = st.sidebar.number_input('청력(오른쪽)', value=1)
-systolic = st.sidebar.number_input('혈압(수축기)', value=114)
-relaxation = st.sidebar.number_input('혈압(이완기)', value=68)
-fastingBloodSugar = st.sidebar.number_input('공복혈당', value=86)
-cholesterol = st.sidebar.number_input('콜레스테롤', value=230)
-triglyceride = st.sidebar.number_input('중성지방', value=71)
-HDL = st.sidebar.number_input('HDL', value=72)
-LDL = st.sidebar.number_input('LDL', value=144)
-hemoglobin = st.sidebar.number_input('헤모글로빈', value=12)
-urineProtein = st.sidebar.number_input('요단백', value=1)
-serumCreatinine = st.sidebar.number_input('혈청 크레아티닌', value=0.6)
-AST = st.sidebar.number_input('AST', value=26)
-ALT = st.sidebar.number_input('ALT', value=11)
-Gtp = st.sidebar.number_input('Gtp', value=12)
-dentalCaries = st.sidebar.number_input('충치 유무', value=1)
-
-
-# ✅ "Submit" 버튼을 눌렀을 때 session_state에 값 저장
+with stage("input"):
+    st.sidebar.title("환자 정보를 입력해주세요.")
+    patient_id = st.sidebar.text_input('환자 ID (선택)', value="").strip()
+    age = st.sidebar.number_input('나이', value=25)
+    height = st.sidebar.number_input('키(cm)', value=172)
+    weight = st.sidebar.number_input('몸무게(kg)', value=76)
+    waist = st.sidebar.number_input('허리 둘레(cm)', value=84.0)
+    eyesight_left = st.sidebar.number_input('시력(왼쪽)', value=1.0)
+    eyesight_right = st.sidebar.number_input('시력(오른쪽)', value=1.1)
+    hearing_left = st.sidebar.number_input('청력(왼쪽)', value=1)
+    hearing_right = st.sidebar.number_input('청력(오른쪽)', value=1)
+    systolic = st.sidebar.number_input('혈압(수축기)', value=114)
+    relaxation = st.sidebar.number_input('혈압(이완기)', value=68)
+    fastingBloodSugar = st.sidebar.number_input('공복혈당', value=86)
+    cholesterol = st.sidebar.number_input('콜레스테롤', value=230)
+    triglyceride = st.sidebar.number_input('중성지방', value=71)
+    HDL = st.sidebar.number_input('HDL', value=72)
+    LDL = st.sidebar.number_input('LDL', value=144)
+    hemoglobin = st.sidebar.number_input('헤모글로빈', value=12)
+    urineProtein = st.sidebar.number_input('요단백', value=1)
+    serumCreatinine = st.sidebar.number_input('혈청 크레아티닌', value=0.6)
+    AST = st.sidebar.number_input('AST', value=26)
+    ALT = st.sidebar.number_input('ALT', value=11)
+    Gtp = st.sidebar.number_input('Gtp', value=12)
+    dentalCaries = st.sidebar.number_input('충치 유무', value=1)
+
+
+# ✅ "Submit" 버튼을 눌렀을 때 검증된 환자 기록을 session_state에 저장
 if st.button("🔍 건강 분석 실행"):
-    st.session_state["patient_data"] = {
+    count("clicks")
+    patient = PatientRecord.from_columns({
         "age": age,
         "height(cm)": height,
         "weight(kg)": weight,
@@ -85,107 +99,104 @@ if st.button("🔍 건강 분석 실행"):
         "ALT": ALT, 
         "Gtp": Gtp, 
         "dental caries": dentalCaries
-    }
-    patient_data = pd.DataFrame([{k: float(v) if isinstance(v, (int, float)) else v for k, v in st.session_state["patient_data"].items()}])
-    st.dataframe(patient_data)
-    # Feature Engineering
-    def feature_engineering(df):
-        df['waist_height_ratio'] = df['waist(cm)'] / df['height(cm)']
-        df['alt_ast_ratio'] = df['ALT'] / (df['AST'] + 0.001)
-        bins = [0, 18.5, 24.9, 29.9, np.inf]
-        labels = ['Underweight', 'Normal', 'Overweight', 'Obesity']
-        df['BMI_category'] = pd.cut(df['BMI'], bins=bins, labels=labels)
-        df = pd.get_dummies(df, columns=['BMI_category'], drop_first=True)
-        return df
-
-    # 필요 컬럼 생성
-    patient_data['BMI'] = patient_data['weight(kg)']/((patient_data['height(cm)']/100)**2)
-    patient_data['triglyceride/HDL'] = patient_data['triglyceride']/patient_data['HDL']
-    patient_data['LDL/HDL'] = patient_data['LDL']/patient_data['HDL']
-    patient_data['BP Ratio'] = patient_data['systolic']/patient_data['relaxation']
-    patient_data = feature_engineering(patient_data)
+    })
+    # ✅ 입력값 검증 (0으로 나누게 되는 값 등은 예측하지 않음)
+    with stage("validate"):
+        errors = patient.validate()
+    if errors:
+        for error in errors:
+            st.error(error)
+        st.stop()
+    with stage("input_table"):
+        st.dataframe(pd.DataFrame([patient.to_columns()]))
 
     st.subheader('예측 결과 확인')
 
-    # 저장된 모델 불러오기 (CatBoost)
-    with open('files/catboost_model(final).pkl', 'rb') as f:
-        model = pickle.load(f)
-    # 사용자가 입력한 값으로 예측
-    prediction = model.predict(patient_data)
-    # 금연 가능성 확률 추가 (0일 확률)
-    prob = model.predict_proba(patient_data)
-    patient_data['smoking_prob_0'] = prob[:, 0]
+    # 저장된 모델 불러오기 (CatBoost) - 프로세스당 한 번만 로드하고, 파일이 바뀌면 다시 로드
+    with stage("get_model"):
+        model = get_model()
+    # Feature Engineering + 예측 + 치료 방법 추천 (같은 입력/모델 버전이면 캐시된 결과 사용)
+    with stage("predict"):
+        result = get_prediction_cache().get_or_compute(
+            prediction_key(patient.as_array(), model.version),
+            lambda: predict_patient(model, patient)
+        )
+    # 📊 분포 변화 모니터링: 예측한 입력값/금연 확률을 현재 구간 카운트에 더함 (Drift 페이지)
+    with stage("drift"):
+        get_monitor().update(patient.as_array(), result.probability)
+    # 🗂️ 감사 로그: 큐에 넣기만 하고 디스크 쓰기는 백그라운드 스레드가 처리 (UI 는 기다리지 않음)
+    with stage("audit"):
+        get_audit_log().log(audit_record(result, model.version, patient_id))
+    # 🥊 challenger 모델 그림자 평가 (QAQC_CHALLENGERS 로 등록, 백그라운드에서 실행되어 화면 결과와 무관)
+    with stage("shadow"):
+        get_shadow().submit(model, result)
+
+    # ✅ 페이지에서 다시 DataFrame 을 만들지 않도록 기록/Feature/예측 결과를 함께 저장
+    st.session_state["patient"] = patient
+    st.session_state["patient_features"] = result.features
+    st.session_state["prediction"] = result
+    # 예측에 사용한 모델 버전 (hot reload 후 페이지가 다른 모델의 결과와 섞지 않도록 비교)
+    st.session_state["model_version"] = model.version
 
     # 결과 출력
-    st.write(f"📌 CatBoost 모델 예측 결과: {prediction}")
-    st.write(f"📌 금연 가능성: {patient_data['smoking_prob_0'].iloc[0]*100:.2f} %")
+    st.write(f"📌 CatBoost 모델 예측 결과: {result.prediction}")
+    st.write(f"📌 금연 가능성: {result.probability*100:.2f} %")
     st.success("✅ 환자 정보가 저장되었습니다! 사이드바에서 '건강 분석' 페이지로 이동하세요.")
 
-    # 금연 확률에 따른 치료 방법 추천
-    def recommend_treatment(probability):
-        if probability >= 90:
-            return (
-                "### 🟢 매우 강한 의지 (90~100%)\n"
-                "<small>- ✅ **추천 치료 방법**: 행동 요법, 금연 앱 활용</small><br>\n"
-                "<small>- 📌 **금연 상담(1:1 또는 그룹)**을 받고, 금연 앱(Smoke Free, QuitNow!)을 활용하세요.</small><br>\n"
-                "<small>- 🚭 흡연 유발 환경을 피하고, 자기 동기 강화 기법을 사용하세요.</small>"
-            )
-        elif probability >= 70:
-            return (
-                "### 🟡 강한 의지 (70~89%)\n"
-                "<small>- ✅ **추천 치료 방법**: 행동 요법 + 니코틴 대체 요법(NRT)</small><br>\n"
-                "<small>- 📌 니코틴 패치, 껌, 사탕을 사용하고 금연 상담을 병행하면 효과가 증가합니다.</small><br>\n"
-                "<small>- 🚭 스트레스 대처법을 학습하고, 금연 보상 시스템을 활용하세요.</small>"
-            )
-        elif probability >= 50:
-            return (
-                "### 🟠 보통 의지 (50~69%)\n"
-                "<small>- ✅ **추천 치료 방법**: 니코틴 대체 요법(NRT) + 행동 요법 + 금연 상담</small><br>\n"
-                "<small>- 📌 니코틴 패치와 껌을 병행하며, 금연 상담을 통해 동기 부여를 강화하세요.</small><br>\n"
-                "<small>- 🚭 필요 시 부프로피온(웰부트린) 같은 약물을 고려할 수 있습니다.</small>"
-            )
-        elif probability >= 30:
-            return (
-                "### 🔴 약한 의지 (30~49%)\n"
-                "<small>- ✅ **추천 치료 방법**: 처방 약물(바레니클린, 부프로피온) + 행동 요법</small><br>\n"
-                "<small>- 📌 바레니클린(챔픽스), 부프로피온(웰부트린) 같은 약물을 복용하며 금연 상담을 받으세요.</small><br>\n"
-                "<small>- 🚭 니코틴 패치와 껌을 병행하면 효과가 더욱 증가합니다.</small>"
-            )
-        else:
-            return (
-                "### ⚫ 매우 약한 의지 (0~29%)\n"
-                "<small>- ✅ **추천 치료 방법**: 처방 약물(바레니클린 + 부프로피온 병합 요법) + 전문 상담</small><br>\n"
-                "<small>- 📌 강력한 약물 요법이 필요하며, 병합 치료를 고려하세요.</small><br>\n"
-                "<small>- 🚭 금연 클리닉에 등록하고, 집중적인 관리 프로그램에 참여하세요.</small>"
-            )    
     st.subheader("🚭 금연 치료 방법 추천")
-    st.markdown(recommend_treatment(patient_data['smoking_prob_0'].iloc[0]*100))
+    st.markdown(result.tier)
 
+    # 🔍 예측 근거: Feature 별 SHAP 기여도 (예측 캐시와 별도의 설명 캐시, 같은 입력/모델 버전이면 재사용)
+    with stage("explain"):
+        explanation = get_explanation_cache().get_or_compute(
+            prediction_key(patient.as_array(), model.version),
+            lambda: explain_patient(model, patient)
+        )
+        # 코호트 중요도는 계산이 끝났을 때만 표시 (모델이 바뀌었으면 백그라운드 계산을 시작)
+        explanation_panel(explanation, cached_importance(model))
 
 
-# 사이드바에서 페이지 선택
-st.sidebar.title("건강 분석")
-pages = {
-    "BMI": "bmi",
-    "Hemoglobin": "hemoglobin",
-    "Serum Creatinine, Urine protein, Fasting blood sugar":"serum creatinine_urine protein",
-    "Blood Pressure": "blood_pressure",
-    "Liver(AST,ALT,Gtp)": "liver(AST, ALT, Gtp)",
-    "Cholesterol": "cholesterol etc"
 
-}
+# 예측 캐시 현황 (hit/miss/eviction 으로 캐시 크기 조정)
+with st.sidebar.expander("⚙️ 예측 캐시 현황"):
+    st.json(get_prediction_cache().stats())
+    # SHAP 설명 캐시 (QAQC_EXPLANATION_CACHE_SIZE)
+    st.caption("SHAP 설명 캐시")
+    st.json(get_explanation_cache().stats())
+
+# 감사 로그 현황 (dropped 가 늘면 큐 크기(QAQC_AUDIT_QUEUE) 또는 디스크 상태 확인)
+with st.sidebar.expander("🗂️ 감사 로그 현황"):
+    st.json(get_audit_log().stats())
+
+# 사이드바에서 페이지 선택 (pages 패키지는 프로세스당 한 번만 import/검증/예열)
+st.sidebar.title("건강 분석")
+pages = load_pages()
 
 selected_page = st.sidebar.radio("이동할 페이지 선택", list(pages.keys()))
 
-# 선택된 페이지 불러오기
-module_name = f"pages.{pages[selected_page]}"
+page = pages[selected_page]
+
+# 페이지가 st.stop() 으로 끝나면 그 뒤의 코드(finally 포함)는 화면에 그리지 못하므로,
+# 디버그/프로파일링 표시는 페이지 렌더링 전에 직전 측정값으로 그림
+# ⏱️ 디버그: 페이지별 렌더링 시간 (QAQC_DEBUG=1 또는 ?debug=1)
+if os.environ.get("QAQC_DEBUG") == "1" or st.query_params.get("debug") == "1":
+    with st.sidebar.expander("⏱️ 페이지 렌더링 시간", expanded=True):
+        if page.renders:
+            st.caption(f"{page.label}: 직전 렌더링 {page.last_ms:.1f} ms")
+        st.dataframe(timings(), hide_index=True)
+
+# 🔬 최근 요청의 구간별 시간 (flame table)
+if admin and profiling:
+    with st.sidebar.expander("🔬 구간별 시간 (최근 요청)", expanded=True):
+        recent_requests = st.slider("최근 요청 수", 1, 50, 10)
+        st.dataframe(flame_table(recent_requests), hide_index=True)
+
+# 선택된 페이지 렌더링
 try:
-    module = importlib.import_module(module_name)
-    if hasattr(module, "main"):  # main 함수가 존재하면 실행
-        module.main()
-    else:
-        st.warning(f"⚠️ {module_name} 모듈에 'main' 함수가 없습니다.")
+    render_page(page)
 except Exception as e:
-    st.error(f"🚨 페이지 로드 중 오류 발생: {e}")
+    st.error(f"🚨 페이지 렌더링 중 오류 발생: {e}")
+finally:
+    end_request()
 
 
@@ -1,31 +1,46 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
+from qaqc.figures import figure_template, overlay
+from qaqc.page_registry import register_page
+from qaqc.ranges import get_range
+from qaqc.report import Section
+from qaqc.widgets import percentile_panel, section_panel
 
-def main():
-    st.title("🩺 혈압 상세 정보")
+TITLE = "🩺 혈압 상세 정보"
+
+@figure_template
+def blood_pressure_template():
+    # 정상 혈압 기준선과 레이아웃은 프로세스당 한 번만 생성
+    fig = px.bar(x=["수축기", "이완기"], y=[0, 0], text=[0, 0], title="혈압 비교 (mmHg)")
+    fig.add_hline(y=get_range("systolic").reference_value, line_dash="dash", line_color="red", annotation_text="정상 수축기 혈압")
+    fig.add_hline(y=get_range("relaxation").reference_value, line_dash="dash", line_color="blue", annotation_text="정상 이완기 혈압")
+    fig.update_traces(textposition='outside')
+    return fig
 
+def blood_pressure_figure(systolic, relaxation):
+    template = blood_pressure_template()
+    bar = dict(template["data"][0], y=[systolic, relaxation], text=[systolic, relaxation])
+    return overlay(template, [bar], replace=True)
+
+def blood_pressure_section(patient):
+    return Section(TITLE, [blood_pressure_figure(patient.systolic, patient.relaxation)])
+
+@register_page("Blood Pressure", order=40, warm=blood_pressure_template, report=blood_pressure_section)
+def main():
+    st.title(TITLE)
 
     # ✅ `session_state`에서 데이터 불러오기
-    if "patient_data" not in st.session_state:
+    if "patient" not in st.session_state:
         st.warning("⚠️ 먼저 메인 페이지에서 건강 정보를 입력하세요.")
         st.stop()  # 데이터가 없으면 실행 중지
 
-    patient_data = pd.DataFrame([{k: float(v) if isinstance(v, (int, float)) else v for k, v in st.session_state["patient_data"].items()}])
-
-    systolic = patient_data['systolic'].iloc[0]
-    relaxation = patient_data['relaxation'].iloc[0]
-    metric_value = (systolic, relaxation)
-    fig = px.bar(
-        x=["수축기", "이완기"],
-        y=[metric_value[0], metric_value[1]],
-        text=[metric_value[0], metric_value[1]],
-        title="혈압 비교 (mmHg)"
-    )
-    fig.add_hline(y=120, line_dash="dash", line_color="red", annotation_text="정상 수축기 혈압")
-    fig.add_hline(y=80, line_dash="dash", line_color="blue", annotation_text="정상 이완기 혈압")
-    fig.update_traces(textposition='outside')
-    st.plotly_chart(fig)
+    patient = st.session_state["patient"]
+
+    # 📊 혈압 그래프 (일괄 리포트와 같은 함수)
+    section_panel(blood_pressure_section(patient))
+
+    # 👥 코호트 내 백분위 및 분포 비교
+    percentile_panel({"systolic": patient.systolic, "relaxation": patient.relaxation}, patient.age, "blood_pressure")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,83 @@
+import streamlit as st
+import plotly.express as px
+from qaqc.cohort_cube import CohortCube, get_cube
+from qaqc.features import BMI_CATEGORIES
+from qaqc.page_registry import register_page
+
+LIVER_FILTERS = {"전체": None, "간수치 이상": True, "간수치 정상": False}
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def cohort_aggregates(version, age_range, bmi_categories, liver_abnormal):
+    # ✅ 필터 상태 + 큐브 버전이 캐시 키: 같은 조건은 다시 계산하지 않고, 결과는 작은 집계표만 포함
+    cells = get_cube().select(age_range, list(bmi_categories), liver_abnormal)
+    return {
+        "total": CohortCube.summarize(cells.assign(전체="전체"), "전체"),
+        "histogram": CohortCube.histogram(cells),
+        "by_age_bmi": CohortCube.summarize(cells, ["age_band", "BMI_category"]),
+        "by_liver": CohortCube.summarize(cells, "liver_abnormal"),
+    }
+
+
+@register_page("Cohort", order=70, warm=get_cube)
+def main():
+    st.title("👥 코호트 탐색")
+    st.caption("예측이 완료된 전체 환자 집단을 조건별로 집계합니다. (원본 행은 전송하지 않고 집계 결과만 표시)")
+
+    cube = get_cube()
+    low, high = cube.age_range
+
+    col1, col2, col3 = st.columns(3)
+    age_range = col1.slider("나이", low, high, (low, high), step=5)
+    bmi_categories = col2.multiselect("BMI 범주", BMI_CATEGORIES, default=BMI_CATEGORIES)
+    liver = col3.radio("간수치(AST/ALT/Gtp)", list(LIVER_FILTERS), horizontal=True)
+
+    if not bmi_categories:
+        st.warning("⚠️ BMI 범주를 하나 이상 선택하세요.")
+        st.stop()
+
+    aggregates = cohort_aggregates(cube.version, age_range, tuple(bmi_categories), LIVER_FILTERS[liver])
+    if aggregates["total"].empty:
+        st.warning("⚠️ 조건에 맞는 환자가 없습니다.")
+        st.stop()
+
+    # 📊 요약 지표
+    total = aggregates["total"].iloc[0]
+    m1, m2, m3 = st.columns(3)
+    m1.metric("환자 수", f"{total['환자 수']:,}")
+    m2.metric("평균 금연 가능성", f"{total['평균 금연 가능성(%)']:.1f} %")
+    m3.metric("흡연 예측 비율", f"{total['흡연 예측 비율(%)']:.1f} %")
+
+    # 📊 금연 가능성 분포
+    histogram = aggregates["histogram"]
+    fig = px.bar(histogram, x="구간 시작(%)", y="환자 수", title="📊 금연 가능성(smoking_prob_0) 분포")
+    fig.update_traces(marker_color="green")
+    fig.update_layout(bargap=0.05, xaxis_title="금연 가능성 (%)")
+    st.plotly_chart(fig)
+
+    # 📊 연령대 x BMI 범주별 평균 금연 가능성
+    by_age_bmi = aggregates["by_age_bmi"]
+    fig = px.bar(
+        by_age_bmi, x="age_band", y="평균 금연 가능성(%)", color="BMI_category", barmode="group",
+        hover_data=["환자 수", "흡연 예측 비율(%)"], title="📊 연령대 · BMI 범주별 평균 금연 가능성",
+        category_orders={"BMI_category": BMI_CATEGORIES},
+    )
+    fig.update_layout(xaxis_title="연령대", yaxis_range=[0, 100])
+    st.plotly_chart(fig)
+
+    # 📊 간수치 이상 여부별 비교
+    by_liver = aggregates["by_liver"].assign(
+        liver_abnormal=lambda frame: frame["liver_abnormal"].map({True: "간수치 이상", False: "간수치 정상"})
+    )
+    fig = px.bar(
+        by_liver, x="liver_abnormal", y="평균 금연 가능성(%)", text="환자 수",
+        title="📊 간수치 이상 여부별 평균 금연 가능성",
+    )
+    fig.update_layout(xaxis_title="", yaxis_range=[0, 100])
+    st.plotly_chart(fig)
+
+    with st.expander("📋 연령대 · BMI 범주별 집계표"):
+        st.dataframe(by_age_bmi.round(1), hide_index=True)
+
+if __name__ == "__main__":
+    main()
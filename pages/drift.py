@@ -0,0 +1,58 @@
+import os
+import streamlit as st
+import plotly.express as px
+from qaqc.drift import DRIFT_STATE, MONITORED_COLUMNS, PSI_ALERT, PSI_WARN, DriftMonitor, get_monitor, get_reference
+from qaqc.page_registry import register_page
+
+SOURCES = ["대시보드 예측 (현재 서버)", "배치 스코어링 (python -m qaqc.score --drift)"]
+
+def psi_figure(report):
+    fig = px.bar(report, x="컬럼", y="PSI", color="상태", title="📊 컬럼별 PSI (기준 코호트 대비)",
+                 color_discrete_map={"🟢 안정": "green", "🟡 주의": "orange", "🔴 경고": "red", "⚪ 표본 부족": "lightgray"})
+    fig.add_hline(y=PSI_WARN, line_dash="dash", line_color="orange", annotation_text=f"주의 {PSI_WARN}")
+    fig.add_hline(y=PSI_ALERT, line_dash="dash", line_color="red", annotation_text=f"경고 {PSI_ALERT}")
+    fig.update_layout(xaxis_tickangle=-45)
+    return fig
+
+def histogram_figure(histograms, column):
+    long = histograms.melt(id_vars="구간", var_name="분포", value_name="비율(%)")
+    fig = px.bar(long, x="구간", y="비율(%)", color="분포", barmode="group", title=f"📊 {column} 구간별 비율",
+                 color_discrete_map={"기준(%)": "gray", "현재(%)": "green"})
+    return fig
+
+@register_page("Drift", order=80, warm=get_reference)
+def main():
+    st.title("📡 분포 변화(Drift) 모니터링")
+    st.caption("최근 예측된 환자들의 입력값과 금연 확률 분포를 기준 코호트와 비교합니다. "
+               f"(PSI {PSI_WARN} 미만 안정, {PSI_ALERT} 이상 경고 / KS 는 구간 기준 근사값)")
+
+    source = st.radio("데이터", SOURCES, horizontal=True)
+    if source == SOURCES[0]:
+        monitor = get_monitor()
+    else:
+        if not os.path.exists(DRIFT_STATE):
+            st.warning(f"⚠️ {DRIFT_STATE} 파일이 없습니다. `python -m qaqc.score input.csv output.csv --drift` 로 먼저 스코어링하세요.")
+            st.stop()
+        monitor = DriftMonitor.load(get_reference(), DRIFT_STATE)
+
+    report = monitor.report()
+    observations = int(report["관측 수"].max())
+    if observations == 0:
+        st.info("💡 아직 모니터링 기간 안에 예측된 환자가 없습니다.")
+        st.stop()
+
+    m1, m2, m3 = st.columns(3)
+    m1.metric("관측 수", f"{observations:,}")
+    m2.metric("🔴 경고 컬럼", int((report["상태"] == "🔴 경고").sum()))
+    m3.metric("🟡 주의 컬럼", int((report["상태"] == "🟡 주의").sum()))
+
+    st.plotly_chart(psi_figure(report))
+    st.dataframe(report.sort_values("PSI", ascending=False), hide_index=True)
+
+    # 📊 선택한 컬럼의 기준 / 현재 구간 비율
+    worst = report.sort_values("PSI", ascending=False)["컬럼"].iloc[0]
+    column = st.selectbox("구간별 비율을 볼 컬럼", MONITORED_COLUMNS, index=MONITORED_COLUMNS.index(worst))
+    st.plotly_chart(histogram_figure(monitor.histograms(column), column))
+
+if __name__ == "__main__":
+    main()
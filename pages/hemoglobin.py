@@ -1,73 +1,40 @@
 import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
+from qaqc.figures import band_template, marker_trace, overlay
+from qaqc.page_registry import register_page
+from qaqc.ranges import get_range
+from qaqc.report import Section
+from qaqc.widgets import percentile_panel, section_panel
+
+TITLE = "🩺 헤모글로빈 상세 정보"
+
+def hemoglobin_figure(patient_hemoglobin):
+    # 기준 구간(배경)은 캐시하고 환자 마커만 덧붙임
+    return overlay(
+        band_template("hemoglobin", "📊 헤모글로빈 정상 범위 및 환자 수치", "헤모글로빈 (g/dL)", (5, 25), "g/dL"),
+        [marker_trace(patient_hemoglobin, f"🔴 {patient_hemoglobin:.1f} g/dL", "환자 헤모글로빈")]
+    )
+
+def hemoglobin_section(patient):
+    # ✅ 헤모글로빈 정상 기준 값 (qaqc.ranges 레지스트리, 일반 기준 적용)
+    band = get_range("hemoglobin").band(patient.hemoglobin)
+    return Section(TITLE, [hemoglobin_figure(patient.hemoglobin)], [(band.severity, band.message)])
 
+@register_page("Hemoglobin", order=20, warm=lambda: hemoglobin_figure(0), report=hemoglobin_section)
 def main():
-    st.title("🩺 헤모글로빈 상세 정보")
+    st.title(TITLE)
+
     # ✅ `session_state`에서 데이터 불러오기
-    if "patient_data" not in st.session_state:
+    if "patient" not in st.session_state:
         st.warning("⚠️ 먼저 메인 페이지에서 건강 정보를 입력하세요.")
         st.stop()  # 데이터가 없으면 실행 중지
 
-    patient_data = pd.DataFrame([{k: float(v) if isinstance(v, (int, float)) else v for k, v in st.session_state["patient_data"].items()}])
-
-
-
-    # ✅ 헤모글로빈 정상 기준 값 정의 (일반 기준 적용)
-    hemoglobin_ranges = {
-        "심각 (낮음)": (0, 7, "red"),
-        "경고 (낮음)": (7, 13.5, "orange"),
-        "정상": (13.5, 17.5, "green"),
-        "경고 (높음)": (17.5, 20, "orange"),
-        "심각 (높음)": (20, 25, "red")
-    }
-
-
-    # ✅ 환자의 헤모글로빈 수치 가져오기
-    patient_hemoglobin = patient_data['hemoglobin'].iloc[0]
-
-    # 📊 **헤모글로빈 수치 그래프**
-    fig_hb = go.Figure()
-
-    for category, (hb_min, hb_max, color) in hemoglobin_ranges.items():
-        fig_hb.add_trace(go.Scatter(
-            x=[hb_min, hb_max], y=[1, 1], 
-            fill='toself', mode='lines',
-            line=dict(color=color, width=4),
-            name=f"{category} ({hb_min} ~ {hb_max} g/dL)"
-        ))
-
-    fig_hb.add_trace(go.Scatter(
-        x=[patient_hemoglobin], y=[1.1], 
-        mode="markers+text",
-        marker=dict(color="red", size=12, symbol="arrow-bar-up"),
-        text=[f"🔴 {patient_hemoglobin:.1f} g/dL"],
-        textposition="top center",
-        name="환자 헤모글로빈"
-    ))
-
-    fig_hb.update_layout(
-        title="📊 헤모글로빈 정상 범위 및 환자 수치",
-        xaxis=dict(title="헤모글로빈 (g/dL)", range=[5, 25]),
-        yaxis=dict(showticklabels=False),  
-        showlegend=True
-    )
+    patient = st.session_state["patient"]
 
-    st.plotly_chart(fig_hb)
+    # 📊 헤모글로빈 수치 그래프 + 건강 상태 문구 (일괄 리포트와 같은 함수)
+    section_panel(hemoglobin_section(patient))
 
-    # ✅ 건강 상태 문구 추가
-    status_message = "✅ 정상 범위 내에 있습니다. 건강을 유지하세요!"
-    for category, (hb_min, hb_max, _) in hemoglobin_ranges.items():
-        if hb_min <= patient_hemoglobin < hb_max:
-            if "경고" in category:
-                status_message = "⚠️ 헤모글로빈 수치가 경계선에 있습니다. 주의가 필요합니다."
-                st.warning(status_message)
-            elif "심각" in category:
-                status_message = "🚨 헤모글로빈 수치가 위험 수준입니다. 즉시 의료진과 상담하세요!"
-                st.error(status_message)
-            else:
-                st.success(status_message)
-            break
+    # 👥 코호트 내 백분위 및 분포 비교
+    percentile_panel({"hemoglobin": patient.hemoglobin}, patient.age, "hemoglobin")
 
 if __name__ == "__main__":
     main()
@@ -1,38 +1,57 @@
 import streamlit as st
-import pandas as pd
 import plotly.express as px
+from qaqc.figures import figure_template, overlay
+from qaqc.page_registry import register_page
+from qaqc.ranges import NORMAL, get_range
+from qaqc.report import Section
+from qaqc.widgets import percentile_panel, section_panel
 
-def main():
-    st.title("🩺 간 수치(AST, ALT, Gtp) 상세 정보")
+TITLE = "🩺 간 수치(AST, ALT, Gtp) 상세 정보"
+
+@figure_template
+def liver_template():
+    # 정상 간수치 기준선과 레이아웃은 프로세스당 한 번만 생성
+    fig = px.bar(x=["AST", "ALT", "r-Gtp"], y=[0, 0, 0], text=[0, 0, 0], title="간수치 비교 (IU/L)")
+    fig.add_hline(y=get_range("AST").reference_value, line_dash="dash", line_color="red", annotation_text="정상 AST/ALT 수치")
+    fig.add_hline(y=get_range("Gtp").reference_value, line_dash="dash", line_color="blue", annotation_text="정상 r-Gtp 상한")
+    fig.update_traces(textposition='outside')
+    return fig
+
+def liver_figure(ast, alt, gtp):
+    template = liver_template()
+    bar = dict(template["data"][0], y=[ast, alt, gtp], text=[ast, alt, gtp])
+    return overlay(template, [bar], replace=True)
 
+def liver_section(patient):
+    ast, alt, gtp = patient.AST, patient.ALT, patient.Gtp
+    # ✅ qaqc.ranges 레지스트리 기준으로 분류
+    ast_band = get_range("AST").band(ast)
+    alt_band = get_range("ALT").band(alt)
+    gtp_band = get_range("Gtp").band(gtp)
+    messages = []
+    if ast_band.severity != NORMAL:
+        messages.append(("warning", ast_band.message))
+    elif alt_band.severity != NORMAL:
+        messages.append(("warning", alt_band.message))
+    messages.append((gtp_band.severity, gtp_band.message))
+    return Section(TITLE, [liver_figure(ast, alt, gtp)], messages)
+
+@register_page("Liver(AST,ALT,Gtp)", order=50, warm=liver_template, report=liver_section)
+def main():
+    st.title(TITLE)
 
     # ✅ `session_state`에서 데이터 불러오기
-    if "patient_data" not in st.session_state:
+    if "patient" not in st.session_state:
         st.warning("⚠️ 먼저 메인 페이지에서 건강 정보를 입력하세요.")
         st.stop()  # 데이터가 없으면 실행 중지
 
-    patient_data = pd.DataFrame([{k: float(v) if isinstance(v, (int, float)) else v for k, v in st.session_state["patient_data"].items()}])
+    patient = st.session_state["patient"]
 
+    # 📊 간수치 그래프 + 안내 문구 (일괄 리포트와 같은 함수)
+    section_panel(liver_section(patient))
 
-    ast = patient_data['AST'].iloc[0]
-    alt = patient_data['ALT'].iloc[0]
-    gtp = patient_data['Gtp'].iloc[0]
-    fig = px.bar(
-        x=["AST", "ALT", "r-Gtp"],
-        y=[ast, alt, gtp],
-        text=[ast, alt, gtp],
-        title="간수치 비교 (IU/L)")
-    fig.add_hline(y=40, line_dash="dash", line_color="red", annotation_text="정상 AST/ALT 수치")
-    fig.add_hline(y=71, line_dash="dash", line_color="blue", annotation_text="정상 r-Gtp 상한")
-    fig.update_traces(textposition='outside')
-    st.plotly_chart(fig)
-    
-    if ast > 40 or alt > 40:
-        st.warning("⚠️ 이 환자는 급성간염, 심근경색, 근질환, 악성종양, 폐쇄황달, 알코올간염 등의 위험이 있습니다.")
-    if gtp > 71:
-        st.warning("⚠️ 이 환자는 만성간염 활동형, 간경변 활동형, 폐쇄황달, 알코올성 간장애, 요독증 등의 위험이 있습니다.")
-    else:
-        st.success("✅ 간 수치가 정상 범위에 있습니다. 건강을 유지하세요!")
+    # 👥 코호트 내 백분위 및 분포 비교
+    percentile_panel({"AST": patient.AST, "ALT": patient.ALT, "Gtp": patient.Gtp}, patient.age, "liver")
 
 if __name__ == "__main__":
     main()
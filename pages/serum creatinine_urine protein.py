@@ -1,82 +1,86 @@
 import streamlit as st
 import plotly.graph_objects as go
-import pandas as pd
-
-def main():
-    st.title("🩺 혈청 크레아티닌, 요단백, 혈당 상세 정보")
-
-
-    # ✅ `session_state`에서 데이터 불러오기
-    if "patient_data" not in st.session_state:
-        st.warning("⚠️ 먼저 메인 페이지에서 건강 정보를 입력하세요.")
-        st.stop()  # 데이터가 없으면 실행 중지
-
-    patient_data = pd.DataFrame([{k: float(v) if isinstance(v, (int, float)) else v for k, v in st.session_state["patient_data"].items()}])
-
-        # ✅ 정상 기준 값 설정
-    normal_ranges = {
-        "혈청 크레아티닌": (44, 106),
-        "요단백": (1, 2),
-        "혈당": (0, 126)
-    }
-
-    # ✅ 환자 입력값
-    patient_values = {
-        "혈청 크레아티닌": patient_data["serum creatinine"].iloc[0],
-        "요단백": patient_data["Urine protein"].iloc[0],
-        "혈당": patient_data["fasting blood sugar"].iloc[0]
+from qaqc.figures import bar_trace, figure_template, overlay
+from qaqc.page_registry import register_page
+from qaqc.ranges import NORMAL, get_range
+from qaqc.report import Section
+from qaqc.widgets import percentile_panel, section_panel
+
+TITLE = "🩺 혈청 크레아티닌, 요단백, 혈당 상세 정보"
+
+def kidney_ranges():
+    return {
+        "혈청 크레아티닌": get_range("serum creatinine"),
+        "요단백": get_range("Urine protein"),
+        "혈당": get_range("fasting blood sugar")
     }
 
-    # 📊 **그래프 생성**
+@figure_template
+def kidney_template():
+    # 정상 기준 막대 그래프와 레이아웃은 프로세스당 한 번만 생성
+    normal_ranges = kidney_ranges()
     fig = go.Figure()
-
-    fig.add_trace(go.Bar(
-        name="환자 수치",
-        x=list(patient_values.keys()),
-        y=list(patient_values.values()),
-        marker_color="red"
-    ))
-
     fig.add_trace(go.Bar(
         name="정상 기준 (최고치)",
         x=list(normal_ranges.keys()),
-        y=[normal_ranges[key][1] for key in normal_ranges],
+        y=[normal_ranges[key].reference_value for key in normal_ranges],
         marker_color="green",
         opacity=0.6
     ))
-
     fig.update_layout(
         title="📊 환자 수치 vs 정상 기준",
         yaxis=dict(title="수치"),
         barmode="group"
     )
+    return fig
+
+def kidney_figure(patient_values):
+    # 환자 수치 막대 그래프를 정상 기준 앞에 추가
+    return overlay(
+        kidney_template(),
+        [bar_trace("환자 수치", patient_values.keys(), patient_values.values(), "red")],
+        first=True
+    )
 
-    st.plotly_chart(fig)
-
-    # 🚨 **건강 안내 메시지 출력**
-    warnings = []
+def kidney_section(patient):
+    # ✅ 정상 기준 값 (qaqc.ranges 레지스트리)
+    normal_ranges = kidney_ranges()
+    patient_values = {
+        "혈청 크레아티닌": patient.serumCreatinine,
+        "요단백": patient.urineProtein,
+        "혈당": patient.fastingBloodSugar
+    }
 
-    if patient_data["serum creatinine"].iloc[0] < 44:
-        warnings.append("🚨 혈청 크레아티닌이 너무 낮습니다. 근육량 감소 또는 신장 문제 가능성이 있습니다.")
-    elif patient_data["serum creatinine"].iloc[0] > 106:
-        warnings.append("🚨 혈청 크레아티닌이 정상 범위를 초과했습니다. 신장 기능 검사가 필요할 수 있습니다.")
+    # 🚨 **건강 안내 메시지**
+    messages = []
+    for key, value in patient_values.items():
+        band = normal_ranges[key].band(value)
+        if band.severity != NORMAL:
+            messages.append((band.severity, band.message))
+    if not messages:
+        messages.append(("success", "✅ 모든 수치가 정상 범위 내에 있습니다! 건강을 유지하세요."))
+    return Section(TITLE, [kidney_figure(patient_values)], messages)
+
+@register_page("Serum Creatinine, Urine protein, Fasting blood sugar", order=30, warm=kidney_template, report=kidney_section)
+def main():
+    st.title(TITLE)
 
-    if patient_data["Urine protein"].iloc[0] not in [1, 2]:
-        warnings.append("🚨 요단백 수치가 비정상적입니다. 단백뇨 또는 신장 질환 가능성이 있습니다.")
+    # ✅ `session_state`에서 데이터 불러오기
+    if "patient" not in st.session_state:
+        st.warning("⚠️ 먼저 메인 페이지에서 건강 정보를 입력하세요.")
+        st.stop()  # 데이터가 없으면 실행 중지
 
-    if patient_data["fasting blood sugar"].iloc[0] > 126:
-        warnings.append("🚨 공복 혈당이 높습니다. 당뇨 가능성을 고려해 보세요.")
+    patient = st.session_state["patient"]
 
-    if warnings:
-        for warning in warnings:
-            st.error(warning)
-    else:
-        st.success("✅ 모든 수치가 정상 범위 내에 있습니다! 건강을 유지하세요.")
+    # 📊 그래프 + 건강 안내 메시지 (일괄 리포트와 같은 함수)
+    section_panel(kidney_section(patient))
 
+    # 👥 코호트 내 백분위 및 분포 비교
+    percentile_panel({
+        "serum creatinine": patient.serumCreatinine,
+        "Urine protein": patient.urineProtein,
+        "fasting blood sugar": patient.fastingBloodSugar,
+    }, patient.age, "kidney")
 
 if __name__ == "__main__":
     main()
-
-
-
-
@@ -0,0 +1,51 @@
+import streamlit as st
+import plotly.express as px
+from qaqc.page_registry import register_page
+from qaqc.shadow import CHAMPION, get_shadow
+
+def latency_figure(latencies):
+    fig = px.box(latencies, x="모델", y="지연 시간(ms)", color="모델", points=False,
+                 title="⏱️ 모델별 예측 지연 시간 (같은 Feature, 같은 스레드)")
+    fig.update_layout(showlegend=False, yaxis_type="log")
+    return fig
+
+@register_page("Shadow", order=90)
+def main():
+    st.title("🥊 Champion / Challenger 비교")
+    st.caption("화면의 예측 결과는 항상 champion 모델이 계산합니다. "
+               "challenger 모델은 같은 환자 Feature 를 백그라운드에서 예측하고, 결과는 이 페이지에만 기록됩니다.")
+
+    shadow = get_shadow()
+    if not shadow.challengers:
+        st.info("💡 등록된 challenger 모델이 없습니다. "
+                "`QAQC_CHALLENGERS=\"lite=files/challenger_lite.cbm\"` 처럼 환경 변수로 등록한 뒤 앱을 다시 시작하세요. "
+                "(`python -m qaqc.shadow build lite|logistic ...` 로 예시 모델 생성)")
+        st.stop()
+
+    report = shadow.report()
+    status = shadow.status()
+    m1, m2, m3 = st.columns(3)
+    m1.metric("평가한 요청", f"{int(report.loc[report['역할'] == CHAMPION, '요청 수'].iloc[0]):,}")
+    m2.metric("대기 중", status["pending"])
+    m3.metric("건너뜀 (대기열 가득)", status["dropped"])
+
+    # 📊 모델별 지연 시간 / 크기 / 일치율 나란히 비교
+    st.dataframe(report, hide_index=True)
+    latencies = shadow.latency_frame()
+    if not latencies.empty:
+        st.plotly_chart(latency_figure(latencies))
+
+    # 🔍 champion 과 라벨이 다르게 나온 최근 예측
+    st.subheader("🔍 최근 불일치")
+    disagreements = shadow.recent_disagreements()
+    if disagreements.empty:
+        st.success("✅ 최근 예측에서 champion 과 라벨이 다른 challenger 가 없습니다.")
+    else:
+        st.dataframe(disagreements, hide_index=True)
+
+    errors = {stats.name: stats.last_error for stats in shadow.stats.values() if stats.last_error}
+    for name, error in errors.items():
+        st.error(f"🚨 {name}: {error}")
+
+if __name__ == "__main__":
+    main()
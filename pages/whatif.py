@@ -0,0 +1,94 @@
+import streamlit as st
+import plotly.graph_objects as go
+from qaqc.inference import predict_patient
+from qaqc.model_registry import get_model
+from qaqc.page_registry import register_page
+from qaqc.prediction_cache import get_prediction_cache, prediction_key
+from qaqc.whatif import SWEEPS, sweep, sweep_values
+
+def sweep_figure(result, current_x, current_prob):
+    column = result.columns[0]
+    fig = go.Figure(go.Scatter(
+        x=result.values[0], y=result.probability * 100, mode="lines", line=dict(color="green", width=3),
+        name="금연 가능성", hovertemplate="%{x:.1f}: %{y:.1f}%<extra></extra>",
+    ))
+    fig.add_trace(go.Scatter(
+        x=[current_x], y=[current_prob * 100], mode="markers+text", marker=dict(color="red", size=12),
+        text=[f"🔴 현재 {current_prob * 100:.1f}%"], textposition="top center", name="현재 환자",
+    ))
+    fig.add_hline(y=50, line_dash="dash", line_color="gray", annotation_text="50%")
+    fig.update_layout(
+        title=f"📈 {SWEEPS[column][0]} 변화에 따른 금연 가능성",
+        xaxis_title=SWEEPS[column][0], yaxis_title="금연 가능성 (%)", yaxis_range=[0, 100], showlegend=False,
+    )
+    return fig
+
+def grid_figure(result, current_x, current_y):
+    column_x, column_y = result.columns
+    fig = go.Figure(go.Heatmap(
+        x=result.values[0], y=result.values[1], z=(result.probability * 100).T,
+        zmin=0, zmax=100, colorscale="RdYlGn", colorbar=dict(title="금연 가능성 (%)"),
+        hovertemplate="%{x:.1f}, %{y:.1f}: %{z:.1f}%<extra></extra>",
+    ))
+    fig.add_trace(go.Scatter(
+        x=[current_x], y=[current_y], mode="markers", marker=dict(color="black", size=12, symbol="x"), name="현재 환자",
+    ))
+    fig.update_layout(
+        title=f"🗺️ {SWEEPS[column_x][0]} x {SWEEPS[column_y][0]}",
+        xaxis_title=SWEEPS[column_x][0], yaxis_title=SWEEPS[column_y][0], showlegend=False,
+    )
+    return fig
+
+@register_page("What-if", order=65)
+def main():
+    st.title("🔀 What-if 민감도 분석")
+
+    # ✅ `session_state`에서 데이터 불러오기
+    if "patient" not in st.session_state:
+        st.warning("⚠️ 먼저 메인 페이지에서 건강 정보를 입력하세요.")
+        st.stop()  # 데이터가 없으면 실행 중지
+
+    patient = st.session_state["patient"]
+    st.caption("다른 항목은 그대로 두고 선택한 항목만 바꿨을 때의 금연 가능성입니다. (격자 전체를 한 번에 예측)")
+
+    model = get_model()
+    prediction = st.session_state["prediction"]
+    if st.session_state.get("model_version") != model.version:
+        # 메인 페이지에서 예측한 뒤 모델 파일이 바뀜 (hot reload): 현재 값도 곡선과 같은 모델로 다시 예측
+        st.warning("⚠️ 메인 페이지에서 예측한 뒤 모델이 업데이트되었습니다. 현재 모델로 다시 계산한 결과입니다.")
+        prediction = get_prediction_cache().get_or_compute(
+            prediction_key(patient.as_array(), model.version),
+            lambda: predict_patient(model, patient)
+        )
+    columns = list(SWEEPS)
+    labels = {column: SWEEPS[column][0] for column in columns}
+    mode = st.radio("분석 방식", ["1개 항목 (곡선)", "2개 항목 (히트맵)"], horizontal=True)
+
+    if mode.startswith("1"):
+        column = st.selectbox("바꿔 볼 항목", columns, format_func=labels.get)
+        points = st.slider("계산할 점 개수", 20, 500, 200, step=20)
+        current = patient.value(column)
+        result = sweep(model, patient, {column: sweep_values(column, points, current)})
+        # 현재 값의 금연 가능성은 메인 페이지 예측 결과 (모델이 같을 때) 를 그대로 사용
+        st.plotly_chart(sweep_figure(result, current, prediction.probability))
+
+        best = int(result.probability.argmax())
+        st.info(
+            f"💡 이 범위에서 금연 가능성이 가장 높은 {labels[column]}: "
+            f"**{result.values[0][best]:.1f}** ({result.probability[best] * 100:.1f}%)"
+        )
+    else:
+        col1, col2 = st.columns(2)
+        column_x = col1.selectbox("가로축 항목", columns, format_func=labels.get)
+        column_y = col2.selectbox("세로축 항목", [c for c in columns if c != column_x], format_func=labels.get)
+        points = st.slider("축당 점 개수", 10, 50, 50, step=5)
+        current_x, current_y = patient.value(column_x), patient.value(column_y)
+        result = sweep(model, patient, {
+            column_x: sweep_values(column_x, points, current_x),
+            column_y: sweep_values(column_y, points, current_y),
+        })
+        st.plotly_chart(grid_figure(result, current_x, current_y))
+        st.caption(f"총 {result.probability.size:,} 개 조합")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+"""예측 감사 로그 (main.py 에서 수행한 모든 예측 기록).
+
+UI 스레드는 기록을 메모리 큐에 넣기만 하고(put_nowait, 디스크 대기 없음),
+백그라운드 스레드가 batch_size 개 또는 flush_interval 초마다 모아서 SQLite(WAL) 에 한 트랜잭션으로 씁니다.
+큐가 가득 차면 기록을 버리고 dropped 로 셉니다 (backpressure 지표). 프로세스 종료 시 atexit 에서 남은 기록을 씁니다.
+쓰기 오류는 errors/last_error 로 세고, 다시 시도해도 쓸 수 없는 기록은 버리고 failed 로 셉니다 (쓰기 스레드는 계속 동작).
+
+    python -m qaqc.audit --from 2026-01-01 --to 2026-01-31 --patient P-001 --csv out.csv
+    python -m qaqc.audit --stats
+
+환경 변수: QAQC_AUDIT_PATH=경로, QAQC_AUDIT_QUEUE=큐 크기
+"""
+import argparse
+import atexit
+import datetime
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from qaqc.features import FEATURE_COLUMNS
+
+AUDIT_PATH = os.environ.get("QAQC_AUDIT_PATH", "files/audit.sqlite3")
+DEFAULT_QUEUE_SIZE = int(os.environ.get("QAQC_AUDIT_QUEUE", 10_000))
+DEFAULT_BATCH_SIZE = 512
+DEFAULT_FLUSH_INTERVAL = 1.0  # 초
+CLOSE_TIMEOUT = 10.0
+MAX_ATTEMPTS = 3  # 디스크/잠금 오류가 난 배치를 다시 시도하는 횟수
+
+TABLE = "predictions"
+META_COLUMNS = ["ts", "patient_id", "model_version", "smoking_pred", "smoking_prob_0", "tier"]
+COLUMNS = META_COLUMNS + FEATURE_COLUMNS
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS {TABLE} (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    patient_id TEXT,
+    model_version TEXT NOT NULL,
+    smoking_pred INTEGER NOT NULL,
+    smoking_prob_0 REAL NOT NULL,
+    tier TEXT,
+    {", ".join(f'"{column}" REAL' for column in FEATURE_COLUMNS)}
+);
+CREATE INDEX IF NOT EXISTS {TABLE}_ts ON {TABLE} (ts);
+CREATE INDEX IF NOT EXISTS {TABLE}_patient ON {TABLE} (patient_id, ts);
+"""
+_DTYPES = {"ts": "float64", "patient_id": object, "model_version": object, "smoking_pred": "int64", "tier": object}
+_INSERT = f"INSERT INTO {TABLE} ({', '.join(f'{chr(34)}{c}{chr(34)}' for c in COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+
+
+def audit_record(result, model_version, patient_id=None, ts=None):
+    """PredictionResult 한 건을 INSERT 용 tuple 로 만듭니다 (UI 스레드에서 호출, 수 µs)."""
+    return (
+        time.time() if ts is None else ts,
+        patient_id or None,
+        model_version,
+        int(np.asarray(result.prediction).ravel()[0]),
+        float(result.probability),
+        result.tier,
+        *np.asarray(result.features, dtype=np.float64).tolist(),
+    )
+
+
+def connect(path=AUDIT_PATH):
+    connection = sqlite3.connect(path, timeout=30)
+    # WAL: 쓰는 동안에도 조회 가능, 커밋된 트랜잭션은 프로세스가 죽어도 남음
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(_SCHEMA)
+    return connection
+
+
+def _timestamp(value):
+    """datetime / date / 'YYYY-MM-DD[ HH:MM]' 문자열 / 숫자(unix 초) -> unix 초."""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        value = datetime.datetime.fromisoformat(value)
+    if not isinstance(value, datetime.datetime):
+        value = datetime.datetime.combine(value, datetime.time())
+    return value.timestamp()
+
+
+def query(start=None, end=None, patient_id=None, limit=None, columns=None, path=AUDIT_PATH):
+    """[start, end) 기간 / 환자 ID 조건의 기록을 DataFrame 으로 반환합니다 (ts 인덱스 사용).
+
+    날짜만 주면 그날 0시(로컬 시각) 기준입니다. ts 는 로컬 시각 datetime 컬럼으로 변환됩니다.
+    """
+    conditions, params = [], []
+    if start is not None:
+        conditions.append("ts >= ?")
+        params.append(_timestamp(start))
+    if end is not None:
+        conditions.append("ts < ?")
+        params.append(_timestamp(end))
+    if patient_id is not None:
+        conditions.append("patient_id = ?")
+        params.append(str(patient_id))
+    selected = ", ".join(f'"{column}"' for column in (columns or COLUMNS))
+    sql = f"SELECT {selected} FROM {TABLE}"
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    sql += " ORDER BY ts"
+    if limit is not None:
+        sql += f" LIMIT {int(limit)}"
+    if os.path.exists(path):
+        with sqlite3.connect(f"file:{path}?mode=ro", uri=True) as connection:
+            frame = pd.read_sql_query(sql, connection, params=params)
+    else:
+        frame = pd.DataFrame(columns=columns or COLUMNS)
+    if frame.empty:
+        # 빈 결과도 컬럼 타입은 같게 (ts 는 datetime)
+        frame = frame.astype({column: _DTYPES.get(column, "float64") for column in frame.columns})
+    if "ts" in frame.columns:
+        # 조회 조건과 같은 기준(로컬 시각)으로 표시
+        local = datetime.datetime.now().astimezone().tzinfo
+        frame["ts"] = pd.to_datetime(frame["ts"], unit="s", utc=True).dt.tz_convert(local).dt.tz_localize(None)
+    return frame
+
+
+class AuditLog:
+    def __init__(self, path=AUDIT_PATH, maxsize=DEFAULT_QUEUE_SIZE, batch_size=DEFAULT_BATCH_SIZE,
+                 flush_interval=DEFAULT_FLUSH_INTERVAL):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize)
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self.enqueued = 0
+        self.dropped = 0
+        self.written = 0
+        self.batches = 0
+        self.errors = 0
+        self.failed = 0
+        self.max_depth = 0
+        self.last_flush_ms = 0.0
+        self.last_error = None
+        self._thread = threading.Thread(target=self._run, name="qaqc-audit", daemon=True)
+        self._thread.start()
+
+    def log(self, record):
+        """기록을 큐에 넣습니다. 절대 기다리지 않으며, 큐가 가득 차면 False (dropped 증가)."""
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+        with self._lock:
+            self.enqueued += 1
+            self.max_depth = max(self.max_depth, self._queue.qsize())
+        return True
+
+    def _take_batch(self):
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval)]
+        except queue.Empty:
+            return []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, connection, batch):
+        started = time.perf_counter()
+        with connection:
+            connection.executemany(_INSERT, batch)
+        with self._lock:
+            self.written += len(batch)
+            self.batches += 1
+            self.last_flush_ms = (time.perf_counter() - started) * 1000
+
+    def _write_each(self, connection, batch):
+        """한 건씩 써 보고 쓸 수 없는 기록만 버립니다 (잘못된 기록이 섞인 배치)."""
+        written = 0
+        if connection is not None:
+            for record in batch:
+                try:
+                    with connection:
+                        connection.execute(_INSERT, record)
+                    written += 1
+                except Exception:
+                    pass
+        with self._lock:
+            self.written += written
+            self.failed += len(batch) - written
+
+    def _run(self):
+        connection = None
+        pending = []
+        attempts = 0
+        while not (self._stop.is_set() and self._queue.empty() and not pending):
+            if not pending:
+                pending = self._take_batch()
+                attempts = 0
+                if not pending:
+                    continue
+            try:
+                if connection is None:
+                    connection = connect(self.path)
+                self._write(connection, pending)
+            except Exception as e:
+                attempts += 1
+                with self._lock:
+                    self.errors += 1
+                    self.last_error = f"{type(e).__name__}: {e}"
+                if isinstance(e, sqlite3.OperationalError) and attempts < MAX_ATTEMPTS and not self._stop.is_set():
+                    # 디스크/잠금 오류: 같은 배치를 잠시 후 다시 시도 (그동안 큐가 차면 새 기록은 dropped)
+                    time.sleep(self.flush_interval)
+                    continue
+                # 🚨 다시 시도해도 쓸 수 없는 배치: 쓸 수 있는 기록만 쓰고 나머지는 버린 뒤 계속 동작
+                self._write_each(connection, pending)
+            for _ in pending:
+                self._queue.task_done()
+            pending = []
+        if connection is not None:
+            connection.close()
+
+    def flush(self):
+        """큐에 있는 기록이 모두 쓰일 때까지 기다립니다 (조회/테스트용, UI 스레드에서는 호출하지 않음)."""
+        self._queue.join()
+
+    def close(self, timeout=CLOSE_TIMEOUT):
+        """남은 기록을 모두 쓰고 쓰기 스레드를 끝냅니다."""
+        self._stop.set()
+        self._thread.join(timeout)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "enqueued": self.enqueued,
+                "written": self.written,
+                "dropped": self.dropped,
+                "queue_depth": self._queue.qsize(),
+                "max_depth": self.max_depth,
+                "maxsize": self._queue.maxsize,
+                "batches": self.batches,
+                "mean_batch_rows": self.written / self.batches if self.batches else 0.0,
+                "last_flush_ms": self.last_flush_ms,
+                "errors": self.errors,
+                "failed": self.failed,
+                "last_error": self.last_error,
+            }
+
+
+_lock = threading.Lock()
+_logs = {}
+
+
+def get_audit_log(path=AUDIT_PATH):
+    """프로세스 전체에서 공유되는 AuditLog (처음 호출할 때 쓰기 스레드 시작, 종료 시 atexit 로 flush)."""
+    log = _logs.get(path)
+    if log is None:
+        with _lock:
+            log = _logs.get(path)
+            if log is None:
+                log = AuditLog(path)
+                atexit.register(log.close)
+                _logs[path] = log
+    return log
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="qaqc-audit", description="예측 감사 로그 조회")
+    parser.add_argument("--from", dest="start", default=None, help="시작 시각 (YYYY-MM-DD[ HH:MM], 포함)")
+    parser.add_argument("--to", dest="end", default=None, help="끝 시각 (YYYY-MM-DD[ HH:MM], 제외)")
+    parser.add_argument("--patient", default=None, help="환자 ID")
+    parser.add_argument("--limit", type=int, default=None)
+    parser.add_argument("--csv", default=None, help="결과를 저장할 CSV 경로 (기본: 요약 출력)")
+    parser.add_argument("--path", default=AUDIT_PATH, help="감사 로그 SQLite 파일")
+    parser.add_argument("--stats", action="store_true", help="기간별 건수만 출력")
+    args = parser.parse_args(argv)
+
+    if args.stats:
+        frame = query(args.start, args.end, args.patient, columns=["ts", "model_version"], path=args.path)
+        if frame.empty:
+            print("no records")
+            return 0
+        print(frame.groupby([frame["ts"].dt.date, "model_version"]).size().rename("predictions").to_string())
+        return 0
+    frame = query(args.start, args.end, args.patient, args.limit, path=args.path)
+    if args.csv:
+        frame.to_csv(args.csv, index=False)
+        print(f"✅ {len(frame):,} rows -> {args.csv}")
+    else:
+        print(frame[META_COLUMNS[:5]].to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""코호트 집계 큐브.
+
+코호트를 (나이, BMI 범주, 간수치 이상 여부, 금연 확률 구간) 별 합계로 한 번만 집계해 둡니다.
+큐브의 크기는 환자 수와 무관하게 (나이 종류 x 4 x 2 x PROB_BINS) 행 이하이므로,
+필터/그룹 변경은 원본 행을 다시 읽지 않고 작은 큐브 위에서만 계산됩니다.
+"""
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from qaqc.cohort_store import COHORT_PATH, ensure_cohort
+from qaqc.features import BMI_CATEGORIES
+from qaqc.quantiles import AGE_BANDS, AGE_EDGES
+from qaqc.ranges import get_range
+
+LIVER_COLUMNS = ["AST", "ALT", "Gtp"]
+PROB_BINS = 20
+DIMENSIONS = ["age", "BMI_category", "liver_abnormal", "prob_bin"]
+BATCH_SIZE = 1 << 20
+
+_READ_COLUMNS = ["age", "BMI_category", "smoking_pred", "smoking_prob_0"] + LIVER_COLUMNS
+_AGGREGATES = [("smoking_prob_0", "sum"), ("smoking_prob_0", "count"), ("smoking_pred", "sum")]
+_RENAME = {
+    "smoking_prob_0_sum": "prob_sum", "smoking_prob_0_count": "count", "smoking_pred_sum": "smokers",
+    # 부분 큐브를 합칠 때 붙는 이름
+    "prob_sum_sum": "prob_sum", "count_sum": "count", "smokers_sum": "smokers",
+}
+
+
+def _partial_cube(batch):
+    # ✅ 간수치 중 하나라도 기준 범위를 벗어나면 이상 소견
+    liver = np.zeros(batch.num_rows, dtype=bool)
+    for column in LIVER_COLUMNS:
+        liver |= get_range(column).abnormal(batch.column(column).to_numpy(zero_copy_only=False))
+    prob = batch.column("smoking_prob_0").to_numpy(zero_copy_only=False)
+    prob_bin = np.clip((prob * PROB_BINS).astype(np.int8), 0, PROB_BINS - 1)
+    table = pa.table({
+        "age": batch.column("age"),
+        "BMI_category": pc.dictionary_decode(batch.column("BMI_category")),
+        "liver_abnormal": liver,
+        "prob_bin": prob_bin,
+        "smoking_prob_0": pc.cast(batch.column("smoking_prob_0"), pa.float64()),
+        "smoking_pred": pc.cast(batch.column("smoking_pred"), pa.int64()),
+    })
+    return _rename(table.group_by(DIMENSIONS).aggregate(_AGGREGATES))
+
+
+def _rename(table):
+    return table.rename_columns([_RENAME.get(name, name) for name in table.column_names])
+
+
+def build_cube(path=COHORT_PATH, batch_size=BATCH_SIZE):
+    """Parquet 코호트를 batch 단위로 읽어 큐브(pandas DataFrame)를 만듭니다. 메모리는 batch 하나 분량만 사용."""
+    parquet = pq.ParquetFile(ensure_cohort(path), memory_map=True)
+    partials = [_partial_cube(batch) for batch in parquet.iter_batches(batch_size, columns=_READ_COLUMNS)]
+    # 부분 큐브는 합계라서 다시 합치기만 하면 됨
+    merged = _rename(pa.concat_tables(partials).group_by(DIMENSIONS).aggregate(
+        [("prob_sum", "sum"), ("count", "sum"), ("smokers", "sum")]
+    ))
+    cube = merged.to_pandas()
+    cube["BMI_category"] = pd.Categorical(cube["BMI_category"], categories=BMI_CATEGORIES)
+    cube["age_band"] = pd.Categorical.from_codes(
+        np.searchsorted(AGE_EDGES, cube["age"].to_numpy(), side="right"), categories=AGE_BANDS
+    )
+    return cube
+
+
+class CohortCube:
+    def __init__(self, cube, version):
+        self.cube = cube
+        self.version = version
+
+    @property
+    def age_range(self):
+        return int(self.cube["age"].min()), int(self.cube["age"].max())
+
+    def select(self, age_range=None, bmi_categories=None, liver_abnormal=None):
+        """필터 조건에 맞는 큐브 행만 반환합니다. liver_abnormal: None(전체) / True / False"""
+        mask = np.ones(len(self.cube), dtype=bool)
+        if age_range is not None:
+            mask &= self.cube["age"].between(*age_range).to_numpy()
+        if bmi_categories is not None:
+            mask &= self.cube["BMI_category"].isin(bmi_categories).to_numpy()
+        if liver_abnormal is not None:
+            mask &= (self.cube["liver_abnormal"] == liver_abnormal).to_numpy()
+        return self.cube[mask]
+
+    @staticmethod
+    def summarize(cells, by):
+        """by 컬럼별 환자 수, 평균 금연 가능성(%), 흡연 예측 비율(%)."""
+        grouped = cells.groupby(by, observed=True)[["count", "prob_sum", "smokers"]].sum()
+        return pd.DataFrame({
+            "환자 수": grouped["count"].astype(int),
+            "평균 금연 가능성(%)": grouped["prob_sum"] / grouped["count"] * 100,
+            "흡연 예측 비율(%)": grouped["smokers"] / grouped["count"] * 100,
+        }).reset_index()
+
+    @staticmethod
+    def histogram(cells):
+        """금연 확률(smoking_prob_0) 구간별 환자 수 (PROB_BINS 개, 빈 구간 포함)."""
+        counts = cells.groupby("prob_bin")["count"].sum().reindex(range(PROB_BINS), fill_value=0)
+        edges = np.linspace(0, 100, PROB_BINS + 1)
+        return pd.DataFrame({"구간 시작(%)": edges[:-1], "환자 수": counts.to_numpy().astype(int)})
+
+
+_lock = threading.Lock()
+_cubes = {}
+
+
+def get_cube(path=COHORT_PATH):
+    """프로세스 전체에서 공유되는 CohortCube (코호트 파일이 바뀌면 다시 집계)."""
+    stat = os.stat(ensure_cohort(path))
+    version = (stat.st_mtime_ns, stat.st_size)
+    cube = _cubes.get(path)
+    if cube is None or cube.version != version:
+        with _lock:
+            cube = _cubes.get(path)
+            if cube is None or cube.version != version:
+                cube = CohortCube(build_cube(path), version)
+                _cubes[path] = cube
+    return cube
@@ -0,0 +1,122 @@
+"""기준 코호트(files/test_with_predictions.csv)의 타입이 지정된 Parquet 저장소.
+
+CSV 를 한 번 변환해 두면, 이후에는 memory-map 으로 필요한 컬럼만 읽고
+나이/BMI 범주 조건은 row group 통계로 걸러서(predicate pushdown) 읽습니다.
+
+    python -m qaqc.cohort_store            # CSV -> files/cohort.parquet 변환
+"""
+import argparse
+import os
+import sys
+import threading
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+from qaqc.features import BMI_CATEGORIES, DERIVED_COLUMNS, DUMMY_COLUMNS, INPUT_COLUMNS
+
+COHORT_CSV = "files/test_with_predictions.csv"
+COHORT_PATH = "files/cohort.parquet"
+
+# ✅ 컬럼 타입: 검사 수치는 float32, 코드값은 uint8, 더미는 bool, BMI 범주는 dictionary
+_CODE_COLUMNS = ["age", "hearing(left)", "hearing(right)", "Urine protein", "dental caries"]
+SCHEMA = pa.schema(
+    [pa.field("Patient_ID", pa.int32())]
+    + [pa.field(name, pa.uint8() if name in _CODE_COLUMNS else pa.float32()) for name in INPUT_COLUMNS]
+    + [pa.field(name, pa.float32()) for name in DERIVED_COLUMNS]
+    + [pa.field(name, pa.bool_()) for name in DUMMY_COLUMNS]
+    + [pa.field("smoking_pred", pa.uint8()), pa.field("smoking_prob_0", pa.float32())]
+    + [pa.field("BMI_category", pa.dictionary(pa.int8(), pa.string()))]
+)
+
+# 나이순으로 정렬해 작은 row group 으로 저장하면 나이 조건으로 대부분의 row group 을 건너뜀
+ROW_GROUP_SIZE = 2048
+
+_lock = threading.Lock()
+
+
+def _with_bmi_category(batch):
+    # 더미 컬럼(drop_first)으로부터 BMI 범주 코드를 복원: 모두 False 면 Underweight
+    codes = np.zeros(batch.num_rows, dtype=np.int8)
+    for code, name in enumerate(DUMMY_COLUMNS, start=1):
+        codes[batch.column(name).to_numpy(zero_copy_only=False)] = code
+    category = pa.DictionaryArray.from_arrays(pa.array(codes), pa.array(BMI_CATEGORIES))
+    return pa.Table.from_batches([batch]).append_column("BMI_category", category)
+
+
+def convert_csv(csv_path=COHORT_CSV, out_path=COHORT_PATH, block_size=16 << 20):
+    """CSV 를 블록 단위로 스트리밍하며 SCHEMA 타입의 Parquet 파일로 변환합니다."""
+    column_types = {field.name: field.type for field in SCHEMA if field.name != "BMI_category"}
+    reader = pa_csv.open_csv(
+        csv_path,
+        read_options=pa_csv.ReadOptions(block_size=block_size),
+        convert_options=pa_csv.ConvertOptions(column_types=column_types),
+    )
+    tmp_path = f"{out_path}.tmp"
+    rows = 0
+    with pq.ParquetWriter(tmp_path, SCHEMA) as writer:
+        for batch in reader:
+            table = _with_bmi_category(batch).select(SCHEMA.names).cast(SCHEMA)
+            table = table.take(pc.sort_indices(table, [("age", "ascending")]))
+            writer.write_table(table, row_group_size=ROW_GROUP_SIZE)
+            rows += table.num_rows
+    os.replace(tmp_path, out_path)
+    return rows
+
+
+def ensure_cohort(path=COHORT_PATH, csv_path=COHORT_CSV):
+    """Parquet 파일이 없거나 CSV 보다 오래되었으면 다시 변환합니다."""
+    if os.path.exists(path) and (
+        not os.path.exists(csv_path) or os.path.getmtime(path) >= os.path.getmtime(csv_path)
+    ):
+        return path
+    with _lock:
+        if not os.path.exists(path) or os.path.getmtime(path) < os.path.getmtime(csv_path):
+            convert_csv(csv_path, path)
+    return path
+
+
+def build_filter(age_range=None, bmi_category=None):
+    """나이 범위 (min, max) 와 BMI 범주(문자열 또는 목록) 조건을 Arrow 표현식으로 만듭니다."""
+    expression = None
+    if age_range is not None:
+        low, high = age_range
+        expression = (pc.field("age") >= low) & (pc.field("age") <= high)
+    if bmi_category is not None:
+        categories = [bmi_category] if isinstance(bmi_category, str) else list(bmi_category)
+        condition = pc.field("BMI_category").isin(categories)
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+def read_cohort(columns=None, age_range=None, bmi_category=None, filters=None, path=COHORT_PATH):
+    """코호트를 pyarrow.Table 로 읽습니다 (컬럼 선택 + 조건 pushdown + memory-map)."""
+    path = ensure_cohort(path)
+    expression = build_filter(age_range, bmi_category)
+    if filters is not None:
+        expression = filters if expression is None else expression & filters
+    return pq.read_table(path, columns=columns, filters=expression, memory_map=True)
+
+
+def load_cohort(columns=None, age_range=None, bmi_category=None, filters=None, path=COHORT_PATH):
+    """read_cohort 결과를 pandas DataFrame 으로 반환합니다."""
+    return read_cohort(columns, age_range, bmi_category, filters, path).to_pandas()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="코호트 CSV 를 Parquet 저장소로 변환")
+    parser.add_argument("csv", nargs="?", default=COHORT_CSV)
+    parser.add_argument("output", nargs="?", default=COHORT_PATH)
+    args = parser.parse_args(argv)
+
+    rows = convert_csv(args.csv, args.output)
+    size = os.path.getsize(args.output) / 1e6
+    print(f"✅ {rows:,} rows -> {args.output} ({size:.1f} MB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
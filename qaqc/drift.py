@@ -0,0 +1,277 @@
+"""기준 코호트 대비 입력값 / 금연 확률 분포 변화(drift) 모니터.
+
+기준 코호트(files/test_with_predictions.csv)로 컬럼별 구간(bin) 경계와 구간별 비율을 한 번 계산해 두고,
+예측이 일어날 때마다(대시보드, 배치 스코어링) 현재 구간 카운트만 더합니다.
+PSI / KS 는 구간 카운트만으로 계산하므로 관측 수와 무관하게 O(구간 수) 입니다.
+
+    python -m qaqc.drift scored.csv            # 스코어링 결과 파일과 기준 코호트 비교
+    python -m qaqc.drift --state files/drift_state.npz
+"""
+import argparse
+import hashlib
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from qaqc.cohort_store import COHORT_PATH, ensure_cohort, read_cohort
+from qaqc.features import INPUT_COLUMNS
+
+SCORE_COLUMN = "smoking_prob_0"
+MONITORED_COLUMNS = INPUT_COLUMNS + [SCORE_COLUMN]
+BINS = 10
+SMALL_BATCH = 256
+# 배치 스코어링(python -m qaqc.score --drift) 결과를 누적하는 파일
+DRIFT_STATE = "files/drift_state.npz"
+# 현재 구간: 최근 WINDOW 초를 BUCKET 초 단위로 나눠 보관하고 오래된 단위부터 뺌
+DEFAULT_WINDOW = float(os.environ.get("QAQC_DRIFT_WINDOW", 7 * 24 * 3600))
+DEFAULT_BUCKET = float(os.environ.get("QAQC_DRIFT_BUCKET", 3600))
+MIN_OBSERVATIONS = 30
+# PSI 기준: 0.1 미만 안정, 0.25 미만 주의, 그 이상 경고
+PSI_WARN = 0.1
+PSI_ALERT = 0.25
+# KS 임계값 계수 (유의수준 5%)
+KS_ALPHA_COEF = 1.358
+_EPS = 1e-4
+
+
+def bin_edges(values, bins=BINS):
+    """구간 경계. 값 종류가 bins 개 이하면 값마다 한 구간, 아니면 분위수 구간.
+
+    경계는 항상 서로 다른 두 관측값의 중간에 두어 float32/float64 반올림 차이로 구간이 바뀌지 않게 합니다.
+    """
+    # 결측(NaN)/무한대는 경계 계산에서 제외 (히스토그램에서도 세지 않거나 양 끝 구간으로 감)
+    finite = values[np.isfinite(values)]
+    distinct = np.unique(finite)
+    if len(distinct) <= bins:
+        return (distinct[:-1] + distinct[1:]) / 2
+    index = np.searchsorted(distinct, np.nanquantile(finite, np.linspace(0, 1, bins + 1)[1:-1]))
+    index = np.unique(np.clip(index, 1, len(distinct) - 1))
+    return (distinct[index - 1] + distinct[index]) / 2
+
+
+class Reference:
+    """컬럼별 구간 경계(edges)와 기준 코호트의 구간 카운트 (len(MONITORED_COLUMNS), BINS)."""
+
+    def __init__(self, edges, counts, version=None):
+        self.edges = edges
+        self.counts = counts
+        self.version = version
+        # 작은 배치용: 경계를 NaN 으로 채운 (컬럼 수, BINS - 1) 행렬
+        # (NaN 과의 비교는 항상 False 라서 +inf 입력도 searchsorted 처럼 그 컬럼의 마지막 구간에 들어감)
+        self._padded = np.full((len(edges), counts.shape[1] - 1), np.nan)
+        digest = hashlib.blake2b(digest_size=8)
+        for i, column_edges in enumerate(edges):
+            self._padded[i, :len(column_edges)] = column_edges
+            digest.update(np.asarray(column_edges, dtype=np.float64).tobytes())
+        self.key = digest.hexdigest()
+
+    @classmethod
+    def from_frame(cls, frame, bins=BINS, version=None):
+        edges = [bin_edges(frame[column].to_numpy(dtype=np.float64), bins) for column in MONITORED_COLUMNS]
+        reference = cls(edges, np.zeros((len(MONITORED_COLUMNS), bins), dtype=np.int64), version)
+        reference.counts = reference.histogram(frame[INPUT_COLUMNS].to_numpy(dtype=np.float64),
+                                               frame[SCORE_COLUMN].to_numpy(dtype=np.float64))
+        return reference
+
+    @property
+    def bins(self):
+        return self.counts.shape[1]
+
+    def histogram(self, rows, prob0=None):
+        """(n, 22) 입력 행렬과 smoking_prob_0 (n,) 의 구간 카운트. NaN 은 세지 않음 (prob0=None 이면 확률 컬럼의 카운트는 0)."""
+        rows = np.atleast_2d(np.asarray(rows, dtype=np.float64))
+        prob0 = np.full(len(rows), np.nan) if prob0 is None else np.atleast_1d(np.asarray(prob0, dtype=np.float64))
+        values = np.column_stack([rows, prob0])
+        if len(values) <= SMALL_BATCH:
+            # 대시보드 한 명 예측: 컬럼별 searchsorted 대신 한 번의 비교로 모든 컬럼의 구간 계산
+            index = (values[:, :, None] >= self._padded).sum(axis=2) + np.arange(len(self.edges)) * self.bins
+            flat = np.bincount(index[~np.isnan(values)], minlength=self.counts.size)
+            return flat.reshape(self.counts.shape)
+        counts = np.zeros_like(self.counts)
+        for i, column in enumerate(values.T):
+            column = column[~np.isnan(column)]
+            counts[i] = np.bincount(np.searchsorted(self.edges[i], column, side="right"), minlength=self.bins)
+        return counts
+
+
+_lock = threading.Lock()
+_references = {}
+_monitors = {}
+
+
+def build_reference(path=COHORT_PATH, bins=BINS):
+    table = read_cohort(MONITORED_COLUMNS, path=path)
+    stat = os.stat(path)
+    return Reference.from_frame(table.to_pandas(), bins, (stat.st_mtime_ns, stat.st_size))
+
+
+def get_reference(path=COHORT_PATH):
+    """프로세스 전체에서 공유되는 기준 분포 (코호트 파일이 바뀌면 다시 계산)."""
+    stat = os.stat(ensure_cohort(path))
+    version = (stat.st_mtime_ns, stat.st_size)
+    reference = _references.get(path)
+    if reference is None or reference.version != version:
+        with _lock:
+            reference = _references.get(path)
+            if reference is None or reference.version != version:
+                reference = build_reference(path)
+                _references[path] = reference
+    return reference
+
+
+def _psi(expected, actual):
+    p = np.maximum(expected / max(expected.sum(), 1), _EPS)
+    q = np.maximum(actual / max(actual.sum(), 1), _EPS)
+    return float(np.sum((q - p) * np.log(q / p)))
+
+
+def _ks(expected, actual):
+    # 구간 경계에서의 누적 비율 차이 최댓값 (원자료 KS 의 하한)
+    return float(np.max(np.abs(np.cumsum(expected) / max(expected.sum(), 1) - np.cumsum(actual) / max(actual.sum(), 1))))
+
+
+def status(psi, observations):
+    if observations < MIN_OBSERVATIONS:
+        return "⚪ 표본 부족"
+    if psi < PSI_WARN:
+        return "🟢 안정"
+    if psi < PSI_ALERT:
+        return "🟡 주의"
+    return "🔴 경고"
+
+
+class DriftMonitor:
+    """최근 window 초 동안의 구간 카운트를 bucket 초 단위로 누적합니다 (스레드 안전)."""
+
+    def __init__(self, reference, window=DEFAULT_WINDOW, bucket=DEFAULT_BUCKET, clock=time.time):
+        self.reference = reference
+        self.window = window
+        self.bucket = bucket
+        self._clock = clock
+        self._buckets = deque()  # [bucket 시작 시각, 카운트]
+        self._totals = np.zeros_like(reference.counts)
+        self._lock = threading.Lock()
+
+    def update(self, rows, prob0=None):
+        """예측한 입력 행(들)과 smoking_prob_0 을 현재 구간 카운트에 더합니다."""
+        self.add_counts(self.reference.histogram(rows, prob0))
+
+    def add_counts(self, counts, at=None):
+        at = self._clock() if at is None else at
+        start = at - at % self.bucket
+        with self._lock:
+            if self._buckets and self._buckets[-1][0] == start:
+                self._buckets[-1][1] += counts
+            else:
+                self._buckets.append([start, counts.copy()])
+            self._totals += counts
+            self._expire()
+
+    def _expire(self):
+        oldest = self._clock() - self.window
+        while self._buckets and self._buckets[0][0] + self.bucket <= oldest:
+            self._totals -= self._buckets.popleft()[1]
+
+    def counts(self):
+        with self._lock:
+            self._expire()
+            return self._totals.copy()
+
+    def report(self):
+        """컬럼별 관측 수, PSI, KS, KS 임계값(5%), 상태."""
+        current = self.counts()
+        rows = []
+        for i, column in enumerate(MONITORED_COLUMNS):
+            n_bins = len(self.reference.edges[i]) + 1
+            expected, actual = self.reference.counts[i, :n_bins], current[i, :n_bins]
+            n, m = int(expected.sum()), int(actual.sum())
+            psi = _psi(expected, actual) if m else np.nan
+            rows.append({
+                "컬럼": column,
+                "관측 수": m,
+                "PSI": psi,
+                "KS": _ks(expected, actual) if m else np.nan,
+                "KS 임계값": KS_ALPHA_COEF * np.sqrt((n + m) / (n * m)) if n and m else np.nan,
+                "상태": status(psi, m),
+            })
+        return pd.DataFrame(rows)
+
+    def histograms(self, column):
+        """기준 / 현재 구간별 비율(%) (구간은 '경계 미만' 형식의 이름)."""
+        i = MONITORED_COLUMNS.index(column)
+        edges = self.reference.edges[i]
+        n_bins = len(edges) + 1
+        labels = [f"< {edges[0]:g}"] + [f"{a:g} ~ {b:g}" for a, b in zip(edges[:-1], edges[1:])] + [f"≥ {edges[-1]:g}"] \
+            if len(edges) else ["전체"]
+        expected, actual = self.reference.counts[i, :n_bins], self.counts()[i, :n_bins]
+        return pd.DataFrame({
+            "구간": labels,
+            "기준(%)": expected / max(expected.sum(), 1) * 100,
+            "현재(%)": actual / max(actual.sum(), 1) * 100,
+        })
+
+    def save(self, path=DRIFT_STATE):
+        with self._lock:
+            self._expire()
+            starts = np.array([start for start, _ in self._buckets], dtype=np.float64)
+            counts = np.array([c for _, c in self._buckets], dtype=np.int64).reshape(len(starts), *self._totals.shape)
+        tmp_path = f"{path}.tmp.npz"
+        np.savez_compressed(tmp_path, reference=self.reference.key, starts=starts, counts=counts)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, reference, path=DRIFT_STATE, **kwargs):
+        """저장된 카운트를 불러옵니다. 파일이 없거나 기준 구간이 바뀌었으면 빈 모니터."""
+        monitor = cls(reference, **kwargs)
+        if not os.path.exists(path):
+            return monitor
+        with np.load(path) as state:
+            if str(state["reference"]) != reference.key or state["counts"].shape[1:] != reference.counts.shape:
+                return monitor
+            for start, counts in zip(state["starts"], state["counts"]):
+                monitor.add_counts(counts, at=float(start))
+        return monitor
+
+
+def get_monitor(path=COHORT_PATH):
+    """프로세스 전체에서 공유되는 대시보드용 DriftMonitor."""
+    reference = get_reference(path)
+    monitor = _monitors.get(path)
+    if monitor is None or monitor.reference is not reference:
+        with _lock:
+            monitor = _monitors.get(path)
+            if monitor is None or monitor.reference is not reference:
+                monitor = DriftMonitor(reference)
+                _monitors[path] = monitor
+    return monitor
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="qaqc-drift", description="기준 코호트 대비 분포 변화(PSI/KS) 확인")
+    parser.add_argument("input", nargs="?", help="스코어링 결과 CSV/Parquet (smoking_prob_0 없으면 입력값만 비교)")
+    parser.add_argument("--state", default=None, help=f"누적 카운트 파일 (예: {DRIFT_STATE})")
+    parser.add_argument("--chunk-size", type=int, default=100_000, help="청크당 행 수")
+    args = parser.parse_args(argv)
+    if args.input is None and args.state is None:
+        parser.error("input 또는 --state 중 하나가 필요합니다")
+
+    from qaqc.score import iter_chunks
+
+    reference = get_reference()
+    # 파일 비교는 시간 창 없이 전체 행을 셈
+    monitor = DriftMonitor.load(reference, args.state, window=np.inf) if args.state else DriftMonitor(reference, window=np.inf)
+    if args.input:
+        for chunk in iter_chunks(args.input, args.chunk_size):
+            prob0 = chunk[SCORE_COLUMN].to_numpy() if SCORE_COLUMN in chunk.columns else None
+            monitor.update(chunk[INPUT_COLUMNS].to_numpy(dtype=np.float64), prob0)
+    print(monitor.report().to_string(index=False, float_format=lambda v: f"{v:.4f}"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
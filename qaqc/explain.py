@@ -0,0 +1,182 @@
+"""CatBoost ShapValues 기반 Feature 기여도.
+
+CatBoost 의 SHAP 값은 흡연(클래스 1) log-odds 기준이므로, 화면의 "금연 가능성"과 방향을 맞추기 위해
+부호를 바꿔 금연(클래스 0) 쪽 기여도로 반환합니다. (양수: 금연 가능성을 높임)
+
+    python -m qaqc.explain input.csv shap.parquet --chunk-size 50000
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from qaqc.cohort_store import COHORT_PATH, read_cohort
+from qaqc.features import FEATURE_COLUMNS, INPUT_COLUMNS, transform, transform_array
+from qaqc.inference import BULK_THREADS, LOW_LATENCY_THREADS
+from qaqc.instrumentation import timed
+from qaqc.model_registry import MODEL_PATH, get_model
+from qaqc.prediction_cache import DEFAULT_TTL, PredictionCache
+
+SHAP_COLUMNS = [f"shap_{column}" for column in FEATURE_COLUMNS]
+BASE_COLUMN = "shap_base"
+GLOBAL_SAMPLE = 5000
+# 환자별 SHAP 설명 캐시 크기 (예측 캐시와 따로 두어 예측 캐시의 hit/miss 통계가 섞이지 않도록)
+EXPLANATION_CACHE_SIZE = int(os.environ.get("QAQC_EXPLANATION_CACHE_SIZE", 1024))
+
+
+def shap_values(model, features, thread_count=BULK_THREADS, shap_mode="Auto"):
+    """features (n, 31) -> (n, 32) 금연 기준 SHAP 값 (마지막 열은 기댓값).
+
+    shap_mode: 환자 한 명은 "Auto"(사전 계산 생략), 대량 배치는 "UsePreCalc"
+    (트리별 사전 계산 비용이 호출마다 한 번 들기 때문에 큰 청크로 나눠서 호출)
+    """
+    from catboost import Pool
+
+    pool = Pool(np.asarray(features, dtype=np.float32), feature_names=FEATURE_COLUMNS)
+    values = model.get_feature_importance(pool, type="ShapValues", shap_mode=shap_mode, thread_count=thread_count)
+    return -values
+
+
+@dataclass(frozen=True)
+class Explanation:
+    features: np.ndarray
+    contributions: np.ndarray
+    base_value: float
+
+    def top(self, n=8):
+        """기여도 절댓값이 큰 순서로 n 개 Feature."""
+        order = np.argsort(-np.abs(self.contributions))[:n]
+        return pd.DataFrame({
+            "feature": [FEATURE_COLUMNS[i] for i in order],
+            "value": self.features[order],
+            "contribution": self.contributions[order],
+        })
+
+
+@timed("shap")
+def explain_patient(model, patient):
+    """환자 한 명의 Feature 별 기여도."""
+    features = transform_array(patient.as_array())
+    values = shap_values(model, features, LOW_LATENCY_THREADS)[0]
+    return Explanation(features[0], values[:-1], float(values[-1]))
+
+
+_explanations = PredictionCache(maxsize=EXPLANATION_CACHE_SIZE, ttl=DEFAULT_TTL)
+
+
+def get_explanation_cache():
+    """환자 입력 벡터 + 모델 버전을 키로 하는 Explanation 캐시 (prediction_key 사용)."""
+    return _explanations
+
+
+_lock = threading.Lock()
+_importances = {}
+_warm_lock = threading.Lock()
+_warming = set()
+
+
+@timed("global_importance")
+def global_importance(model, path=COHORT_PATH, sample=GLOBAL_SAMPLE):
+    """코호트 표본의 평균 |SHAP| (모델 버전별로 한 번만 계산)."""
+    key = (model.version, path, sample)
+    importance = _importances.get(key)
+    if importance is None:
+        with _lock:
+            importance = _importances.get(key)
+            if importance is None:
+                cohort = read_cohort(columns=INPUT_COLUMNS, path=path).to_pandas()
+                if len(cohort) > sample:
+                    cohort = cohort.sample(sample, random_state=0)
+                values = shap_values(model, transform_array(cohort[INPUT_COLUMNS]), shap_mode="UsePreCalc")
+                importance = pd.Series(np.abs(values[:, :-1]).mean(axis=0), index=FEATURE_COLUMNS)
+                importance = importance.sort_values(ascending=False)
+                _importances[key] = importance
+    return importance
+
+
+def warm_global_importance(model=None, path=COHORT_PATH, sample=GLOBAL_SAMPLE):
+    """global_importance 를 백그라운드 스레드에서 미리 계산합니다 (이미 계산했거나 계산 중이면 무시).
+
+    model 없이 호출하면 스레드에서 get_model() 로 불러오며, 프로세스당 한 번만 실행합니다 (앱 시작 시).
+    """
+    key = (model.version if model is not None else None, path, sample)
+    with _warm_lock:
+        if key in _importances or key in _warming:
+            return
+        _warming.add(key)
+    threading.Thread(
+        target=_warm, args=(model, path, sample, key), name="qaqc-global-importance", daemon=True
+    ).start()
+
+
+def _warm(model, path, sample, key):
+    try:
+        global_importance(model if model is not None else get_model(), path, sample)
+    finally:
+        if model is not None:
+            with _warm_lock:
+                _warming.discard(key)
+
+
+def cached_importance(model, path=COHORT_PATH, sample=GLOBAL_SAMPLE):
+    """계산이 끝난 global_importance 결과. 아직이면 백그라운드 계산을 시작하고 None 을 반환합니다."""
+    importance = _importances.get((model.version, path, sample))
+    if importance is None:
+        warm_global_importance(model, path, sample)
+    return importance
+
+
+def clear_importances():
+    with _lock:
+        _importances.clear()
+
+
+def explain_chunk(model, chunk):
+    """한 청크의 SHAP 값 (입력에만 있는 Patient_ID 등의 컬럼은 앞에 유지)."""
+    features = transform(chunk)[FEATURE_COLUMNS].to_numpy(dtype=np.float32)
+    values = shap_values(model, features, shap_mode="UsePreCalc")
+    passthrough = [c for c in chunk.columns if c not in INPUT_COLUMNS and c not in FEATURE_COLUMNS]
+    out = pd.DataFrame(values, columns=SHAP_COLUMNS + [BASE_COLUMN], index=chunk.index)
+    return pd.concat([chunk[passthrough], out], axis=1)
+
+
+def explain_file(input_path, output_path, model_path=MODEL_PATH, chunk_size=50_000, log=sys.stderr):
+    """파일 전체의 SHAP 값을 청크 단위로 계산해 저장하고 처리한 행 수를 반환합니다."""
+    from qaqc.score import ChunkWriter, iter_chunks
+
+    model = get_model(model_path)
+    writer = ChunkWriter(output_path)
+    rows = 0
+    started = time.perf_counter()
+    try:
+        for chunk in iter_chunks(input_path, chunk_size):
+            result = explain_chunk(model, chunk)
+            writer.write(result)
+            rows += len(result)
+            elapsed = time.perf_counter() - started
+            print(f"  {rows:,} rows  {rows / elapsed:,.0f} rows/s", file=log)
+    finally:
+        writer.close()
+    print(f"✅ {rows:,} rows in {time.perf_counter() - started:.2f}s -> {output_path}", file=log)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="qaqc-explain", description="환자 CSV/Parquet 의 Feature 별 SHAP 기여도 계산")
+    parser.add_argument("input", help="입력 CSV 또는 Parquet 파일")
+    parser.add_argument("output", help="출력 CSV 또는 Parquet 파일")
+    parser.add_argument("--model", default=MODEL_PATH, help="CatBoost 모델(pickle) 경로")
+    parser.add_argument("--chunk-size", type=int, default=50_000, help="청크당 행 수 (클수록 사전 계산 비용이 분산됨)")
+    args = parser.parse_args(argv)
+
+    explain_file(args.input, args.output, args.model, args.chunk_size)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+
+# ✅ 모델 입력 스키마 (files/test_with_predictions.csv 의 컬럼 순서와 동일)
+INPUT_COLUMNS = [
+    "age", "height(cm)", "weight(kg)", "waist(cm)",
+    "eyesight(left)", "eyesight(right)", "hearing(left)", "hearing(right)",
+    "systolic", "relaxation", "fasting blood sugar",
+    "Cholesterol", "triglyceride", "HDL", "LDL", "hemoglobin",
+    "Urine protein", "serum creatinine", "AST", "ALT", "Gtp", "dental caries",
+]
+DERIVED_COLUMNS = [
+    "BMI", "triglyceride/HDL", "LDL/HDL", "BP Ratio",
+    "waist_height_ratio", "alt_ast_ratio",
+]
+
+# pd.cut(bins=[0, 18.5, 24.9, 29.9, inf]) 과 같은 (a, b] 구간
+BMI_CATEGORIES = ["Underweight", "Normal", "Overweight", "Obesity"]
+BMI_BINS = np.array([18.5, 24.9, 29.9])
+# get_dummies(drop_first=True) 결과와 같이 첫 범주(Underweight)는 제외하되, 나머지는 항상 생성
+DUMMY_COLUMNS = [f"BMI_category_{name}" for name in BMI_CATEGORIES[1:]]
+
+FEATURE_COLUMNS = INPUT_COLUMNS + DERIVED_COLUMNS + DUMMY_COLUMNS
+
+_INDEX = {name: i for i, name in enumerate(INPUT_COLUMNS)}
+
+
+def bmi_category_codes(bmi):
+    """BMI 배열을 BMI_CATEGORIES 인덱스로 변환 (0 이하/결측은 -1)."""
+    bmi = np.asarray(bmi, dtype=np.float64)
+    codes = np.searchsorted(BMI_BINS, bmi, side="left")
+    codes[~(bmi > 0)] = -1
+    return codes
+
+
+def to_input_array(data, dtype=np.float64):
+    """DataFrame / dict / 배열을 INPUT_COLUMNS 순서의 2차원 배열로 변환합니다."""
+    if isinstance(data, pd.DataFrame):
+        return data[INPUT_COLUMNS].to_numpy(dtype=dtype)
+    if isinstance(data, dict):
+        return np.array([[data[name] for name in INPUT_COLUMNS]], dtype=dtype)
+    array = np.asarray(data, dtype=dtype)
+    if array.ndim == 1:
+        array = array[np.newaxis, :]
+    if array.shape[1] != len(INPUT_COLUMNS):
+        raise ValueError(f"입력 컬럼 수가 {len(INPUT_COLUMNS)}개가 아닙니다: {array.shape[1]}")
+    return array
+
+
+def transform_array(data, dtype=np.float64):
+    """입력을 FEATURE_COLUMNS 순서의 (n, 31) 배열로 변환합니다. 행 단위 pandas 연산 없음."""
+    X = to_input_array(data, dtype=dtype)
+    n_inputs = len(INPUT_COLUMNS)
+    n_derived = len(DERIVED_COLUMNS)
+    out = np.empty((X.shape[0], len(FEATURE_COLUMNS)), dtype=dtype)
+    out[:, :n_inputs] = X
+
+    def col(name):
+        return X[:, _INDEX[name]]
+
+    # HDL, 이완기 혈압이 0이면 inf 가 되는 것은 기존 pandas 연산과 동일
+    with np.errstate(divide="ignore", invalid="ignore"):
+        bmi = col("weight(kg)") / (col("height(cm)") / 100) ** 2
+        out[:, n_inputs] = bmi
+        out[:, n_inputs + 1] = col("triglyceride") / col("HDL")
+        out[:, n_inputs + 2] = col("LDL") / col("HDL")
+        out[:, n_inputs + 3] = col("systolic") / col("relaxation")
+        out[:, n_inputs + 4] = col("waist(cm)") / col("height(cm)")
+        out[:, n_inputs + 5] = col("ALT") / (col("AST") + 0.001)
+
+    codes = bmi_category_codes(bmi)
+    for offset, code in enumerate(range(1, len(BMI_CATEGORIES))):
+        out[:, n_inputs + n_derived + offset] = codes == code
+    return out
+
+
+def transform(data):
+    """transform_array 결과를 기준 CSV와 같은 컬럼/타입의 DataFrame 으로 반환합니다."""
+    index = data.index if isinstance(data, pd.DataFrame) else None
+    features = pd.DataFrame(transform_array(data), columns=FEATURE_COLUMNS, index=index)
+    features[DUMMY_COLUMNS] = features[DUMMY_COLUMNS].astype(bool)
+    return features
+
+
+class FeatureTransformer:
+    """학습 파이프라인(sklearn)과 추론에서 함께 쓰는 상태 없는 변환기."""
+
+    def fit(self, X, y=None):
+        return self
+
+    def transform(self, X):
+        return transform_array(X)
+
+    def fit_transform(self, X, y=None):
+        return self.transform(X)
+
+    def get_feature_names_out(self, input_features=None):
+        return np.array(FEATURE_COLUMNS, dtype=object)
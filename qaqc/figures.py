@@ -0,0 +1,74 @@
+"""페이지 그래프의 정적인 배경(기준 구간, 기준선, 레이아웃)을 프로세스당 한 번만 만드는 캐시.
+
+배경은 검증을 마친 dict 로 보관하고, 환자별 trace 만 덧붙여 검증 없이 Figure 를 만듭니다.
+"""
+import functools
+
+import plotly.graph_objects as go
+
+from qaqc.ranges import get_range
+
+_TEMPLATES = []
+
+
+def figure_template(builder):
+    """go.Figure 를 반환하는 builder 를 감싸 인자별로 한 번만 실행하고 dict 로 캐시합니다."""
+    cached = functools.lru_cache(maxsize=None)(lambda *args: builder(*args).to_dict())
+    cached = functools.wraps(builder)(cached)
+    _TEMPLATES.append(cached)
+    return cached
+
+
+def clear_templates():
+    for cached in _TEMPLATES:
+        cached.cache_clear()
+
+
+def overlay(template, traces, first=False, replace=False):
+    """캐시된 배경에 환자 trace(dict) 를 얹은 Figure 를 반환합니다 (배경은 다시 검증하지 않음).
+
+    replace=True 면 배경의 trace 는 버리고 레이아웃(기준선 등)만 사용합니다.
+    """
+    traces = list(traces)
+    if replace:
+        data = traces
+    else:
+        data = traces + template["data"] if first else template["data"] + traces
+    return go.Figure({"data": data, "layout": template["layout"]}, _validate=False)
+
+
+@figure_template
+def band_template(column, title, axis_title, axis_range, unit=""):
+    """qaqc.ranges 기준 구간을 가로 띠로 그린 배경 그래프."""
+    suffix = f" {unit}" if unit else ""
+    fig = go.Figure()
+    for band in get_range(column).bands:
+        fig.add_trace(go.Scatter(
+            x=[band.low, band.high], y=[1, 1],
+            fill='toself', mode='lines',
+            line=dict(color=band.color, width=4),
+            name=f"{band.label} ({band.low} ~ {band.high}{suffix})"
+        ))
+    fig.update_layout(
+        title=title,
+        xaxis=dict(title=axis_title, range=list(axis_range)),
+        yaxis=dict(showticklabels=False),
+        showlegend=True
+    )
+    return fig
+
+
+def marker_trace(value, text, name):
+    """기준 구간 위에 환자 수치를 표시하는 화살표 마커."""
+    return dict(
+        type="scatter", x=[value], y=[1.1],
+        mode="markers+text",
+        marker=dict(color="red", size=12, symbol="arrow-bar-up"),
+        text=[text],
+        textposition="top center",
+        name=name
+    )
+
+
+def bar_trace(name, x, y, color, **kwargs):
+    return dict(type="bar", name=name, x=list(x), y=list(y), marker=dict(color=color), **kwargs)
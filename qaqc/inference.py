@@ -0,0 +1,91 @@
+"""CatBoost 추론 래퍼.
+
+Feature 행렬을 float32 로 한 번만 만들고 predict_proba 를 한 번만 호출한 뒤,
+라벨은 확률과 threshold 로부터 계산합니다. (예전 방식: DataFrame 으로 predict + predict_proba 두 번)
+CatBoost 는 내부적으로 float32 로 분할하므로 float32 입력의 예측 결과는 동일합니다.
+"""
+import argparse
+import sys
+from dataclasses import dataclass
+
+import numpy as np
+
+from qaqc.features import transform_array
+from qaqc.instrumentation import stage
+from qaqc.model_registry import MODEL_PATH, get_model
+from qaqc.treatment import recommend_treatment
+
+DEFAULT_THRESHOLD = 0.5
+
+# ✅ thread_count: 환자 한 명(지연 시간 우선)은 1, 대량 배치(처리량 우선)는 전체 코어(-1)
+LOW_LATENCY_THREADS = 1
+BULK_THREADS = -1
+
+
+@dataclass(frozen=True)
+class PredictionResult:
+    features: np.ndarray
+    prediction: np.ndarray
+    probability: float
+    tier: str
+
+
+class Predictor:
+    """predict_proba 한 번으로 라벨(smoking_pred)과 smoking_prob_0 을 함께 구합니다."""
+
+    def __init__(self, model, threshold=DEFAULT_THRESHOLD, thread_count=BULK_THREADS):
+        self.model = model
+        self.threshold = threshold
+        self.thread_count = thread_count
+
+    def features(self, rows):
+        # 비율 계산은 float64 로 한 뒤 CatBoost 가 바로 쓰는 float32 로 변환
+        return transform_array(rows).astype(np.float32)
+
+    def predict_proba(self, rows, thread_count=None):
+        if thread_count is None:
+            thread_count = self.thread_count
+        return self.model.predict_proba(self.features(rows), thread_count=thread_count)
+
+    def labels(self, prob):
+        # 흡연(클래스 1) 확률이 threshold 이상이면 1 (threshold=0.5 이면 model.predict 와 동일)
+        classes = self.model.classes_
+        return np.where(prob[:, 1] >= self.threshold, classes[1], classes[0])
+
+    def predict(self, rows, thread_count=None):
+        """(라벨 배열, smoking_prob_0 배열)을 반환합니다."""
+        prob = self.predict_proba(rows, thread_count)
+        return self.labels(prob), prob[:, 0]
+
+
+def predict_patient(model, patient, threshold=DEFAULT_THRESHOLD):
+    """환자 한 명의 Feature Engineering + 예측 + 치료 방법 추천."""
+    predictor = Predictor(model, threshold, LOW_LATENCY_THREADS)
+    with stage("features"):
+        features = transform_array(patient.as_array())
+    with stage("predict_proba"):
+        prob = model.predict_proba(features.astype(np.float32), thread_count=LOW_LATENCY_THREADS)
+    # 금연 가능성 확률 (0일 확률)
+    probability = float(prob[0, 0])
+    with stage("recommend_treatment"):
+        tier = recommend_treatment(probability * 100)
+    return PredictionResult(features[0], predictor.labels(prob), probability, tier)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="모델을 CatBoost 네이티브 형식으로 내보내기")
+    parser.add_argument("output", help="저장 경로 (예: files/catboost_model.cbm)")
+    parser.add_argument("--model", default=MODEL_PATH, help="CatBoost 모델(pickle) 경로")
+    parser.add_argument(
+        "--format", default="cbm", choices=["cbm", "cpp", "python", "json"],
+        help="cbm: 바이너리 (pickle 보다 빠르게 로드), cpp/python: 의존성 없는 계산 코드",
+    )
+    args = parser.parse_args(argv)
+
+    get_model(args.model).export(args.output, args.format)
+    print(f"✅ {args.model} -> {args.output} ({args.format})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
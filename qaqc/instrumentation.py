@@ -0,0 +1,246 @@
+"""클릭(rerun) 단위 구간별 시간 측정.
+
+    with stage("predict"):          # 구간 측정 (중첩 가능)
+    @timed("shap")                   # 함수 전체 측정
+    count("clicks")                  # 이벤트 카운터
+
+begin_request() ~ end_request() 사이의 구간들이 하나의 요청 기록(trace)으로 묶이고,
+최근 RECENT_REQUESTS 개는 메모리에, 선택적으로 JSON-lines / Prometheus 텍스트 파일로 남깁니다.
+꺼져 있으면(기본) stage() 는 전역 플래그와 현재 스레드의 요청 기록만 확인하고 공용 no-op 을
+반환하므로 비용이 거의 없습니다.
+
+측정 범위는 두 가지입니다.
+- 프로세스 전체: QAQC_PROFILE=1 또는 set_enabled(True). 모든 세션/스레드를 측정합니다.
+- 요청(세션)별: begin_request(name, enabled=True). 그 요청을 실행하는 스레드만 측정하므로
+  Streamlit 관리자 토글(st.session_state["profiling"])이 다른 세션의 측정 여부를 바꾸지 않습니다.
+
+환경 변수: QAQC_PROFILE=1 (켜기), QAQC_PROFILE_JSONL=경로, QAQC_PROFILE_PROM=경로
+"""
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+
+RECENT_REQUESTS = 50
+
+_enabled = os.environ.get("QAQC_PROFILE") == "1"
+_jsonl_path = os.environ.get("QAQC_PROFILE_JSONL")
+_prom_path = os.environ.get("QAQC_PROFILE_PROM")
+
+_NOOP = contextlib.nullcontext()
+_local = threading.local()
+_lock = threading.Lock()
+_recent = deque(maxlen=RECENT_REQUESTS)
+_calls = Counter()
+_seconds = Counter()
+_events = Counter()
+_requests = Counter()
+
+# 켜져 있을 때만 시간을 재는 Streamlit 렌더링 함수 (Plotly/표 직렬화 비용)
+_STREAMLIT_CALLS = ["plotly_chart", "dataframe"]
+_patched = {}
+
+
+def is_enabled():
+    return _enabled
+
+
+def set_enabled(enabled):
+    """프로세스 전체 측정 on/off (세션별 측정은 begin_request(enabled=...))."""
+    global _enabled
+    _enabled = bool(enabled)
+    _patch_streamlit(_enabled)
+
+
+class _Trace:
+    __slots__ = ("name", "started", "records", "stack")
+
+    def __init__(self, name):
+        self.name = name
+        self.started = time.perf_counter()
+        self.records = []
+        self.stack = []
+
+
+class _Stage:
+    __slots__ = ("name", "trace", "index", "started")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        trace = self.trace = getattr(_local, "trace", None)
+        if trace is not None:
+            trace.stack.append(self.name)
+            # 시작 순서대로 기록되도록 자리를 먼저 잡아 둠 (flame table 순서)
+            self.index = len(trace.records)
+            trace.records.append((tuple(trace.stack), 0.0))
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.started
+        with _lock:
+            _calls[self.name] += 1
+            _seconds[self.name] += elapsed
+        trace = self.trace
+        if trace is not None:
+            trace.records[self.index] = (trace.records[self.index][0], elapsed)
+            trace.stack.pop()
+        return False
+
+
+def _active():
+    # 전역으로 켜져 있거나, 이 스레드가 측정 중인 요청을 실행하고 있으면 측정
+    return _enabled or getattr(_local, "trace", None) is not None
+
+
+def stage(name):
+    """구간 측정 컨텍스트 매니저 (꺼져 있으면 no-op)."""
+    if not _active():
+        return _NOOP
+    return _Stage(name)
+
+
+def timed(name):
+    """함수 호출 전체를 stage(name) 으로 측정하는 데코레이터."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _active():
+                return fn(*args, **kwargs)
+            with _Stage(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(name, n=1):
+    if _active():
+        with _lock:
+            _events[name] += n
+
+
+def begin_request(name, enabled=None):
+    """요청(rerun) 기록 시작. 이전 rerun 이 st.stop() 등으로 끝나지 못했으면 먼저 마감합니다.
+
+    enabled 를 주면 전역 설정과 관계없이 이 요청만 측정하거나 측정하지 않습니다.
+    """
+    if getattr(_local, "trace", None) is not None:
+        end_request()
+    if enabled is None:
+        enabled = _enabled
+    if enabled:
+        if not _patched:
+            _patch_streamlit(True)
+        _local.trace = _Trace(name)
+
+
+def end_request():
+    trace = getattr(_local, "trace", None)
+    if trace is None:
+        return None
+    _local.trace = None
+    record = {
+        "request": trace.name,
+        "ts": time.time(),
+        "total_ms": (time.perf_counter() - trace.started) * 1000,
+        "stages": [{"path": list(path), "ms": seconds * 1000} for path, seconds in trace.records],
+    }
+    with _lock:
+        _recent.append(record)
+        _requests[trace.name] += 1
+    if _jsonl_path:
+        with open(_jsonl_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    if _prom_path:
+        tmp_path = f"{_prom_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(prometheus_text())
+        os.replace(tmp_path, _prom_path)
+    return record
+
+
+def recent(n=None):
+    with _lock:
+        records = list(_recent)
+    return records if n is None else records[-n:]
+
+
+def flame_table(n=None):
+    """최근 n 개 요청의 구간별 호출 수 / 평균 / 최대 시간과 요청 전체 대비 비율 (트리 순서)."""
+    records = recent(n)
+    total_ms = sum(record["total_ms"] for record in records)
+    rows = {}
+    for record in records:
+        for item in record["stages"]:
+            path = tuple(item["path"])
+            row = rows.setdefault(path, {"calls": 0, "sum": 0.0, "max": 0.0})
+            row["calls"] += 1
+            row["sum"] += item["ms"]
+            row["max"] = max(row["max"], item["ms"])
+    # 자식 구간이 나중 요청에서 처음 나타나도 부모 바로 아래에 오도록 (처음 나타난 순서 기준 트리 정렬)
+    first_seen = {path: i for i, path in enumerate(rows)}
+    order = {path: tuple(first_seen.get(path[:depth], -1) for depth in range(1, len(path) + 1)) for path in rows}
+    rows = {path: rows[path] for path in sorted(rows, key=order.get)}
+    return [
+        {
+            "stage": "  " * (len(path) - 1) + path[-1],
+            "calls": row["calls"],
+            "mean_ms": round(row["sum"] / row["calls"], 2),
+            "max_ms": round(row["max"], 2),
+            "share_%": round(row["sum"] / total_ms * 100, 1) if total_ms else 0.0,
+        }
+        for path, row in rows.items()
+    ]
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_text():
+    """누적 카운터를 Prometheus text exposition 형식으로 반환합니다."""
+    with _lock:
+        calls, seconds, events, requests = dict(_calls), dict(_seconds), dict(_events), dict(_requests)
+    lines = [
+        "# HELP qaqc_stage_seconds_total 구간별 누적 시간(초)",
+        "# TYPE qaqc_stage_seconds_total counter",
+    ]
+    lines += [f'qaqc_stage_seconds_total{{stage="{_label(k)}"}} {v:.6f}' for k, v in sorted(seconds.items())]
+    lines += ["# HELP qaqc_stage_calls_total 구간별 호출 수", "# TYPE qaqc_stage_calls_total counter"]
+    lines += [f'qaqc_stage_calls_total{{stage="{_label(k)}"}} {v}' for k, v in sorted(calls.items())]
+    lines += ["# HELP qaqc_requests_total 기록된 요청 수", "# TYPE qaqc_requests_total counter"]
+    lines += [f'qaqc_requests_total{{request="{_label(k)}"}} {v}' for k, v in sorted(requests.items())]
+    lines += ["# HELP qaqc_events_total 이벤트 카운터", "# TYPE qaqc_events_total counter"]
+    lines += [f'qaqc_events_total{{name="{_label(k)}"}} {v}' for k, v in sorted(events.items())]
+    return "\n".join(lines) + "\n"
+
+
+def reset():
+    with _lock:
+        for counter in (_calls, _seconds, _events, _requests):
+            counter.clear()
+        _recent.clear()
+
+
+def _patch_streamlit(enable):
+    # 처음 측정할 때 감싸고, set_enabled(False) 때 원래 함수로 되돌림
+    # (감싼 함수는 측정 중이 아닌 스레드에서는 _active() 확인 후 원래 함수를 바로 호출)
+    st = sys.modules.get("streamlit")
+    if st is None:
+        return
+    with _lock:
+        if enable and not _patched:
+            for name in _STREAMLIT_CALLS:
+                original = getattr(st, name)
+                _patched[name] = original
+                setattr(st, name, timed(f"st.{name}")(original))
+        elif not enable and _patched:
+            for name, original in _patched.items():
+                setattr(st, name, original)
+            _patched.clear()
@@ -0,0 +1,113 @@
+import hashlib
+import os
+import pickle
+import threading
+import time
+from dataclasses import dataclass, field
+
+from qaqc.instrumentation import timed
+
+# ✅ 기본 모델 경로 (main.py와 동일하게 저장소 루트 기준)
+MODEL_PATH = "files/catboost_model(final).pkl"
+
+# 경로별로 한 번만 로드된 모델을 프로세스 전체가 공유
+_lock = threading.Lock()
+_models = {}
+
+
+@dataclass(frozen=True)
+class LoadedModel:
+    """프로세스 전체에서 공유되는 읽기 전용 예측기.
+
+    CatBoost 모델(pickle / cbm) 과 predict_proba + classes_ 를 가진 sklearn 호환 모델(pickle)을 같은 방식으로 사용합니다.
+    """
+
+    path: str
+    version: str
+    fingerprint: tuple
+    loaded_at: float
+    _model: object = field(repr=False)
+    # 저장된 모델 파일 크기 (bytes)
+    size: int = 0
+
+    @property
+    def classes_(self):
+        return self._model.classes_
+
+    @property
+    def feature_names_(self):
+        return self._model.feature_names_
+
+    def predict(self, data, **kwargs):
+        return self._model.predict(data, **kwargs)
+
+    @property
+    def is_catboost(self):
+        return type(self._model).__module__.startswith("catboost")
+
+    def predict_proba(self, data, **kwargs):
+        if not self.is_catboost:
+            # thread_count 등 CatBoost 전용 인자는 다른 모델에 넘기지 않음
+            kwargs.pop("thread_count", None)
+        return self._model.predict_proba(data, **kwargs)
+
+    def get_feature_importance(self, data=None, **kwargs):
+        return self._model.get_feature_importance(data, **kwargs)
+
+    def export(self, path, format="cbm"):
+        """CatBoost 네이티브 형식(cbm) 또는 독립 실행 코드(cpp/python), json 으로 저장합니다."""
+        self._model.save_model(path, format=format)
+
+
+def _fingerprint(path):
+    # mtime + 크기로 파일 변경 여부를 저렴하게 확인
+    stat = os.stat(path)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+@timed("model_load")
+def _load(path, fingerprint):
+    with open(path, "rb") as f:
+        raw = f.read()
+    if path.endswith(".cbm"):
+        # qaqc.inference 로 내보낸 CatBoost 네이티브 모델
+        from catboost import CatBoostClassifier
+
+        model = CatBoostClassifier().load_model(blob=raw)
+    else:
+        model = pickle.loads(raw)
+    version = hashlib.sha256(raw).hexdigest()[:12]
+    return LoadedModel(path, version, fingerprint, time.time(), model, len(raw))
+
+
+def wrap_model(model):
+    """파일 없이 메모리에 있는 모델 객체를 LoadedModel 로 감쌉니다 (이미 LoadedModel 이면 그대로).
+
+    버전과 크기는 pickle 바이트 기준이며, 파일이 없으므로 path 는 None 입니다.
+    """
+    if isinstance(model, LoadedModel):
+        return model
+    raw = pickle.dumps(model)
+    return LoadedModel(None, hashlib.sha256(raw).hexdigest()[:12], None, time.time(), model, len(raw))
+
+
+def get_model(path=MODEL_PATH):
+    """캐시된 모델을 반환하고, 파일이 바뀌었으면 다시 로드합니다."""
+    path = os.path.abspath(path)
+    fingerprint = _fingerprint(path)
+    loaded = _models.get(path)
+    if loaded is not None and loaded.fingerprint == fingerprint:
+        return loaded
+
+    with _lock:
+        # 다른 스레드가 먼저 로드했을 수 있으므로 다시 확인
+        loaded = _models.get(path)
+        if loaded is None or loaded.fingerprint != fingerprint:
+            loaded = _load(path, fingerprint)
+            _models[path] = loaded
+        return loaded
+
+
+def clear_cache():
+    with _lock:
+        _models.clear()
@@ -0,0 +1,142 @@
+"""사이드바 페이지 등록 테이블.
+
+각 페이지 모듈은 렌더링 함수에 @register_page 를 붙여 스스로 등록합니다.
+load_pages() 는 프로세스당 한 번 pages 패키지의 모든 모듈을 import 하고 검증/예열하므로,
+깨진 페이지 파일은 앱 시작 시점에 바로 드러나고 rerun 마다 import 하지 않습니다.
+
+    python -m qaqc.page_registry        # 모든 페이지 import + 검증 (CI 용)
+"""
+import importlib
+import pkgutil
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+
+from qaqc.instrumentation import stage
+
+PAGES_PACKAGE = "pages"
+
+
+class PageRegistryError(RuntimeError):
+    pass
+
+
+@dataclass
+class Page:
+    label: str
+    render: object
+    module: str
+    order: int = 100
+    warm: object = None
+    # 환자 기록 -> qaqc.report.Section (일괄 리포트에 포함할 페이지만)
+    report: object = None
+    # 최근 렌더링 시간(ms)과 횟수 (디버그 표시용)
+    last_ms: float = field(default=0.0, compare=False)
+    renders: int = field(default=0, compare=False)
+
+
+# 라벨 -> Page (삽입 순서가 아니라 order 로 정렬해서 사용)
+_pages = {}
+# 페이지 import 중에 register_page 가 다시 잡으므로 RLock
+_lock = threading.RLock()
+_loaded = []
+_warmed = []
+
+
+def register_page(label, order=100, warm=None, report=None):
+    """페이지 렌더링 함수 등록 데코레이터.
+
+    warm: 시작 시 한 번 실행할 예열 함수 (그래프 배경 등)
+    report: 환자 기록으로 그래프/안내 문구(Section)를 만드는 순수 함수 (python -m qaqc.report 에서 사용)
+    """
+    def decorator(render):
+        with _lock:
+            existing = _pages.get(label)
+            if existing is not None and existing.module != render.__module__:
+                raise PageRegistryError(f"페이지 라벨 {label!r} 이(가) {existing.module} 와 {render.__module__} 에 중복 등록되었습니다.")
+            _pages[label] = Page(label, render, render.__module__, order, warm, report)
+        return render
+    return decorator
+
+
+def load_pages(package=PAGES_PACKAGE, warm=True):
+    """pages 패키지의 모든 모듈을 import/검증/예열하고 {라벨: Page} 를 순서대로 반환합니다 (프로세스당 한 번).
+
+    warm=False 면 예열 함수는 실행하지 않습니다 (일부 페이지만 쓰는 리포트 작업 프로세스 등).
+    """
+    # 동시에 도는 rerun 들이 _pages 를 함께 고치지 않도록 확인/삭제/import 모두 _lock 안에서
+    with _lock:
+        if package not in _loaded or _stale():
+            _load(package)
+            _loaded.append(package)
+            if package in _warmed:
+                _warmed.remove(package)
+        if warm and package not in _warmed:
+            for page in _pages.values():
+                if page.warm is not None:
+                    page.warm()
+            _warmed.append(package)
+        return {page.label: page for page in sorted(_pages.values(), key=lambda page: page.order)}
+
+
+def _stale():
+    # Streamlit 파일 감시기가 수정된 페이지 모듈을 sys.modules 에서 내리면 다시 import (_lock 안에서 호출)
+    stale = [label for label, page in _pages.items() if page.module not in sys.modules]
+    for label in stale:
+        del _pages[label]
+    return bool(stale)
+
+
+def _load(package):
+    path = importlib.import_module(package).__path__
+    for info in pkgutil.iter_modules(path):
+        module_name = f"{package}.{info.name}"
+        try:
+            importlib.import_module(module_name)
+        except Exception as e:
+            raise PageRegistryError(f"🚨 페이지 모듈 {module_name} 을(를) 불러오지 못했습니다: {e}") from e
+        if not any(page.module == module_name for page in _pages.values()):
+            raise PageRegistryError(f"⚠️ {module_name} 모듈에 @register_page 로 등록된 페이지가 없습니다.")
+
+
+def get_page(label):
+    return _pages[label]
+
+
+def render_page(page):
+    """페이지를 렌더링하고 소요 시간을 기록합니다 (st.stop 도 시간 기록 후 그대로 전달)."""
+    started = time.perf_counter()
+    try:
+        with stage(f"page:{page.label}"):
+            page.render()
+    finally:
+        page.last_ms = (time.perf_counter() - started) * 1000
+        page.renders += 1
+
+
+def timings():
+    """디버그 표시용 페이지별 최근 렌더링 시간."""
+    with _lock:
+        pages = sorted(_pages.values(), key=lambda page: page.order)
+    return [{"page": page.label, "last_ms": round(page.last_ms, 1), "renders": page.renders} for page in pages]
+
+
+def main(argv=None):
+    # python -m 으로 실행하면 이 모듈은 __main__ 이므로 페이지들이 등록하는 qaqc.page_registry 를 사용
+    from qaqc import page_registry
+
+    started = time.perf_counter()
+    try:
+        pages = page_registry.load_pages()
+    except page_registry.PageRegistryError as e:
+        print(e, file=sys.stderr)
+        return 1
+    for page in pages.values():
+        print(f"  {page.order:4d}  {page.label:55s} {page.module}")
+    print(f"✅ {len(pages)} pages loaded in {(time.perf_counter() - started) * 1000:.0f}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
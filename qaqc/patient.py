@@ -0,0 +1,76 @@
+from dataclasses import astuple, dataclass, fields
+
+import numpy as np
+
+from qaqc.features import INPUT_COLUMNS
+
+
+@dataclass(frozen=True, slots=True)
+class PatientRecord:
+    """사이드바 입력 22개 항목 (필드 순서 = features.INPUT_COLUMNS 순서)."""
+
+    age: float
+    height: float
+    weight: float
+    waist: float
+    eyesight_left: float
+    eyesight_right: float
+    hearing_left: float
+    hearing_right: float
+    systolic: float
+    relaxation: float
+    fastingBloodSugar: float
+    cholesterol: float
+    triglyceride: float
+    HDL: float
+    LDL: float
+    hemoglobin: float
+    urineProtein: float
+    serumCreatinine: float
+    AST: float
+    ALT: float
+    Gtp: float
+    dentalCaries: float
+
+    @classmethod
+    def from_columns(cls, values):
+        """{"age": .., "height(cm)": .., ...} 형태(모델 컬럼명)의 입력으로 생성합니다."""
+        return cls(*(float(values[column]) for column in INPUT_COLUMNS))
+
+    def to_columns(self):
+        return dict(zip(INPUT_COLUMNS, astuple(self)))
+
+    def as_array(self):
+        return np.array(astuple(self), dtype=np.float64)
+
+    def value(self, column):
+        return getattr(self, _FIELD_BY_COLUMN[column])
+
+    @property
+    def bmi(self):
+        return self.weight / (self.height / 100) ** 2
+
+    @staticmethod
+    def invalid_mask(X):
+        """(n, 22) 입력 행렬에서 validate() 가 오류를 내는 행 (벡터 연산, 대량 입력 사전 검사용)."""
+        return ~(X[:, _POSITIVE_INDEX] > 0).all(axis=1)
+
+    def validate(self):
+        """생리학적으로 불가능하거나 0으로 나누게 되는 입력에 대한 오류 메시지 목록."""
+        errors = []
+        for name, label in (("age", "나이"), ("height", "키"), ("weight", "몸무게"), ("waist", "허리 둘레")):
+            if getattr(self, name) <= 0:
+                errors.append(f"🚨 {label}는 0보다 커야 합니다.")
+        if self.HDL <= 0:
+            errors.append("🚨 HDL은 0보다 커야 합니다. (중성지방/HDL, LDL/HDL 비율 계산)")
+        if self.relaxation <= 0:
+            errors.append("🚨 이완기 혈압은 0보다 커야 합니다. (BP Ratio 계산)")
+        return errors
+
+
+_FIELD_BY_COLUMN = {column: field.name for column, field in zip(INPUT_COLUMNS, fields(PatientRecord))}
+# validate() 가 0보다 커야 한다고 검사하는 항목
+_POSITIVE_INDEX = [
+    i for i, field in enumerate(fields(PatientRecord))
+    if field.name in ("age", "height", "weight", "waist", "HDL", "relaxation")
+]
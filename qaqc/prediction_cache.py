@@ -0,0 +1,90 @@
+"""환자 입력 벡터 + 모델 버전을 키로 하는 예측 결과 캐시 (프로세스 전체 공유).
+
+같은 입력으로 여러 번 실행하거나 여러 세션이 같은 기본값으로 실행해도
+Feature Engineering / predict / predict_proba 는 한 번만 수행됩니다.
+"""
+import hashlib
+import os
+import threading
+
+import numpy as np
+from cachetools import TTLCache
+
+# 배포 환경에서 부하에 맞게 환경 변수로 조정
+DEFAULT_MAXSIZE = int(os.environ.get("QAQC_PREDICTION_CACHE_SIZE", 4096))
+DEFAULT_TTL = float(os.environ.get("QAQC_PREDICTION_CACHE_TTL", 3600))  # 초
+
+
+def prediction_key(values, model_version):
+    """입력 22개 값의 정규화된 float64 바이트 + 모델 버전의 해시."""
+    # -0.0 과 0.0 이 같은 키가 되도록 0.0 을 더함
+    canonical = np.ascontiguousarray(np.asarray(values, dtype=np.float64) + 0.0)
+    digest = hashlib.blake2b(canonical.tobytes(), digest_size=16)
+    digest.update(model_version.encode())
+    return digest.hexdigest()
+
+
+class _CountingTTLCache(TTLCache):
+    """용량 초과로 밀려난 항목(eviction)과 TTL 만료 항목(expiration)을 셉니다."""
+
+    def __init__(self, maxsize, ttl):
+        super().__init__(maxsize, ttl)
+        self.evictions = 0
+        self.expirations = 0
+
+    def popitem(self):
+        item = super().popitem()
+        self.evictions += 1
+        return item
+
+    def expire(self, time=None):
+        expired = super().expire(time)
+        self.expirations += len(expired)
+        return expired
+
+
+class PredictionCache:
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, ttl=DEFAULT_TTL):
+        self._cache = _CountingTTLCache(maxsize, ttl)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            result = self._cache.get(key)
+            if result is not None:
+                self.hits += 1
+                return result
+            self.misses += 1
+        # 예측은 잠금 밖에서 실행 (동시에 같은 키가 들어오면 중복 계산될 수 있음)
+        result = compute()
+        with self._lock:
+            self._cache[key] = result
+        return result
+
+    def stats(self):
+        with self._lock:
+            self._cache.expire()
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "evictions": self._cache.evictions,
+                "expirations": self._cache.expirations,
+                "size": len(self._cache),
+                "maxsize": self._cache.maxsize,
+                "ttl": self._cache.ttl,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+_cache = PredictionCache()
+
+
+def get_prediction_cache():
+    return _cache
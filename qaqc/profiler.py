@@ -0,0 +1,515 @@
+"""입력 코호트 파일(CSV/Parquet)의 데이터 품질(QA/QC) 프로파일러.
+
+파일을 청크 단위로 한 번만 읽으면서 컬럼별 통계(개수, 결측, 최소/최대, 평균/분산/왜도, 근사 분위수),
+규칙 위반 수, Patient_ID 중복을 누적합니다. 모든 통계는 합칠 수 있으므로(mergeable)
+파일을 여러 구간으로 나눠 프로세스별로 계산한 뒤 합칩니다. 메모리는 청크 크기에만 비례합니다.
+(Patient_ID 중복 확인용 비트맵만 최대 ID 값에 비례)
+
+    python -m qaqc.profiler input.csv --json report.json --html report.html --workers 4
+"""
+import argparse
+import csv
+import html
+import io
+import json
+import math
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from qaqc.features import FEATURE_COLUMNS
+
+ID_COLUMN = "Patient_ID"
+# 이보다 큰 Patient_ID 는 중복 확인 비트맵에 넣지 않음 (비트맵 메모리 상한: 1바이트/ID)
+MAX_TRACKED_ID = 100_000_000
+QUANTILES = [0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99]
+SKETCH_ALPHA = 0.01
+EXAMPLES = 5
+
+
+@dataclass(frozen=True)
+class Rule:
+    """컬럼 값 검사 규칙. low/high: 허용 범위 (exclusive_low=True 면 low 초과), codes: 허용 코드 목록"""
+
+    name: str
+    column: str
+    message: str
+    low: float = -np.inf
+    high: float = np.inf
+    exclusive_low: bool = False
+    codes: tuple = None
+    allowed: str = None
+
+    def violations(self, values):
+        finite = ~np.isnan(values)
+        if self.codes is not None:
+            bad = ~np.isin(values, self.codes)
+        else:
+            too_low = values <= self.low if self.exclusive_low else values < self.low
+            bad = too_low | (values > self.high)
+        return bad & finite
+
+    def describe(self):
+        if self.allowed is not None:
+            return self.allowed
+        if self.codes is not None:
+            return "{" + ", ".join(f"{code:g}" for code in self.codes) + "}"
+        left = "(" if self.exclusive_low else "["
+        return f"{left}{self.low:g}, {self.high:g}]"
+
+
+# ✅ 0으로 나누게 되는 값 (PatientRecord.validate 와 같은 기준)
+RULES = [
+    Rule(f"{column}_positive", column, message, low=0, exclusive_low=True)
+    for column, message in (
+        ("age", "나이가 0 이하"),
+        ("height(cm)", "키가 0 이하 (BMI, 허리/키 비율 계산)"),
+        ("weight(kg)", "몸무게가 0 이하"),
+        ("waist(cm)", "허리 둘레가 0 이하"),
+        ("HDL", "HDL 이 0 이하 (중성지방/HDL, LDL/HDL 계산)"),
+        ("relaxation", "이완기 혈압이 0 이하 (BP Ratio 계산)"),
+    )
+]
+# ✅ 코드값
+RULES += [
+    Rule("hearing(left)_code", "hearing(left)", "청력(왼쪽) 코드는 1(정상) 또는 2(이상)", codes=(1, 2)),
+    Rule("hearing(right)_code", "hearing(right)", "청력(오른쪽) 코드는 1(정상) 또는 2(이상)", codes=(1, 2)),
+    Rule("Urine protein_code", "Urine protein", "요단백 코드는 1~6", codes=(1, 2, 3, 4, 5, 6)),
+    Rule("dental caries_code", "dental caries", "충치 유무는 0 또는 1", codes=(0, 1)),
+    Rule("smoking_pred_code", "smoking_pred", "예측 라벨은 0 또는 1", codes=(0, 1)),
+]
+# ✅ 생리학적으로 불가능한 범위
+RULES += [
+    Rule(f"{column}_range", column, f"{label} 값이 가능한 범위를 벗어남", low=low, high=high)
+    for column, label, low, high in (
+        ("age", "나이", 0, 120),
+        ("height(cm)", "키", 50, 250),
+        ("weight(kg)", "몸무게", 10, 300),
+        ("waist(cm)", "허리 둘레", 30, 250),
+        ("eyesight(left)", "시력(왼쪽)", 0, 9.9),
+        ("eyesight(right)", "시력(오른쪽)", 0, 9.9),
+        ("systolic", "수축기 혈압", 50, 300),
+        ("relaxation", "이완기 혈압", 20, 200),
+        ("fasting blood sugar", "공복혈당", 10, 1000),
+        ("hemoglobin", "헤모글로빈", 1, 30),
+        ("serum creatinine", "혈청 크레아티닌", 0, 30),
+        ("smoking_prob_0", "금연 확률", 0, 1),
+    )
+]
+
+# ✅ 숫자여야 하는 컬럼: 숫자로 읽을 수 없는 칸은 결측과 따로 <컬럼>_non_numeric 위반으로 셈
+NUMERIC_COLUMNS = list(dict.fromkeys([ID_COLUMN] + FEATURE_COLUMNS + [rule.column for rule in RULES]))
+NON_NUMERIC_RULES = {
+    column: Rule(f"{column}_non_numeric", column, f"{column} 값을 숫자로 읽을 수 없음", allowed="숫자")
+    for column in NUMERIC_COLUMNS
+}
+
+
+class QuantileSketch:
+    """상대 오차 alpha 의 로그 구간 분위수 스케치 (DDSketch 방식). 구간 수는 값의 범위에만 의존."""
+
+    def __init__(self, alpha=SKETCH_ALPHA):
+        self.alpha = alpha
+        self.gamma = (1 + alpha) / (1 - alpha)
+        self._log_gamma = math.log(self.gamma)
+        self.positive = Counter()
+        self.negative = Counter()
+        self.zeros = 0
+
+    def update(self, values):
+        self.zeros += int(np.count_nonzero(values == 0))
+        for sign, bins in ((1, self.positive), (-1, self.negative)):
+            part = values[values * sign > 0] * sign
+            if len(part):
+                keys = np.ceil(np.log(part) / self._log_gamma).astype(np.int64)
+                low = int(keys.min())
+                counts = np.bincount(keys - low)
+                nonzero = np.flatnonzero(counts)
+                bins.update(dict(zip((nonzero + low).tolist(), counts[nonzero].tolist())))
+
+    def merge(self, other):
+        self.positive.update(other.positive)
+        self.negative.update(other.negative)
+        self.zeros += other.zeros
+
+    def _value(self, key):
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def quantile(self, q):
+        total = self.zeros + sum(self.positive.values()) + sum(self.negative.values())
+        if total == 0:
+            return None
+        rank = q * (total - 1)
+        seen = 0
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return -self._value(key)
+        seen += self.zeros
+        if seen > rank:
+            return 0.0
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return self._value(key)
+        return self._value(max(self.positive))
+
+
+@dataclass
+class ColumnStats:
+    count: int = 0
+    missing: int = 0
+    non_numeric: int = 0
+    min: float = np.inf
+    max: float = -np.inf
+    mean: float = 0.0
+    m2: float = 0.0
+    m3: float = 0.0
+    sketch: QuantileSketch = field(default_factory=QuantileSketch)
+
+    def update(self, values, non_numeric=0):
+        """values: float64 배열. 그중 non_numeric 개의 NaN 은 숫자로 읽지 못한 칸 (결측에서 제외)."""
+        finite = values[~np.isnan(values)]
+        self.missing += len(values) - len(finite) - non_numeric
+        self.non_numeric += non_numeric
+        if len(finite) == 0:
+            return
+        mean = float(finite.mean())
+        deviation = finite - mean
+        squared = deviation * deviation
+        chunk = ColumnStats(
+            len(finite), 0, 0, float(finite.min()), float(finite.max()), mean,
+            float(squared.sum()), float(np.dot(squared, deviation)), self.sketch,
+        )
+        self.sketch.update(finite)
+        self._merge_moments(chunk)
+
+    def merge(self, other):
+        self.missing += other.missing
+        self.non_numeric += other.non_numeric
+        self.sketch.merge(other.sketch)
+        self._merge_moments(other)
+
+    def _merge_moments(self, other):
+        # 두 부분의 평균/2차/3차 중심 모멘트 합치기 (Chan et al. / Pébay)
+        n_a, n_b = self.count, other.count
+        if n_b == 0:
+            return
+        n = n_a + n_b
+        delta = other.mean - self.mean
+        self.m3 = (
+            self.m3 + other.m3
+            + delta ** 3 * n_a * n_b * (n_a - n_b) / n ** 2
+            + 3 * delta * (n_a * other.m2 - n_b * self.m2) / n
+        )
+        self.m2 = self.m2 + other.m2 + delta ** 2 * n_a * n_b / n
+        self.mean = self.mean + delta * n_b / n
+        self.count = n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    def to_dict(self):
+        if self.count == 0:
+            return {"count": 0, "missing": self.missing, "non_numeric": self.non_numeric}
+        variance = self.m2 / (self.count - 1) if self.count > 1 else 0.0
+        skew = math.sqrt(self.count) * self.m3 / self.m2 ** 1.5 if self.m2 > 0 else 0.0
+        return {
+            "count": self.count,
+            "missing": self.missing,
+            "non_numeric": self.non_numeric,
+            "min": self.min,
+            "max": self.max,
+            "mean": self.mean,
+            "std": math.sqrt(variance),
+            "skew": skew,
+            "quantiles": {f"p{round(q * 100)}": self.sketch.quantile(q) for q in QUANTILES},
+        }
+
+
+class IdTracker:
+    """Patient_ID 중복 확인 (ID 값을 인덱스로 하는 비트맵, 합치기는 OR + 겹친 개수)."""
+
+    def __init__(self):
+        self.seen = np.zeros(0, dtype=bool)
+        self.duplicates = 0
+        self.untracked = 0
+        self.examples = []
+
+    def update(self, ids):
+        ids = ids[~np.isnan(ids)]
+        valid = (ids >= 0) & (ids <= MAX_TRACKED_ID) & (ids == np.floor(ids))
+        self.untracked += int(np.count_nonzero(~valid))
+        ids = ids[valid].astype(np.int64)
+        if len(ids) == 0:
+            return
+        self._grow(int(ids.max()) + 1)
+        unique, counts = np.unique(ids, return_counts=True)
+        repeated = unique[self.seen[unique] | (counts > 1)]
+        # 청크 안에서 반복된 만큼 + 이전 청크에서 이미 본 ID
+        self.duplicates += int((counts - 1).sum()) + int(np.count_nonzero(self.seen[unique]))
+        self._examples(repeated)
+        self.seen[unique] = True
+
+    def merge(self, other):
+        self._grow(len(other.seen))
+        overlap = self.seen[:len(other.seen)] & other.seen
+        self.duplicates += other.duplicates + int(np.count_nonzero(overlap))
+        self.untracked += other.untracked
+        self._examples(np.concatenate([np.asarray(other.examples, dtype=np.int64), np.flatnonzero(overlap)]))
+        self.seen[:len(other.seen)] |= other.seen
+
+    def _grow(self, size):
+        if size > len(self.seen):
+            grown = np.zeros(max(size, 2 * len(self.seen)), dtype=bool)
+            grown[:len(self.seen)] = self.seen
+            self.seen = grown
+
+    def _examples(self, ids):
+        for value in ids[:EXAMPLES].tolist():
+            if len(self.examples) < EXAMPLES and value not in self.examples:
+                self.examples.append(value)
+
+    def to_dict(self):
+        return {
+            "distinct": int(np.count_nonzero(self.seen)),
+            "duplicates": self.duplicates,
+            "untracked": self.untracked,
+            "examples": self.examples,
+        }
+
+
+class Profile:
+    def __init__(self, rules=RULES):
+        self.rules = rules
+        self.rows = 0
+        self.columns = {}
+        self.violations = Counter()
+        self.examples = {}
+        self.text_columns = set()
+        self.ids = IdTracker()
+
+    def update(self, chunk):
+        self.rows += len(chunk)
+        numeric = {}
+        non_numeric = {}
+        for column in chunk.columns:
+            series = chunk[column]
+            if pd.api.types.is_numeric_dtype(series):
+                numeric[column] = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            elif column in NON_NUMERIC_RULES:
+                # 🚨 칸 하나가 문자열이면 컬럼 전체가 object 로 읽힘 → 숫자로 바꾸고 못 바꾼 칸만 따로 셈
+                values = pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+                non_numeric[column] = np.isnan(values) & series.notna().to_numpy()
+                numeric[column] = values
+            else:
+                self.text_columns.add(column)
+        ids = numeric.get(ID_COLUMN)
+        for column, values in numeric.items():
+            if column != ID_COLUMN:
+                bad = non_numeric.get(column)
+                self.columns.setdefault(column, ColumnStats()).update(
+                    values, 0 if bad is None else int(np.count_nonzero(bad)))
+        for column, bad in non_numeric.items():
+            self._violation(NON_NUMERIC_RULES[column].name, bad, ids)
+        for rule in self.rules:
+            if rule.column in numeric:
+                self._violation(rule.name, rule.violations(numeric[rule.column]), ids)
+        if ids is not None:
+            self.ids.update(ids)
+
+    def _violation(self, name, bad, ids):
+        n_bad = int(np.count_nonzero(bad))
+        if n_bad:
+            self.violations[name] += n_bad
+            examples = self.examples.setdefault(name, [])
+            if ids is not None and len(examples) < EXAMPLES:
+                found = ids[bad]
+                examples.extend(found[~np.isnan(found)][:EXAMPLES - len(examples)].tolist())
+
+    def merge(self, other):
+        self.rows += other.rows
+        for column, stats in other.columns.items():
+            if column in self.columns:
+                self.columns[column].merge(stats)
+            else:
+                self.columns[column] = stats
+        self.violations.update(other.violations)
+        self.text_columns |= other.text_columns
+        for name, examples in other.examples.items():
+            mine = self.examples.setdefault(name, [])
+            mine.extend(examples[:EXAMPLES - len(mine)])
+        self.ids.merge(other.ids)
+        return self
+
+    def to_dict(self):
+        rules = {rule.name: rule for rule in [*self.rules, *NON_NUMERIC_RULES.values()]}
+        return {
+            "rows": self.rows,
+            "columns": {column: stats.to_dict() for column, stats in self.columns.items()},
+            "text_columns": sorted(self.text_columns),
+            "violations": [
+                {
+                    "rule": name,
+                    "column": rules[name].column,
+                    "allowed": rules[name].describe(),
+                    "message": rules[name].message,
+                    "count": count,
+                    "examples": [int(v) if float(v).is_integer() else v for v in self.examples.get(name, [])],
+                }
+                for name, count in sorted(self.violations.items(), key=lambda item: -item[1])
+            ],
+            "patient_id": self.ids.to_dict(),
+        }
+
+
+def _csv_ranges(path, parts):
+    """CSV 본문을 parts 개의 바이트 구간으로 나눕니다 (구간 경계는 각 작업에서 줄 단위로 맞춤)."""
+    with open(path, "rb") as f:
+        header = f.readline()
+        start = f.tell()
+    size = os.path.getsize(path)
+    edges = np.linspace(start, size, parts + 1).astype(np.int64)
+    return header, [(int(a), int(b)) for a, b in zip(edges[:-1], edges[1:]) if b > a]
+
+
+def _iter_csv_range(path, header, start, end, block_bytes):
+    """[start, end) 에서 시작하는 줄들만 block_bytes 크기 단위로 DataFrame 으로 읽습니다."""
+    names = next(csv.reader([header.decode("utf-8-sig").rstrip("\r\n")]))
+    with open(path, "rb") as f:
+        if start > 0:
+            # start 이전에 시작한 줄은 앞 구간 담당
+            f.seek(start - 1)
+            f.readline()
+        while f.tell() < end:
+            block = f.read(min(block_bytes, end - f.tell()))
+            if not block.endswith(b"\n"):
+                block += f.readline()
+            yield pd.read_csv(io.BytesIO(block), header=None, names=names)
+
+
+def _profile_part(path, part, chunk_size):
+    profile = Profile()
+    if path.endswith((".parquet", ".pq")):
+        import pyarrow.parquet as pq
+
+        parquet = pq.ParquetFile(path)
+        for batch in parquet.iter_batches(batch_size=chunk_size, row_groups=part):
+            profile.update(batch.to_pandas())
+    else:
+        header, start, end, block_bytes = part
+        for chunk in _iter_csv_range(path, header, start, end, block_bytes):
+            profile.update(chunk)
+    return profile
+
+
+def _parts(path, workers, chunk_size):
+    if path.endswith((".parquet", ".pq")):
+        import pyarrow.parquet as pq
+
+        groups = list(range(pq.ParquetFile(path).num_row_groups))
+        return [list(part) for part in np.array_split(groups, workers) if len(part)]
+    header, ranges = _csv_ranges(path, workers)
+    # 청크 행 수를 앞부분 줄 길이로 추정한 바이트 크기로 변환
+    with open(path, "rb") as f:
+        f.readline()
+        sample = f.read(1 << 20)
+    line_bytes = max(1, len(sample) / max(1, sample.count(b"\n")))
+    block_bytes = int(chunk_size * line_bytes)
+    return [(header, start, end, block_bytes) for start, end in ranges]
+
+
+def profile_file(path, workers=1, chunk_size=200_000):
+    """파일 전체 Profile. workers > 1 이면 구간별로 프로세스를 나눠 계산한 뒤 합칩니다."""
+    parts = _parts(path, workers, chunk_size)
+    if workers <= 1 or len(parts) <= 1:
+        profiles = [_profile_part(path, part, chunk_size) for part in parts]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            profiles = list(executor.map(_profile_part, [path] * len(parts), parts, [chunk_size] * len(parts)))
+    result = Profile()
+    for profile in profiles:
+        result.merge(profile)
+    return result
+
+
+def _cell(value):
+    if isinstance(value, float):
+        return f"{value:,.4g}"
+    if isinstance(value, int):
+        return f"{value:,}"
+    return html.escape(str(value))
+
+
+def to_html(report, title="QA/QC 프로파일"):
+    """report(dict) 를 한 장짜리 HTML 로 만듭니다."""
+    ids = report["patient_id"]
+    rows = [f"<h1>{html.escape(title)}</h1>", f"<p>총 {report['rows']:,} 행</p>"]
+    rows.append("<h2>🚨 규칙 위반</h2>")
+    if report["violations"]:
+        rows.append("<table><tr><th>규칙</th><th>컬럼</th><th>허용 범위</th><th>건수</th><th>예시 Patient_ID</th><th>설명</th></tr>")
+        for item in report["violations"]:
+            rows.append("<tr>" + "".join(f"<td>{_cell(item[key])}</td>" for key in ("rule", "column", "allowed", "count"))
+                        + f"<td>{_cell(', '.join(map(str, item['examples'])))}</td><td>{_cell(item['message'])}</td></tr>")
+        rows.append("</table>")
+    else:
+        rows.append("<p>✅ 위반 없음</p>")
+    rows.append("<h2>Patient_ID</h2>")
+    rows.append(f"<p>고유 {ids['distinct']:,} / 중복 {ids['duplicates']:,} / 확인 불가 {ids['untracked']:,}"
+                + (f" (예: {_cell(', '.join(map(str, ids['examples'])))})" if ids["examples"] else "") + "</p>")
+    rows.append("<h2>📊 컬럼 통계</h2>")
+    quantile_keys = [f"p{round(q * 100)}" for q in QUANTILES]
+    headers = ["컬럼", "개수", "결측", "숫자 아님", "최소", "최대", "평균", "표준편차", "왜도"] + quantile_keys
+    rows.append("<table><tr>" + "".join(f"<th>{h}</th>" for h in headers) + "</tr>")
+    for column, stats in report["columns"].items():
+        cells = [column] + [stats.get(key, "") for key in ("count", "missing", "non_numeric", "min", "max", "mean", "std", "skew")]
+        cells += [stats.get("quantiles", {}).get(key, "") for key in quantile_keys]
+        style = ' class="missing"' if stats["missing"] or stats["non_numeric"] else ""
+        rows.append(f"<tr{style}>" + "".join(f"<td>{_cell(cell)}</td>" for cell in cells) + "</tr>")
+    rows.append("</table>")
+    if report["text_columns"]:
+        rows.append(f"<p>숫자가 아니어서 통계에서 제외한 컬럼: {_cell(', '.join(report['text_columns']))}</p>")
+    style = (
+        "<style>body{font-family:sans-serif;margin:2em}table{border-collapse:collapse;font-size:13px}"
+        "td,th{border:1px solid #ddd;padding:4px 8px;text-align:right}th{background:#f4f4f4}"
+        "td:first-child{text-align:left}tr.missing{background:#fff4e5}</style>"
+    )
+    return f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{html.escape(title)}</title>{style}</head><body>" \
+        + "\n".join(rows) + "</body></html>"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="qaqc-profile", description="코호트 파일 데이터 품질 프로파일링")
+    parser.add_argument("input", help="입력 CSV 또는 Parquet 파일")
+    parser.add_argument("--json", default=None, help="JSON 보고서 경로 (기본: 표준 출력)")
+    parser.add_argument("--html", default=None, help="HTML 보고서 경로")
+    parser.add_argument("--workers", type=int, default=1, help="프로세스 수")
+    parser.add_argument("--chunk-size", type=int, default=200_000, help="청크당 (대략의) 행 수")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    report = profile_file(args.input, args.workers, args.chunk_size).to_dict()
+    elapsed = time.perf_counter() - started
+    report["elapsed_s"] = round(elapsed, 3)
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    if args.html:
+        with open(args.html, "w", encoding="utf-8") as f:
+            f.write(to_html(report, f"QA/QC 프로파일: {os.path.basename(args.input)}"))
+    print(f"✅ {report['rows']:,} rows in {elapsed:.2f}s ({report['rows'] / max(elapsed, 1e-9):,.0f} rows/s), "
+          f"{sum(v['count'] for v in report['violations']):,} violations, "
+          f"{report['patient_id']['duplicates']:,} duplicate IDs", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""코호트 검사 수치의 분위수/히스토그램 인덱스.
+
+컬럼(및 연령대)마다 분위수 배열과 히스토그램을 한 번만 계산해 두고,
+이후 백분위 조회는 코호트를 다시 읽지 않고 searchsorted 한 번으로 처리합니다.
+"""
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+
+from qaqc.cohort_store import COHORT_PATH, read_cohort
+
+LAB_COLUMNS = [
+    "BMI", "waist(cm)", "hemoglobin", "systolic", "relaxation",
+    "fasting blood sugar", "Cholesterol", "triglyceride", "HDL", "LDL",
+    "serum creatinine", "Urine protein", "AST", "ALT", "Gtp",
+]
+
+# ✅ 연령대 구분 (AGE_EDGES 미만 / 이상 기준)
+AGE_EDGES = np.array([30, 40, 50, 60])
+AGE_BANDS = ["20대 이하", "30대", "40대", "50대", "60대 이상"]
+
+QUANTILE_LEVELS = np.linspace(0, 100, 201)
+HIST_BINS = 40
+
+
+def age_band(age):
+    return AGE_BANDS[int(np.searchsorted(AGE_EDGES, age, side="right"))]
+
+
+@dataclass(frozen=True)
+class ColumnSketch:
+    count: int
+    quantiles: np.ndarray
+    hist_counts: np.ndarray
+    hist_edges: np.ndarray
+
+    @classmethod
+    def build(cls, values):
+        values = values[np.isfinite(values)]
+        # 극단값 때문에 히스토그램이 뭉개지지 않도록 0.5~99.5% 구간만 사용
+        low, high = np.percentile(values, [0.5, 99.5])
+        if high <= low:
+            high = low + 1
+        counts, edges = np.histogram(values, bins=HIST_BINS, range=(low, high))
+        return cls(len(values), np.percentile(values, QUANTILE_LEVELS), counts, edges)
+
+    def percentile(self, value):
+        q = self.quantiles
+        left = np.searchsorted(q, value, side="left")
+        right = np.searchsorted(q, value, side="right")
+        if right > left:
+            # 같은 값이 여러 분위수에 걸친 경우(정수 코드 등)는 중간 순위
+            return float((QUANTILE_LEVELS[left] + QUANTILE_LEVELS[right - 1]) / 2)
+        return float(np.interp(value, q, QUANTILE_LEVELS))
+
+
+class QuantileIndex:
+    def __init__(self, sketches):
+        self._sketches = sketches
+
+    @classmethod
+    def from_table(cls, table):
+        ages = table.column("age").to_numpy(zero_copy_only=False)
+        bands = np.searchsorted(AGE_EDGES, ages, side="right")
+        sketches = {}
+        for column in LAB_COLUMNS:
+            values = table.column(column).to_numpy(zero_copy_only=False).astype(np.float64)
+            sketches[column, None] = ColumnSketch.build(values)
+            for code, band in enumerate(AGE_BANDS):
+                mask = bands == code
+                if mask.any():
+                    sketches[column, band] = ColumnSketch.build(values[mask])
+        return cls(sketches)
+
+    def sketch(self, column, age=None):
+        """age 가 주어지면 해당 연령대, 없으면 전체 코호트의 스케치를 반환합니다."""
+        if age is not None:
+            sketch = self._sketches.get((column, age_band(age)))
+            if sketch is not None:
+                return sketch
+        return self._sketches[column, None]
+
+    def percentile(self, column, value, age=None):
+        return self.sketch(column, age).percentile(value)
+
+
+_lock = threading.Lock()
+_indexes = {}
+
+
+def get_index(path=COHORT_PATH):
+    """프로세스 전체에서 공유되는 QuantileIndex (경로별로 한 번만 계산)."""
+    index = _indexes.get(path)
+    if index is None:
+        with _lock:
+            index = _indexes.get(path)
+            if index is None:
+                index = QuantileIndex.from_table(read_cohort(columns=LAB_COLUMNS + ["age"], path=path))
+                _indexes[path] = index
+    return index
@@ -0,0 +1,185 @@
+"""검사 수치 기준 범위 레지스트리.
+
+각 검사 항목의 구간(경계, 심각도, 색상, 안내 문구)을 한 곳에 선언하고,
+np.searchsorted 로 환자 한 명 또는 코호트 전체 컬럼을 한 번에 분류합니다.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+# severity 값은 그대로 st.success / st.warning / st.error 함수 이름으로 사용
+NORMAL = "success"
+WARNING = "warning"
+DANGER = "error"
+
+
+@dataclass(frozen=True)
+class Band:
+    label: str
+    low: float
+    high: float
+    color: str
+    severity: str = NORMAL
+    message: str = ""
+    # True 면 `low 초과` 부터 이 구간 (기본은 `low 이상`)
+    exclusive_low: bool = False
+
+    def format(self, name, value):
+        return self.message.format(name=name, label=self.label, value=value)
+
+
+@dataclass(frozen=True)
+class ReferenceRange:
+    column: str
+    name: str
+    bands: tuple
+    unit: str = ""
+
+    @property
+    def edges(self):
+        # 두 번째 구간부터의 하한이 분류 경계 (`초과` 구간은 바로 다음 실수값으로 이동)
+        return np.array([
+            np.nextafter(band.low, np.inf) if band.exclusive_low else band.low
+            for band in self.bands[1:]
+        ])
+
+    @property
+    def reference_value(self):
+        """그래프에 표시할 정상 기준값 (정상 구간의 상한, 높을수록 좋은 항목은 하한)."""
+        normal = next(band for band in self.bands if band.severity == NORMAL)
+        return normal.low if self.bands[-1].severity == NORMAL else normal.high
+
+    def classify(self, values):
+        """값(스칼라 또는 배열)을 bands 인덱스로 변환합니다."""
+        return np.searchsorted(self.edges, np.asarray(values, dtype=np.float64), side="right")
+
+    def band(self, value):
+        return self.bands[int(self.classify(value))]
+
+    def abnormal(self, values):
+        severities = np.array([band.severity != NORMAL for band in self.bands])
+        return severities[self.classify(values)]
+
+
+RANGES = {}
+
+
+def register(reference_range, sex=None):
+    RANGES[reference_range.column, sex] = reference_range
+    return reference_range
+
+
+def get_range(column, sex=None):
+    """성별 전용 기준이 있으면 그것을, 없으면 공통 기준을 반환합니다."""
+    if (column, sex) in RANGES:
+        return RANGES[column, sex]
+    return RANGES[column, None]
+
+
+def classify(column, values, sex=None):
+    return get_range(column, sex).classify(values)
+
+
+def flag_frame(frame, columns=None):
+    """등록된 검사 항목마다 `<컬럼>_abnormal` 플래그 컬럼을 만들어 반환합니다."""
+    if columns is None:
+        columns = [column for column, sex in RANGES if sex is None and column in frame.columns]
+    return pd.DataFrame(
+        {f"{column}_abnormal": get_range(column).abnormal(frame[column].to_numpy()) for column in columns},
+        index=frame.index,
+    )
+
+
+# ✅ BMI
+register(ReferenceRange("BMI", "BMI", (
+    Band("저체중", 0, 18.5, "blue", WARNING, "⚠️ 저체중입니다. 영양 섭취를 늘리는 것이 좋습니다."),
+    Band("정상", 18.5, 24.9, "green", NORMAL, "✅ 정상 범위에 있습니다. 건강을 유지하세요!"),
+    Band("과체중", 25, 29.9, "yellow", WARNING, "⚠️ 과체중입니다. 운동과 식단 조절을 고려하세요."),
+    Band("비만", 30, 34.9, "orange", WARNING, "⚠️ 비만 단계입니다. 건강 관리를 위해 전문가와 상담하세요."),
+    Band("고도비만", 35, 50, "red", WARNING, "⚠️ 비만 단계입니다. 건강 관리를 위해 전문가와 상담하세요."),
+)))
+
+# ✅ 허리둘레 (성별 입력이 추가되면 register(..., sex="F") 로 여성 기준을 따로 등록)
+register(ReferenceRange("waist(cm)", "허리둘레", (
+    Band("정상", 0, 90, "green", NORMAL, "✅ 정상 범위에 있습니다. 건강을 유지하세요!"),
+    Band("주의 단계", 90, 100, "yellow", WARNING, "⚠️ 허리둘레가 증가하고 있습니다. 건강한 생활습관을 유지하세요."),
+    Band("비만 위험", 100, 110, "orange", WARNING, "⚠️ 비만 위험이 있습니다. 적극적인 운동과 식단 조절이 필요합니다."),
+    Band("고도비만 위험", 110, 200, "red", WARNING, "⚠️ 고도비만 위험이 높습니다. 즉시 건강 관리를 시작하세요."),
+), unit="cm"))
+
+# ✅ 헤모글로빈
+_HB_NORMAL = "✅ 정상 범위 내에 있습니다. 건강을 유지하세요!"
+_HB_WARNING = "⚠️ 헤모글로빈 수치가 경계선에 있습니다. 주의가 필요합니다."
+_HB_DANGER = "🚨 헤모글로빈 수치가 위험 수준입니다. 즉시 의료진과 상담하세요!"
+register(ReferenceRange("hemoglobin", "헤모글로빈", (
+    Band("심각 (낮음)", 0, 7, "red", DANGER, _HB_DANGER),
+    Band("경고 (낮음)", 7, 13.5, "orange", WARNING, _HB_WARNING),
+    Band("정상", 13.5, 17.5, "green", NORMAL, _HB_NORMAL),
+    Band("경고 (높음)", 17.5, 20, "orange", WARNING, _HB_WARNING),
+    Band("심각 (높음)", 20, 25, "red", DANGER, _HB_DANGER),
+), unit="g/dL"))
+
+# ✅ 콜레스테롤 (HDL 은 높을수록 좋음)
+_LIPID_NORMAL = "✅ {name}: {value} (정상) - 적절한 수치를 유지하고 있습니다."
+_LIPID_WARNING = "⚠️ {name}: {value} (경고 수준) - 주의가 필요하며, 식이 조절과 운동이 권장됩니다."
+_LIPID_DANGER = "🚨 {name}: {value} (위험 수준) - 심장병, 동맥경화 등의 위험이 높아질 수 있습니다."
+for _column, _limit in (("Cholesterol", 200), ("LDL", 100), ("triglyceride", 150)):
+    register(ReferenceRange(_column, _column, (
+        Band("정상", 0, _limit, "green", NORMAL, _LIPID_NORMAL),
+        Band("경고", _limit, 240, "orange", WARNING, _LIPID_WARNING),
+        Band("위험", 240, np.inf, "red", DANGER, _LIPID_DANGER),
+    ), unit="mg/dL"))
+register(ReferenceRange("HDL", "HDL", (
+    Band("위험", 0, 40, "red", DANGER, "🚨 {name}: {value} (위험 수준) - 낮은 HDL 수치는 심혈관 질환 위험을 증가시킬 수 있습니다."),
+    Band("경고", 40, 60, "orange", WARNING, "⚠️ {name}: {value} (경고 수준) - HDL은 좋은 콜레스테롤이며, 높을수록 건강에 좋습니다."),
+    Band("정상", 60, np.inf, "green", NORMAL, "✅ {name}: {value} (정상) - 건강한 수준의 HDL 수치를 유지하고 있습니다."),
+), unit="mg/dL"))
+
+# ✅ 간 수치 (상한 초과 시 경고)
+_AST_ALT_WARNING = "⚠️ 이 환자는 급성간염, 심근경색, 근질환, 악성종양, 폐쇄황달, 알코올간염 등의 위험이 있습니다."
+for _column in ("AST", "ALT"):
+    register(ReferenceRange(_column, _column, (
+        Band("정상", 0, 40, "green", NORMAL),
+        Band("높음", 40, np.inf, "red", WARNING, _AST_ALT_WARNING, exclusive_low=True),
+    ), unit="IU/L"))
+register(ReferenceRange("Gtp", "r-Gtp", (
+    Band("정상", 0, 71, "green", NORMAL, "✅ 간 수치가 정상 범위에 있습니다. 건강을 유지하세요!"),
+    Band("높음", 71, np.inf, "red", WARNING,
+         "⚠️ 이 환자는 만성간염 활동형, 간경변 활동형, 폐쇄황달, 알코올성 간장애, 요독증 등의 위험이 있습니다.",
+         exclusive_low=True),
+), unit="IU/L"))
+
+# ✅ 혈압 (정상 수축기 120 / 이완기 80)
+register(ReferenceRange("systolic", "수축기", (
+    Band("정상", 0, 120, "green", NORMAL),
+    Band("주의", 120, 140, "orange", WARNING),
+    Band("고혈압", 140, np.inf, "red", DANGER),
+), unit="mmHg"))
+register(ReferenceRange("relaxation", "이완기", (
+    Band("정상", 0, 80, "green", NORMAL),
+    Band("주의", 80, 90, "orange", WARNING),
+    Band("고혈압", 90, np.inf, "red", DANGER),
+), unit="mmHg"))
+
+# ✅ 신장 기능 / 혈당
+# 혈청 크레아티닌은 mg/dL 단위 (코호트 중앙값 약 0.9). 성별 입력이 없으면 공통 기준을 사용
+_CREATININE_LOW = "⚠️ 혈청 크레아티닌이 정상 범위보다 낮습니다. 근육량 감소 가능성이 있습니다."
+_CREATININE_HIGH = "🚨 혈청 크레아티닌이 정상 범위를 초과했습니다. 신장 기능 검사가 필요할 수 있습니다."
+for _sex, _low, _high in ((None, 0.5, 1.2), ("M", 0.7, 1.3), ("F", 0.5, 1.1)):
+    register(ReferenceRange("serum creatinine", "혈청 크레아티닌", (
+        Band("낮음", 0, _low, "orange", WARNING, _CREATININE_LOW),
+        Band("정상", _low, _high, "green", NORMAL),
+        Band("높음", _high, np.inf, "red", DANGER, _CREATININE_HIGH, exclusive_low=True),
+    ), unit="mg/dL"), sex=_sex)
+
+_URINE_PROTEIN_DANGER = "🚨 요단백 수치가 비정상적입니다. 단백뇨 또는 신장 질환 가능성이 있습니다."
+register(ReferenceRange("Urine protein", "요단백", (
+    Band("비정상", -np.inf, 1, "red", DANGER, _URINE_PROTEIN_DANGER),
+    Band("정상", 1, 2, "green", NORMAL),
+    Band("비정상", 2, np.inf, "red", DANGER, _URINE_PROTEIN_DANGER, exclusive_low=True),
+)))
+register(ReferenceRange("fasting blood sugar", "혈당", (
+    Band("정상", 0, 126, "green", NORMAL),
+    Band("높음", 126, np.inf, "red", DANGER, "🚨 공복 혈당이 높습니다. 당뇨 가능성을 고려해 보세요.", exclusive_low=True),
+), unit="mg/dL"))
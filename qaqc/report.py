@@ -0,0 +1,269 @@
+"""환자별 인쇄용 건강 리포트(HTML) 일괄 생성.
+
+건강 페이지(BMI, 헤모글로빈, ...)가 @register_page(report=...) 로 등록한 순수 함수를 그대로 사용해
+환자마다 예측 결과 + 페이지별 그래프/안내 문구를 한 장의 HTML 로 만듭니다.
+여러 프로세스가 청크 단위로 나눠 만들고, 결과는 순서대로 디렉터리 또는 zip 파일에 바로 씁니다.
+그래프 배경, HTML 틀, 모델은 작업 프로세스마다 한 번만 준비합니다.
+
+    python -m qaqc.report patients.csv reports.zip --workers 4
+"""
+import argparse
+import csv
+import html
+import io
+import json
+import os
+import re
+import sys
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+import numpy as np
+from plotly.utils import PlotlyJSONEncoder
+
+from qaqc.features import INPUT_COLUMNS
+from qaqc.inference import DEFAULT_THRESHOLD, Predictor
+from qaqc.model_registry import MODEL_PATH, get_model
+from qaqc.patient import PatientRecord
+from qaqc.service import invalid_rows
+from qaqc.treatment import recommend_treatment
+
+ASSET_NAME = "plotly.min.js"
+MANIFEST_NAME = "manifest.csv"
+ID_COLUMN = "Patient_ID"
+
+
+@dataclass
+class Section:
+    """페이지 한 개 분량의 그래프와 안내 문구.
+
+    messages: (종류, 문구) 목록. 종류는 st 함수 이름 (success / warning / error / info / markdown)
+    """
+
+    title: str
+    figures: list = field(default_factory=list)
+    messages: list = field(default_factory=list)
+
+
+def report_builders():
+    """리포트에 포함할 페이지의 (라벨, build 함수) 목록 (페이지 순서).
+
+    리포트에 쓰는 페이지만 예열합니다 (코호트 큐브 / drift 기준 분포 등 다른 페이지의 예열은 작업 프로세스에서 생략).
+    """
+    from qaqc.page_registry import load_pages
+
+    pages = [page for page in load_pages(warm=False).values() if page.report is not None]
+    for page in pages:
+        if page.warm is not None:
+            page.warm()
+    return [(page.label, page.report) for page in pages]
+
+
+_STYLE = """
+body { font-family: "Malgun Gothic", "Apple SD Gothic Neo", sans-serif; margin: 2em; color: #222; }
+h1 { margin-bottom: 0.2em; }
+.meta { color: #666; }
+.section { page-break-inside: avoid; margin-top: 2em; }
+.figure { width: 100%; height: 380px; }
+.message { padding: 0.6em 1em; margin: 0.4em 0; border-radius: 4px; }
+.success { background: #e8f5e9; } .warning { background: #fff8e1; } .error { background: #ffebee; } .info { background: #e3f2fd; }
+@media print { .section { page-break-before: always; } .section:first-of-type { page-break-before: auto; } }
+"""
+
+
+def _markdown(text):
+    # 페이지 / 치료 추천 문구에서 쓰는 Markdown (### 제목, **굵게**) 만 변환 (그 외 HTML 태그는 그대로)
+    text = re.sub(r"\*\*(.+?)\*\*", r"<b>\1</b>", text)
+    return re.sub(r"^###\s*(.*)$", r"<h3>\1</h3>", text, flags=re.MULTILINE)
+
+
+class ReportRenderer:
+    """작업 프로세스마다 한 번 준비하는 상태: 모델, 페이지 build 함수(그래프 배경 예열 포함), HTML 틀."""
+
+    def __init__(self, model_path=MODEL_PATH, threshold=DEFAULT_THRESHOLD):
+        self.predictor = Predictor(get_model(model_path), threshold, thread_count=1)
+        self.builders = report_builders()
+        # <title> 뒤의 공통 head (plotly.js 참조 + CSS)
+        self._head = f"</title><script src='{ASSET_NAME}'></script><style>{_STYLE}</style></head><body>"
+
+    def _figure(self, fig, element_id):
+        data = json.dumps(fig.to_plotly_json(), cls=PlotlyJSONEncoder, ensure_ascii=False)
+        return (
+            f"<div id='{element_id}' class='figure'></div>"
+            f"<script>(function(f){{Plotly.newPlot('{element_id}', f.data, f.layout, {{staticPlot: true}});}})({data});</script>"
+        )
+
+    def render(self, patient_id, patient, probability):
+        """환자 한 명의 HTML 리포트 (probability: 금연 확률 smoking_prob_0)."""
+        title = f"건강 리포트 - 환자 {patient_id}"
+        parts = [
+            f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{html.escape(title)}",
+            self._head,
+            f"<h1>🚭 {html.escape(title)}</h1>",
+            f"<p class='meta'>작성: {time.strftime('%Y-%m-%d')} · 모델 {self.predictor.model.version}</p>",
+            f"<h2>📌 금연 가능성: {probability * 100:.2f} %</h2>",
+            _markdown(recommend_treatment(probability * 100)),
+        ]
+        for index, (_, build) in enumerate(self.builders):
+            section = build(patient)
+            parts.append(f"<div class='section'><h2>{html.escape(section.title)}</h2>")
+            for number, fig in enumerate(section.figures):
+                parts.append(self._figure(fig, f"s{index}f{number}"))
+            for kind, text in section.messages:
+                css = "" if kind == "markdown" else f" {kind}"
+                parts.append(f"<div class='message{css}'>{_markdown(text)}</div>")
+            parts.append("</div>")
+        parts.append("</body></html>")
+        return "".join(parts)
+
+    def render_chunk(self, chunk, offset=0):
+        """청크의 환자들을 한 번에 예측하고 [(파일 이름, HTML bytes, manifest 행)] 을 반환합니다."""
+        rows = chunk[INPUT_COLUMNS].to_numpy(dtype=np.float64)
+        ids = chunk[ID_COLUMN].tolist() if ID_COLUMN in chunk.columns else list(range(offset + 1, offset + len(chunk) + 1))
+        patients = [PatientRecord(*row) for row in rows]
+        # HTTP 서비스와 같은 입력 검사 (NaN/inf 포함, 통과한 행은 벡터 연산으로만 확인)
+        errors = [[] for _ in patients]
+        for item in invalid_rows(rows):
+            errors[item["index"]] = item["errors"]
+        valid = np.array([not error for error in errors], dtype=bool)
+        prob0 = np.full(len(rows), np.nan)
+        if valid.any():
+            prob0[valid] = self.predictor.predict_proba(rows[valid])[:, 0]
+
+        results = []
+        for patient_id, patient, error, probability in zip(ids, patients, errors, prob0):
+            if error:
+                # 예측할 수 없는 입력은 리포트 없이 manifest 에 오류만 기록
+                results.append((None, None, (patient_id, "", "", " / ".join(error))))
+                continue
+            name = f"patient_{re.sub(r'[^0-9A-Za-z._-]', '_', str(patient_id))}.html"
+            document = self.render(patient_id, patient, float(probability)).encode("utf-8")
+            results.append((name, document, (patient_id, name, f"{probability:.6f}", "")))
+        return results
+
+
+# 작업 프로세스별 ReportRenderer (initializer 에서 한 번 생성)
+_renderer = None
+
+
+def _init_worker(model_path, threshold):
+    global _renderer
+    _renderer = ReportRenderer(model_path, threshold)
+
+
+def _render_chunk(chunk, offset):
+    return _renderer.render_chunk(chunk, offset)
+
+
+class ReportWriter:
+    """리포트를 디렉터리 또는 zip 파일에 순서대로 씁니다 (plotly.js 는 한 번만, 마지막에 manifest.csv)."""
+
+    def __init__(self, path):
+        from plotly.offline import get_plotlyjs
+
+        self.path = path
+        self._zip = None
+        if path.lower().endswith(".zip"):
+            self._zip = zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED, compresslevel=6)
+        else:
+            os.makedirs(path, exist_ok=True)
+        self._manifest = io.StringIO()
+        self._rows = csv.writer(self._manifest)
+        self._rows.writerow([ID_COLUMN, "file", "smoking_prob_0", "error"])
+        self._names = {ASSET_NAME, MANIFEST_NAME}
+        self.rows = 0
+        self.write(ASSET_NAME, get_plotlyjs().encode("utf-8"))
+
+    def write(self, name, data):
+        if self._zip is not None:
+            self._zip.writestr(name, data)
+        else:
+            with open(os.path.join(self.path, name), "wb") as f:
+                f.write(data)
+
+    def add(self, results):
+        for name, document, row in results:
+            self.rows += 1
+            if name is not None:
+                if name in self._names:
+                    # 🚨 같은 Patient_ID (또는 같은 파일 이름이 되는 ID) 는 덮어쓰지 않고 입력 행 번호를 붙임
+                    stem, ext = os.path.splitext(name)
+                    name = f"{stem}_row{self.rows}{ext}"
+                    while name in self._names:
+                        name = f"{os.path.splitext(name)[0]}_{self.rows}{ext}"
+                    row = (row[0], name, *row[2:])
+                self._names.add(name)
+                self.write(name, document)
+            self._rows.writerow(row)
+
+    def close(self):
+        self.write(MANIFEST_NAME, self._manifest.getvalue().encode("utf-8"))
+        if self._zip is not None:
+            self._zip.close()
+
+
+def generate_reports(input_path, output_path, model_path=MODEL_PATH, chunk_size=200, workers=4,
+                     threshold=DEFAULT_THRESHOLD, log=sys.stderr):
+    """입력 파일의 모든 환자 리포트를 만들고 (리포트 수, 오류 수) 를 반환합니다.
+
+    메모리에는 최대 workers + 1 개 청크의 결과만 올라갑니다.
+    """
+    from qaqc.score import iter_chunks
+
+    writer = ReportWriter(output_path)
+    pending = deque()
+    reports = errors = rows = 0
+    started = time.perf_counter()
+
+    def add(results):
+        nonlocal reports, errors
+        writer.add(results)
+        done = sum(name is not None for name, _, _ in results)
+        reports += done
+        errors += len(results) - done
+        elapsed = time.perf_counter() - started
+        print(f"  {reports:,} reports  {reports / elapsed:,.1f} reports/s", file=log)
+
+    try:
+        if workers <= 1:
+            renderer = ReportRenderer(model_path, threshold)
+            for chunk in iter_chunks(input_path, chunk_size):
+                add(renderer.render_chunk(chunk, rows))
+                rows += len(chunk)
+        else:
+            with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(model_path, threshold)) as executor:
+                for chunk in iter_chunks(input_path, chunk_size):
+                    pending.append(executor.submit(_render_chunk, chunk, rows))
+                    rows += len(chunk)
+                    if len(pending) > workers:
+                        add(pending.popleft().result())
+                while pending:
+                    add(pending.popleft().result())
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"✅ {reports:,} reports ({errors:,} invalid) in {elapsed:.2f}s "
+          f"({reports / max(elapsed, 1e-9):,.1f} reports/s) -> {output_path}", file=log)
+    return reports, errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="qaqc-report", description="환자별 건강 리포트(HTML) 일괄 생성")
+    parser.add_argument("input", help="환자 CSV 또는 Parquet 파일 (모델 입력 컬럼 + 선택적으로 Patient_ID)")
+    parser.add_argument("output", help="출력 디렉터리 또는 .zip 파일")
+    parser.add_argument("--model", default=MODEL_PATH, help="CatBoost 모델(pickle) 경로")
+    parser.add_argument("--chunk-size", type=int, default=200, help="작업 단위(청크)당 환자 수")
+    parser.add_argument("--workers", type=int, default=4, help="프로세스 수 (1 이면 현재 프로세스에서 실행)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="smoking_pred=1 로 판정할 흡연 확률")
+    args = parser.parse_args(argv)
+
+    generate_reports(args.input, args.output, args.model, args.chunk_size, args.workers, args.threshold)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+"""대용량 환자 CSV/Parquet 파일을 청크 단위로 스트리밍하며 금연 확률을 계산합니다.
+
+    python -m qaqc.score input.csv output.csv --chunk-size 100000 --workers 4
+
+입력 전체를 메모리에 올리지 않고, 청크별로 main.py 와 같은 Feature Engineering 을 거쳐
+predict_proba 를 호출한 뒤 smoking_pred / smoking_prob_0 을 출력 파일에 이어서 씁니다.
+청크 workers 개를 동시에 예측하고, 각 predict_proba 는 CatBoost 스레드 threads 개를 씁니다
+(기본: 코어 수 / workers, 합쳐서 전체 코어).
+"""
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from qaqc.drift import DRIFT_STATE, DriftMonitor, get_reference
+from qaqc.features import FEATURE_COLUMNS, INPUT_COLUMNS, transform
+from qaqc.inference import DEFAULT_THRESHOLD, Predictor
+from qaqc.model_registry import MODEL_PATH, get_model
+from qaqc.ranges import flag_frame
+
+PREDICTION_COLUMNS = ["smoking_pred", "smoking_prob_0"]
+
+
+def default_threads(workers):
+    """동시에 도는 청크 workers 개가 코어를 나눠 쓰도록 청크당 CatBoost 스레드 수."""
+    return max(1, (os.cpu_count() or 1) // max(1, workers))
+
+
+def _is_parquet(path):
+    return Path(path).suffix.lower() in (".parquet", ".pq")
+
+
+def iter_chunks(path, chunk_size):
+    """입력 파일을 chunk_size 행 단위의 DataFrame 으로 나누어 읽습니다."""
+    if _is_parquet(path):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size)
+
+
+class ChunkWriter:
+    """청크 결과를 CSV/Parquet 파일에 순서대로 이어 씁니다."""
+
+    def __init__(self, path):
+        self.path = path
+        self._parquet = _is_parquet(path)
+        self._writer = None
+        self._header = True
+
+    def write(self, frame):
+        if self._parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        else:
+            frame.to_csv(self.path, mode="w" if self._header else "a", header=self._header, index=False)
+            self._header = False
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+def score_chunk(model, chunk, thread_count=1, flags=False, threshold=DEFAULT_THRESHOLD):
+    """한 청크의 Feature Engineering + 예측 결과를 기준 CSV 와 같은 컬럼 구성으로 반환합니다.
+
+    flags=True 면 qaqc.ranges 기준의 `<컬럼>_abnormal` 플래그 컬럼을 뒤에 덧붙입니다.
+    """
+    features = transform(chunk)
+    # CatBoost 는 float32 입력을 변환 없이 바로 사용 (float64 대비 대량 배치에서 약 10배 빠름)
+    prob = model.predict_proba(features.to_numpy(dtype=np.float32), thread_count=thread_count)
+    # 입력에만 있는 컬럼(Patient_ID 등)은 앞쪽에 그대로 유지
+    passthrough = [c for c in chunk.columns if c not in FEATURE_COLUMNS and c not in PREDICTION_COLUMNS]
+    out = pd.concat([chunk[passthrough], features], axis=1)
+    out["smoking_pred"] = Predictor(model, threshold).labels(prob)
+    out["smoking_prob_0"] = prob[:, 0]
+    if flags:
+        out = pd.concat([out, flag_frame(features)], axis=1)
+    return out
+
+
+def score_file(input_path, output_path, model_path=MODEL_PATH, chunk_size=100_000, workers=4, flags=False,
+               threshold=DEFAULT_THRESHOLD, drift=None, log=sys.stderr, threads=None):
+    """파일 전체를 스코어링하고 처리한 행 수를 반환합니다.
+
+    메모리에는 최대 workers + 1 개의 청크만 올라갑니다. drift(DriftMonitor)를 주면 청크마다 구간 카운트를 더합니다.
+    threads: 청크당 CatBoost 스레드 수 (None 이면 default_threads(workers)).
+    """
+    model = get_model(model_path)
+    thread_count = threads or default_threads(workers)
+    writer = ChunkWriter(output_path)
+    pending = deque()
+    rows = 0
+    started = time.perf_counter()
+
+    def flush_oldest():
+        nonlocal rows
+        result = pending.popleft().result()
+        writer.write(result)
+        if drift is not None:
+            drift.update(result[INPUT_COLUMNS].to_numpy(dtype=np.float64), result["smoking_prob_0"].to_numpy())
+        rows += len(result)
+        elapsed = time.perf_counter() - started
+        print(f"  {rows:,} rows  {rows / elapsed:,.0f} rows/s", file=log)
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for chunk in iter_chunks(input_path, chunk_size):
+                pending.append(executor.submit(score_chunk, model, chunk, thread_count, flags=flags, threshold=threshold))
+                if len(pending) > workers:
+                    flush_oldest()
+            while pending:
+                flush_oldest()
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"✅ {rows:,} rows in {elapsed:.2f}s ({rows / max(elapsed, 1e-9):,.0f} rows/s) -> {output_path}", file=log)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="qaqc-score", description="환자 CSV/Parquet 배치 스코어링")
+    parser.add_argument("input", help="입력 CSV 또는 Parquet 파일")
+    parser.add_argument("output", help="출력 CSV 또는 Parquet 파일")
+    parser.add_argument("--model", default=MODEL_PATH, help="CatBoost 모델(pickle) 경로")
+    parser.add_argument("--chunk-size", type=int, default=100_000, help="청크당 행 수")
+    parser.add_argument("--workers", type=int, default=4, help="동시에 예측하는 청크 수")
+    parser.add_argument("--threads", type=int, default=None,
+                        help="청크당 CatBoost 스레드 수 (기본: 코어 수 / workers)")
+    parser.add_argument("--flags", action="store_true", help="기준 범위 이탈 플래그 컬럼 추가")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="smoking_pred=1 로 판정할 흡연 확률")
+    parser.add_argument("--drift", nargs="?", const=DRIFT_STATE, default=None,
+                        help=f"분포 변화 모니터링용 구간 카운트를 누적할 파일 (기본: {DRIFT_STATE})")
+    args = parser.parse_args(argv)
+
+    drift = DriftMonitor.load(get_reference(), args.drift) if args.drift else None
+    score_file(args.input, args.output, args.model, args.chunk_size, args.workers, args.flags, args.threshold, drift,
+               threads=args.threads)
+    if drift is not None:
+        drift.save(args.drift)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,290 @@
+"""Streamlit 과 별도로 실행하는 비동기 HTTP 추론 서비스 (tornado / asyncio).
+
+    python -m qaqc.service --port 8000
+
+    GET  /healthz          상태 + 모델 버전 + 마이크로 배치 통계
+    POST /predict          환자 한 명 (JSON 객체, 키 = 모델 입력 컬럼명)
+    POST /predict/batch    JSON 배열, 또는 Content-Type: application/x-ndjson 스트림
+
+동시에 들어온 작은 요청들은 MicroBatcher 가 모아서 predict_proba 한 번으로 처리합니다.
+입력은 대시보드와 같은 PatientRecord.validate() 로 검사합니다: /predict 와 JSON 배열은 422,
+NDJSON 스트림은 해당 줄 자리에 {"error": ...} 를 내보내고 나머지 줄은 계속 처리합니다.
+"""
+import argparse
+import asyncio
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import tornado.web
+
+from qaqc.features import INPUT_COLUMNS
+from qaqc.inference import DEFAULT_THRESHOLD, Predictor
+from qaqc.model_registry import MODEL_PATH, get_model
+from qaqc.patient import PatientRecord
+
+NDJSON = "application/x-ndjson"
+# NDJSON 스트림은 이 행 수만큼 모일 때마다 예측해서 바로 응답으로 흘려보냄
+STREAM_CHUNK_ROWS = 2048
+
+
+class MicroBatcher:
+    """짧은 시간(max_wait) 동안 들어온 요청을 모아 한 번의 predict_proba 로 처리합니다."""
+
+    def __init__(self, model_path=MODEL_PATH, max_batch=4096, max_wait=0.002, workers=1,
+                 threshold=DEFAULT_THRESHOLD):
+        self.model_path = model_path
+        self.threshold = threshold
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._queue = None
+        self._task = None
+        self.batches = 0
+        self.rows = 0
+
+    def _score(self, rows):
+        model = get_model(self.model_path)
+        labels, prob0 = Predictor(model, self.threshold).predict(rows)
+        return labels, prob0, model.version
+
+    async def submit(self, rows):
+        """(n, 22) 행렬을 제출하고 (라벨, smoking_prob_0, 모델 버전)을 기다립니다."""
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._task = asyncio.ensure_future(self._run())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((rows, future))
+        return await future
+
+    def _drain(self, items, count):
+        while count < self.max_batch and not self._queue.empty():
+            item = self._queue.get_nowait()
+            items.append(item)
+            count += len(item[0])
+        return count
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            items = [await self._queue.get()]
+            count = self._drain(items, len(items[0][0]))
+            if count < self.max_batch and self.max_wait > 0:
+                await asyncio.sleep(self.max_wait)
+                count = self._drain(items, count)
+
+            rows = np.vstack([item[0] for item in items])
+            try:
+                labels, prob0, version = await loop.run_in_executor(self._executor, self._score, rows)
+            except Exception as e:
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.rows += count
+            offset = 0
+            for item_rows, future in items:
+                end = offset + len(item_rows)
+                if not future.done():
+                    future.set_result((labels[offset:end], prob0[offset:end], version))
+                offset = end
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "rows": self.rows,
+            "mean_batch_rows": self.rows / self.batches if self.batches else 0.0,
+        }
+
+
+def row_from_record(record):
+    """JSON 객체 하나를 22개 값의 리스트로. 필드가 없거나 숫자가 아니면 ValueError."""
+    if not isinstance(record, dict):
+        raise ValueError("expected a JSON object")
+    try:
+        return [float(record[column]) for column in INPUT_COLUMNS]
+    except KeyError as e:
+        raise ValueError(f"missing field: {e.args[0]}")
+    except (TypeError, ValueError):
+        raise ValueError("invalid field value")
+
+
+def rows_from_records(records):
+    try:
+        rows = [row_from_record(record) for record in records]
+    except ValueError as e:
+        raise tornado.web.HTTPError(400, reason=str(e))
+    return np.array(rows, dtype=np.float64).reshape(-1, len(INPUT_COLUMNS))
+
+
+def row_errors(row):
+    """대시보드(main.py)와 같은 입력 검사. 오류 메시지 목록 (비어 있으면 통과)."""
+    if not np.isfinite(row).all():
+        return ["🚨 모든 값은 유한한 숫자여야 합니다."]
+    return PatientRecord(*row.tolist()).validate()
+
+
+def invalid_rows(rows):
+    """(n, 22) 행렬에서 검사에 걸리는 행들의 {"index", "errors"} 목록. 통과한 행은 벡터 연산으로만 확인."""
+    suspect = ~np.isfinite(rows).all(axis=1) | PatientRecord.invalid_mask(rows)
+    return [{"index": int(i), "errors": row_errors(rows[i])} for i in np.flatnonzero(suspect)]
+
+
+def _results(labels, prob0, version):
+    return [
+        {"smoking_pred": int(label), "smoking_prob_0": float(p), "model_version": version}
+        for label, p in zip(labels, prob0)
+    ]
+
+
+class _BaseHandler(tornado.web.RequestHandler):
+    def initialize(self, batcher):
+        self.batcher = batcher
+
+    def write_error(self, status_code, **kwargs):
+        self.finish({"error": self._reason})
+
+    def _reject(self, invalid):
+        self.set_status(422)
+        self.finish({"error": "invalid input", "invalid": invalid})
+
+
+class HealthHandler(_BaseHandler):
+    def get(self):
+        try:
+            version = get_model(self.batcher.model_path).version
+        except OSError as e:
+            self.set_status(503)
+            self.finish({"status": "error", "error": str(e)})
+            return
+        self.finish({"status": "ok", "model_version": version, **self.batcher.stats()})
+
+
+class PredictHandler(_BaseHandler):
+    async def post(self):
+        try:
+            record = json.loads(self.request.body)
+        except ValueError:
+            raise tornado.web.HTTPError(400, reason="invalid JSON")
+        if not isinstance(record, dict):
+            raise tornado.web.HTTPError(400, reason="expected a JSON object")
+        rows = rows_from_records([record])
+        invalid = invalid_rows(rows)
+        if invalid:
+            self._reject(invalid)
+            return
+        labels, prob0, version = await self.batcher.submit(rows)
+        self.finish(_results(labels, prob0, version)[0])
+
+
+@tornado.web.stream_request_body
+class BatchHandler(_BaseHandler):
+    def prepare(self):
+        self._ndjson = self.request.headers.get("Content-Type", "").startswith(NDJSON)
+        self._body = []
+        self._pending = b""
+        self._lines = []
+        if self._ndjson:
+            # 스트림은 크기 제한 없이 받아서 청크 단위로 처리
+            self.request.connection.set_max_body_size(1 << 40)
+            self.set_header("Content-Type", NDJSON)
+
+    async def data_received(self, chunk):
+        if not self._ndjson:
+            self._body.append(chunk)
+            return
+        *lines, self._pending = (self._pending + chunk).split(b"\n")
+        self._lines.extend(line for line in lines if line.strip())
+        if len(self._lines) >= STREAM_CHUNK_ROWS:
+            await self._score_lines()
+
+    async def _score_lines(self):
+        lines, self._lines = self._lines, []
+        if not lines:
+            return
+        # 🚨 잘못된 줄은 그 자리에 {"error": ...} 를 내보내고 나머지 줄은 계속 예측
+        out = [None] * len(lines)
+        rows, positions = [], []
+        for i, line in enumerate(lines):
+            try:
+                rows.append(row_from_record(json.loads(line)))
+                positions.append(i)
+            except ValueError as e:
+                out[i] = {"error": "invalid NDJSON line" if isinstance(e, json.JSONDecodeError) else str(e)}
+        rows = np.array(rows, dtype=np.float64).reshape(-1, len(INPUT_COLUMNS))
+        positions = np.array(positions, dtype=np.int64)
+        invalid = invalid_rows(rows)
+        for item in invalid:
+            out[positions[item["index"]]] = {"error": "invalid input", "errors": item["errors"]}
+        if invalid:
+            keep = np.ones(len(rows), dtype=bool)
+            keep[[item["index"] for item in invalid]] = False
+            rows, positions = rows[keep], positions[keep]
+        if len(rows):
+            labels, prob0, version = await self.batcher.submit(rows)
+            for i, result in zip(positions.tolist(), _results(labels, prob0, version)):
+                out[i] = result
+        self.write("".join(json.dumps(result) + "\n" for result in out))
+        await self.flush()
+
+    async def post(self):
+        if self._ndjson:
+            if self._pending.strip():
+                self._lines.append(self._pending)
+            await self._score_lines()
+            self.finish()
+            return
+
+        try:
+            records = json.loads(b"".join(self._body))
+        except ValueError:
+            raise tornado.web.HTTPError(400, reason="invalid JSON")
+        if not isinstance(records, list):
+            raise tornado.web.HTTPError(400, reason="expected a JSON array")
+        if not records:
+            self.finish({"results": []})
+            return
+        rows = rows_from_records(records)
+        invalid = invalid_rows(rows)
+        if invalid:
+            self._reject(invalid)
+            return
+        labels, prob0, version = await self.batcher.submit(rows)
+        self.finish({"results": _results(labels, prob0, version)})
+
+
+def make_app(batcher=None):
+    batcher = batcher or MicroBatcher()
+    return tornado.web.Application([
+        (r"/healthz", HealthHandler, dict(batcher=batcher)),
+        (r"/predict", PredictHandler, dict(batcher=batcher)),
+        (r"/predict/batch", BatchHandler, dict(batcher=batcher)),
+    ])
+
+
+async def serve(port, batcher):
+    app = make_app(batcher)
+    app.listen(port)
+    print(f"✅ qaqc inference service on :{port}", flush=True)
+    await asyncio.Event().wait()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="비동기 HTTP 추론 서비스")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--model", default=MODEL_PATH, help="CatBoost 모델(pickle) 경로")
+    parser.add_argument("--max-batch", type=int, default=4096, help="마이크로 배치 최대 행 수")
+    parser.add_argument("--max-wait-ms", type=float, default=2.0, help="배치를 모으는 최대 대기 시간(ms)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="smoking_pred=1 로 판정할 흡연 확률")
+    args = parser.parse_args(argv)
+
+    batcher = MicroBatcher(args.model, args.max_batch, args.max_wait_ms / 1000, threshold=args.threshold)
+    asyncio.run(serve(args.port, batcher))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
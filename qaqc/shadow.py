@@ -0,0 +1,400 @@
+"""Champion / challenger 그림자(shadow) 평가.
+
+화면에 보이는 결과는 항상 champion(기본 모델)이 동기적으로 계산하고,
+등록된 challenger 모델들은 같은 Feature 벡터를 백그라운드 스레드에서 예측합니다 (UI 는 기다리지 않음).
+지연 시간은 모든 모델(champion 포함)을 같은 스레드/같은 입력으로 다시 재서 공정하게 비교하고,
+모델 크기와 메모리, champion 과의 라벨 일치율과 금연 확률 차이를 모아 Shadow 페이지에서 나란히 보여줍니다.
+
+champion / challenger 는 모두 qaqc.model_registry.LoadedModel 로 다룹니다. challenger 는 파일 경로
+(CatBoost pickle / cbm 과 sklearn 호환 pickle) 또는 predict_proba + classes_ 를 가진 모델 객체로 등록하며,
+객체는 wrap_model 로 감싸 CatBoost 전용 인자(thread_count)가 다른 모델에 넘어가지 않게 합니다.
+
+    QAQC_CHALLENGERS="lite=files/challenger_lite.cbm,logistic=files/challenger_logistic.pkl" streamlit run main.py
+    python -m qaqc.shadow build lite files/challenger_lite.cbm --trees 200
+    python -m qaqc.shadow build logistic files/challenger_logistic.pkl
+    python -m qaqc.shadow replay files/test_with_predictions.csv --challenger lite=files/challenger_lite.cbm
+"""
+import argparse
+import gc
+import os
+import pickle
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from qaqc.inference import DEFAULT_THRESHOLD, LOW_LATENCY_THREADS, Predictor, predict_patient
+from qaqc.model_registry import MODEL_PATH, clear_cache, get_model, wrap_model
+
+CHAMPION = "champion"
+# 처리 대기 중인 요청이 이보다 많으면 새 요청은 평가하지 않고 dropped 로 셈 (UI 를 막지 않음)
+MAX_PENDING = 256
+# 지연 시간 분위수 계산에 쓰는 모델별 최근 요청 수
+LATENCY_WINDOW = 5000
+RECENT_DISAGREEMENTS = 50
+PERCENTILES = [50, 95, 99]
+MEMORY_TIMEOUT = 120  # 초
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def parse_challengers(text):
+    """"이름=경로,이름=경로" -> {이름: 경로}"""
+    challengers = {}
+    for item in filter(None, (part.strip() for part in text.split(","))):
+        name, sep, path = item.partition("=")
+        if not sep or not name.strip() or not path.strip():
+            raise ValueError(f"challenger 형식은 이름=경로 입니다: {item!r}")
+        challengers[name.strip()] = path.strip()
+    return challengers
+
+
+def _rss_bytes():
+    # Linux 에서만 측정 (그 외에는 None)
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def _loaded_bytes(path):
+    """이 프로세스에서 모델을 한 번 로드해 두고(import 등 1회성 비용), 한 번 더 로드할 때 늘어나는 메모리.
+
+    네이티브 메모리(CatBoost)는 RSS 차이로, 페이지 단위보다 작은 Python 객체(sklearn)는 tracemalloc 으로 잽니다.
+    """
+    first = get_model(path)
+    clear_cache()
+    gc.collect()
+    tracemalloc.start()
+    before = _rss_bytes()
+    second = get_model(path)
+    after = _rss_bytes()
+    traced, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    if before is None or after is None or first.version != second.version:
+        return None
+    return max(after - before, traced)
+
+
+_memory_lock = threading.Lock()
+_memory = {}
+
+
+def model_memory(path, version=None, timeout=MEMORY_TIMEOUT):
+    """모델 파일 하나가 로드되어 차지하는 메모리(bytes) 추정. 측정할 수 없으면 None.
+
+    별도 프로세스에서 _loaded_bytes 로 잽니다. 앱 프로세스의 다른 스레드나 라이브러리 import 가 섞이지 않고,
+    champion / challenger 를 같은 방법으로 측정합니다. (path, version) 별로 한 번만 측정.
+    """
+    if path is None:
+        return None
+    key = (os.path.abspath(path), version)
+    with _memory_lock:
+        if key in _memory:
+            return _memory[key]
+    try:
+        done = subprocess.run(
+            [sys.executable, "-m", "qaqc.shadow", "memory", key[0]],
+            cwd=_ROOT, capture_output=True, text=True, timeout=timeout, check=True,
+        )
+        measured = int(done.stdout.split()[-1])
+    except (OSError, subprocess.SubprocessError, ValueError, IndexError):
+        measured = None
+    with _memory_lock:
+        _memory[key] = measured
+    return measured
+
+
+class ModelStats:
+    def __init__(self, name, role, window=LATENCY_WINDOW):
+        self.name = name
+        self.role = role
+        self.version = None
+        self.size = None
+        self.memory = None
+        self.latencies = deque(maxlen=window)  # 초
+        self.requests = 0
+        self.errors = 0
+        self.last_error = None
+        self.agreements = 0
+        self.abs_diff_sum = 0.0
+        self.max_abs_diff = 0.0
+
+    def summary(self):
+        latencies = np.array(self.latencies) * 1000
+        row = {"모델": self.name, "역할": self.role, "버전": self.version or "-", "요청 수": self.requests,
+               "오류": self.errors}
+        for q in PERCENTILES:
+            row[f"p{q}(ms)"] = float(np.percentile(latencies, q)) if len(latencies) else np.nan
+        row["모델 크기(MB)"] = self.size / 1e6 if self.size else np.nan
+        row["로드 메모리(MB)"] = self.memory / 1e6 if self.memory is not None else np.nan
+        compared = self.requests - self.errors
+        if self.role == CHAMPION:
+            row.update({"라벨 일치율(%)": 100.0, "평균 |Δ금연확률|(%p)": 0.0, "최대 |Δ금연확률|(%p)": 0.0})
+        else:
+            row.update({
+                "라벨 일치율(%)": self.agreements / compared * 100 if compared else np.nan,
+                "평균 |Δ금연확률|(%p)": self.abs_diff_sum / compared * 100 if compared else np.nan,
+                "최대 |Δ금연확률|(%p)": self.max_abs_diff * 100 if compared else np.nan,
+            })
+        return row
+
+
+class ShadowScorer:
+    """challenger 모델들을 백그라운드 스레드 하나에서 평가하고 모델별 통계를 모읍니다.
+
+    challengers: {이름: 모델 파일 경로 또는 모델 객체}. 경로는 get_model 로 로드 (파일이 바뀌면 다시 로드),
+    객체는 wrap_model 로 한 번 감쌉니다.
+    """
+
+    def __init__(self, challengers, threshold=DEFAULT_THRESHOLD, max_pending=MAX_PENDING, window=LATENCY_WINDOW):
+        self.challengers = {
+            name: source if isinstance(source, (str, os.PathLike)) else wrap_model(source)
+            for name, source in challengers.items()
+        }
+        self.threshold = threshold
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="qaqc-shadow")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.dropped = 0
+        self.stats = {CHAMPION: ModelStats(CHAMPION, CHAMPION, window)}
+        for name in self.challengers:
+            self.stats[name] = ModelStats(name, "challenger", window)
+        self.disagreements = deque(maxlen=RECENT_DISAGREEMENTS)
+
+    def submit(self, champion, result):
+        """champion 예측 결과(PredictionResult)와 같은 Feature 로 challenger 평가를 예약합니다. 기다리지 않음."""
+        if not self.challengers:
+            return False
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.dropped += 1
+                return False
+            self._pending += 1
+        features = np.asarray(result.features, dtype=np.float32).reshape(1, -1)
+        self._executor.submit(self._score, champion, features, result)
+        return True
+
+    def _describe(self, name, model):
+        """모델 버전 / 크기 / 메모리 기록 (메모리는 버전이 바뀔 때만 다시 측정)."""
+        stats = self.stats[name]
+        if stats.version == model.version:
+            return
+        memory = model_memory(getattr(model, "path", None), model.version)
+        with self._lock:
+            stats.version = model.version
+            stats.size = model.size
+            stats.memory = memory
+
+    def _predict(self, name, model, features):
+        self._describe(name, model)
+        stats = self.stats[name]
+        started = time.perf_counter()
+        try:
+            prob = model.predict_proba(features, thread_count=LOW_LATENCY_THREADS)
+        except Exception as e:
+            with self._lock:
+                stats.requests += 1
+                stats.errors += 1
+                stats.last_error = f"{type(e).__name__}: {e}"
+            return None
+        elapsed = time.perf_counter() - started
+        label = int(Predictor(model, self.threshold).labels(prob)[0])
+        with self._lock:
+            stats.requests += 1
+            stats.latencies.append(elapsed)
+        return float(prob[0, 0]), label
+
+    def _load(self, name, source):
+        if not isinstance(source, (str, os.PathLike)):
+            return source
+        try:
+            return get_model(source)
+        except Exception as e:
+            stats = self.stats[name]
+            with self._lock:
+                stats.requests += 1
+                stats.errors += 1
+                stats.last_error = f"{type(e).__name__}: {e}"
+            return None
+
+    def _score(self, champion, features, result):
+        try:
+            expected_label = int(np.asarray(result.prediction).ravel()[0])
+            # champion 도 같은 조건(백그라운드 스레드, 같은 Feature)에서 지연 시간을 측정
+            self._predict(CHAMPION, champion, features)
+            for name, source in self.challengers.items():
+                model = self._load(name, source)
+                outcome = None if model is None else self._predict(name, model, features)
+                if outcome is None:
+                    continue
+                probability, label = outcome
+                diff = abs(probability - result.probability)
+                with self._lock:
+                    stats = self.stats[name]
+                    stats.agreements += label == expected_label
+                    stats.abs_diff_sum += diff
+                    stats.max_abs_diff = max(stats.max_abs_diff, diff)
+                    if label != expected_label:
+                        self.disagreements.append({
+                            "시각": time.strftime("%H:%M:%S"), "모델": name,
+                            "champion 금연확률(%)": result.probability * 100, "challenger 금연확률(%)": probability * 100,
+                            "champion 라벨": expected_label, "challenger 라벨": label,
+                        })
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def flush(self):
+        """예약된 평가가 모두 끝날 때까지 기다립니다 (작업 스레드가 하나라서 순서대로 처리됨)."""
+        self._executor.submit(lambda: None).result()
+
+    def report(self):
+        """모델별 요청 수, 지연 시간 분위수, 모델 크기, champion 과의 일치율 (champion 이 첫 행)."""
+        with self._lock:
+            return pd.DataFrame([stats.summary() for stats in self.stats.values()])
+
+    def latency_frame(self):
+        """(모델, 지연 시간(ms)) 긴 형식 DataFrame (분포 그래프용)."""
+        with self._lock:
+            return pd.DataFrame([
+                {"모델": name, "지연 시간(ms)": seconds * 1000}
+                for name, stats in self.stats.items() for seconds in stats.latencies
+            ])
+
+    def recent_disagreements(self):
+        with self._lock:
+            return pd.DataFrame(list(self.disagreements)[::-1])
+
+    def status(self):
+        with self._lock:
+            return {"pending": self._pending, "dropped": self.dropped, "max_pending": self.max_pending}
+
+
+_lock = threading.Lock()
+_scorers = {}
+
+
+def get_shadow(challengers=None):
+    """프로세스 전체에서 공유되는 ShadowScorer (challenger 는 QAQC_CHALLENGERS 환경 변수로 등록)."""
+    if challengers is None:
+        challengers = parse_challengers(os.environ.get("QAQC_CHALLENGERS", ""))
+    key = tuple(sorted(challengers.items()))
+    scorer = _scorers.get(key)
+    if scorer is None:
+        with _lock:
+            scorer = _scorers.get(key)
+            if scorer is None:
+                scorer = ShadowScorer(challengers)
+                _scorers[key] = scorer
+    return scorer
+
+
+def build_lite(out_path, trees, model_path=MODEL_PATH):
+    """champion CatBoost 의 앞쪽 trees 개 트리만 남긴 가벼운 모델(cbm)."""
+    champion = get_model(model_path)
+    if not champion.is_catboost:
+        raise ValueError("lite challenger 는 CatBoost champion 에서만 만들 수 있습니다.")
+    lite = champion._model.copy()
+    lite.shrink(ntree_end=min(trees, lite.tree_count_))
+    lite.save_model(out_path, format="cbm")
+    return lite.tree_count_
+
+
+def build_logistic(out_path, model_path=MODEL_PATH):
+    """기준 코호트에서 champion 의 예측 라벨을 따라 하도록 학습한 로지스틱 회귀 (pickle)."""
+    # 학습용 의존성(sklearn)은 이 명령에서만 import
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    from qaqc.cohort_store import COHORT_CSV
+    from qaqc.features import INPUT_COLUMNS
+
+    champion = get_model(model_path)
+    predictor = Predictor(champion)
+    rows = pd.read_csv(COHORT_CSV, usecols=INPUT_COLUMNS)[INPUT_COLUMNS].to_numpy(dtype=np.float64)
+    features = predictor.features(rows)
+    labels = predictor.labels(predictor.predict_proba(rows))
+    model = make_pipeline(StandardScaler(), LogisticRegression(max_iter=2000)).fit(features, labels)
+    with open(out_path, "wb") as f:
+        pickle.dump(model, f)
+    return float((model.predict(features) == labels).mean())
+
+
+def replay(input_path, challengers, limit=2000, model_path=MODEL_PATH, log=sys.stderr):
+    """파일의 환자들을 한 명씩 대시보드와 같은 경로(predict_patient + submit)로 흘려 보내고 통계를 반환합니다."""
+    from qaqc.features import INPUT_COLUMNS
+    from qaqc.patient import PatientRecord
+    from qaqc.score import iter_chunks
+
+    champion = get_model(model_path)
+    scorer = ShadowScorer(challengers, max_pending=limit)
+    seen = 0
+    for chunk in iter_chunks(input_path, min(limit, 10_000)):
+        for row in chunk[INPUT_COLUMNS].to_numpy(dtype=np.float64)[:limit - seen]:
+            patient = PatientRecord(*row)
+            if patient.validate():
+                continue
+            scorer.submit(champion, predict_patient(champion, patient))
+            seen += 1
+        if seen >= limit:
+            break
+    scorer.flush()
+    print(f"✅ {seen:,} patients replayed", file=log)
+    return scorer
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="qaqc-shadow", description="champion / challenger 그림자 평가")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="challenger 모델 만들기")
+    build.add_argument("kind", choices=["lite", "logistic"])
+    build.add_argument("output", help="출력 경로 (lite: .cbm, logistic: .pkl)")
+    build.add_argument("--trees", type=int, default=200, help="lite 모델에 남길 트리 수")
+    build.add_argument("--model", default=MODEL_PATH, help="champion 모델 경로")
+    run = commands.add_parser("replay", help="파일의 환자들로 challenger 평가")
+    run.add_argument("input", help="환자 CSV 또는 Parquet 파일")
+    run.add_argument("--challenger", action="append", default=[], help="이름=경로 (여러 번 지정 가능)")
+    run.add_argument("--limit", type=int, default=2000, help="평가할 최대 환자 수")
+    run.add_argument("--model", default=MODEL_PATH, help="champion 모델 경로")
+    memory = commands.add_parser("memory", help="모델 하나가 로드되어 차지하는 메모리(bytes) 측정")
+    memory.add_argument("path", help="모델 파일 경로")
+    args = parser.parse_args(argv)
+
+    if args.command == "memory":
+        measured = _loaded_bytes(args.path)
+        if measured is None:
+            return 1
+        print(measured)
+        return 0
+
+    if args.command == "build":
+        if args.kind == "lite":
+            trees = build_lite(args.output, args.trees, args.model)
+            print(f"✅ lite challenger ({trees} trees) -> {args.output}")
+        else:
+            agreement = build_logistic(args.output, args.model)
+            print(f"✅ logistic challenger (champion 라벨 일치율 {agreement * 100:.1f}%) -> {args.output}")
+        return 0
+
+    try:
+        challengers = parse_challengers(",".join(args.challenger))
+    except ValueError as e:
+        parser.error(str(e))
+    if not challengers:
+        parser.error("--challenger 를 하나 이상 지정하세요")
+    scorer = replay(args.input, challengers, args.limit, args.model)
+    print(scorer.report().to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
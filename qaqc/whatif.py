@@ -0,0 +1,65 @@
+"""What-if 민감도 분석: 현재 환자의 일부 항목만 바꾼 사본들을 한 번의 배치로 예측합니다.
+
+1-D 스윕(항목 하나)과 2-D 격자(항목 두 개)의 모든 점을 (점 개수, 22) 입력 행렬 하나로 만들어
+Feature Engineering 과 predict_proba 를 각각 한 번만 호출합니다.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from qaqc.features import INPUT_COLUMNS
+from qaqc.inference import Predictor
+
+# ✅ 바꿔 볼 수 있는 항목: 컬럼 -> (표시 이름, 최솟값, 최댓값)
+SWEEPS = {
+    "weight(kg)": ("몸무게 (kg)", 40, 130),
+    "waist(cm)": ("허리 둘레 (cm)", 55, 130),
+    "Gtp": ("r-Gtp (IU/L)", 5, 250),
+    "triglyceride": ("중성지방 (mg/dL)", 30, 400),
+    "HDL": ("HDL (mg/dL)", 25, 100),
+    "LDL": ("LDL (mg/dL)", 50, 250),
+    "hemoglobin": ("헤모글로빈 (g/dL)", 9, 19),
+    "systolic": ("혈압(수축기) (mmHg)", 90, 180),
+    "fasting blood sugar": ("공복혈당 (mg/dL)", 70, 200),
+    "ALT": ("ALT (IU/L)", 5, 150),
+    "AST": ("AST (IU/L)", 5, 150),
+    "serum creatinine": ("혈청 크레아티닌 (mg/dL)", 0.4, 2.0),
+}
+
+_INDEX = {column: i for i, column in enumerate(INPUT_COLUMNS)}
+
+
+def sweep_values(column, points, current=None):
+    """SWEEPS 범위를 points 개로 나눈 값 (환자 현재 값이 범위를 벗어나면 범위를 넓힘)."""
+    _, low, high = SWEEPS[column]
+    if current is not None:
+        low, high = min(low, current), max(high, current)
+    return np.linspace(low, high, points)
+
+
+def grid_rows(base, changes):
+    """base (22,) 를 복제하고 {컬럼: 값 배열} 의 모든 조합을 채운 (점 개수, 22) 행렬.
+
+    값 배열이 2개면 np.meshgrid(indexing="ij") 순서 (첫 번째 컬럼이 행 방향).
+    """
+    grids = np.meshgrid(*changes.values(), indexing="ij")
+    rows = np.repeat(np.asarray(base, dtype=np.float64)[None, :], grids[0].size, axis=0)
+    for column, grid in zip(changes, grids):
+        rows[:, _INDEX[column]] = grid.ravel()
+    return rows
+
+
+@dataclass(frozen=True)
+class WhatIfResult:
+    columns: tuple
+    values: tuple
+    # 금연 가능성 (smoking_prob_0), 1-D: (n,), 2-D: (len(values[0]), len(values[1]))
+    probability: np.ndarray
+
+
+def sweep(model, patient, changes):
+    """{컬럼: 값 배열} 격자 전체의 금연 가능성을 predict_proba 한 번으로 계산합니다."""
+    rows = grid_rows(patient.as_array(), changes)
+    _, prob0 = Predictor(model).predict(rows)
+    shape = tuple(len(values) for values in changes.values())
+    return WhatIfResult(tuple(changes), tuple(np.asarray(v) for v in changes.values()), prob0.reshape(shape))
@@ -0,0 +1,67 @@
+import plotly.graph_objects as go
+import streamlit as st
+
+from qaqc.quantiles import age_band, get_index
+
+
+def percentile_panel(values, age, key):
+    """환자 수치의 코호트 내 백분위와 분포를 보여줍니다.
+
+    values: {코호트 컬럼명: 환자 수치}
+    """
+    index = get_index()
+    st.subheader("👥 코호트 비교")
+    by_age = st.checkbox(f"같은 연령대({age_band(age)})와 비교", key=f"percentile_by_age_{key}")
+    band_age = age if by_age else None
+
+    metric_columns = st.columns(len(values))
+    for metric_column, (column, value) in zip(metric_columns, values.items()):
+        metric_column.metric(column, f"{value:g}", f"상위 {100 - index.percentile(column, value, band_age):.0f}%", delta_color="off")
+
+    with st.expander("📊 코호트 분포 보기"):
+        for column, value in values.items():
+            sketch = index.sketch(column, band_age)
+            centers = (sketch.hist_edges[:-1] + sketch.hist_edges[1:]) / 2
+            fig = go.Figure(go.Bar(x=centers, y=sketch.hist_counts, marker_color="lightgray", name="코호트"))
+            fig.add_vline(x=value, line_color="red", annotation_text=f"환자 {value:g}")
+            fig.update_layout(
+                title=f"{column} 분포 (n={sketch.count:,})",
+                height=250, margin=dict(t=40, b=20), showlegend=False,
+            )
+            st.plotly_chart(fig, key=f"percentile_{key}_{column}")
+
+
+def section_panel(section):
+    """페이지의 그래프와 안내 문구(qaqc.report.Section)를 순서대로 보여줍니다."""
+    for fig in section.figures:
+        st.plotly_chart(fig)
+    for kind, text in section.messages:
+        getattr(st, kind)(text)
+
+
+def explanation_panel(explanation, importance, top=8):
+    """환자 예측의 Feature 별 기여도(SHAP)와 코호트 전체 중요도를 보여줍니다 (importance 가 None 이면 계산 중 안내)."""
+    st.subheader("🔍 예측 근거")
+    contributions = explanation.top(top).iloc[::-1]
+    colors = ["green" if value > 0 else "red" for value in contributions["contribution"]]
+    fig = go.Figure(go.Bar(
+        x=contributions["contribution"], y=contributions["feature"], orientation="h", marker_color=colors,
+        text=[f"{value:g}" for value in contributions["value"].round(2)], textposition="auto",
+        hovertemplate="%{y}: %{x:.3f}<extra></extra>",
+    ))
+    fig.update_layout(
+        title="Feature 별 금연 가능성 기여도 (SHAP, log-odds)",
+        height=60 + 35 * len(contributions), margin=dict(t=40, b=20),
+    )
+    st.plotly_chart(fig, key="explanation_patient")
+    st.caption("🟩 금연 가능성을 높인 항목 / 🟥 낮춘 항목 (막대 안의 숫자는 환자 수치)")
+
+    with st.expander("📊 코호트 전체 기준 Feature 중요도 (평균 |SHAP|)"):
+        if importance is None:
+            # 코호트 표본 SHAP 은 백그라운드에서 계산 (qaqc.explain.warm_global_importance)
+            st.caption("⏳ 코호트 중요도를 계산하고 있습니다. 잠시 후 다시 실행하면 표시됩니다.")
+            return
+        head = importance.head(top).iloc[::-1]
+        fig = go.Figure(go.Bar(x=head.to_numpy(), y=head.index, orientation="h", marker_color="lightgray"))
+        fig.update_layout(height=60 + 35 * len(head), margin=dict(t=20, b=20))
+        st.plotly_chart(fig, key="explanation_global")
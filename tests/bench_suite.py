@@ -0,0 +1,46 @@
+"""benchmarks.suite 의 항목을 pytest 로 실행 (이름이 test_ 로 시작하지 않아 기본 테스트 실행에는 포함되지 않음).
+
+    python -m pytest tests/bench_suite.py -q                                          # 측정만
+    QAQC_BENCH_BASELINE=benchmarks/baseline.json python -m pytest tests/bench_suite.py   # 기준값 대비 회귀 시 실패
+    QAQC_BENCH_QUICK=1 python -m pytest tests/bench_suite.py -k features              # 1M 대신 100k 행
+
+기준값은 python -m benchmarks.suite --save 로 만들고, 비교 규칙(최솟값 기준, 항목별 임계값, 잡음 하한)은
+benchmarks.suite.compare 를 그대로 사용합니다.
+"""
+import json
+import os
+import warnings
+
+import pytest
+
+from benchmarks import standin
+from benchmarks.suite import build_cases, compare, time_case
+from qaqc.model_registry import get_model
+
+QUICK = os.environ.get("QAQC_BENCH_QUICK") == "1"
+BASELINE = os.environ.get("QAQC_BENCH_BASELINE")
+
+MODEL_PATH = standin.model_path()
+CASES = build_cases(MODEL_PATH, QUICK)
+
+
+@pytest.fixture(scope="module")
+def baseline():
+    if not BASELINE:
+        return None
+    with open(BASELINE, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline["meta"].get("model_version") != get_model(MODEL_PATH).version:
+        warnings.warn("기준값과 모델 버전이 다릅니다. 예측 관련 항목의 비교는 참고용입니다.")
+    return baseline
+
+
+@pytest.mark.parametrize("case", CASES, ids=lambda case: case.name)
+def test_benchmark(case, baseline, record_property):
+    result = time_case(case)
+    record_property("min_ms", round(result["min_ms"], 3))
+    record_property("median_ms", round(result["median_ms"], 3))
+    if baseline is None or case.name not in baseline["results"]:
+        return
+    (name, base_ms, current_ms, ratio, regressed), = compare({"results": {case.name: result}}, baseline)
+    assert not regressed, f"{name}: {base_ms:.3f}ms -> {current_ms:.3f}ms ({ratio:.2f}x)"
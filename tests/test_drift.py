@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from qaqc.drift import BINS, MONITORED_COLUMNS, PSI_ALERT, DriftMonitor, Reference, bin_edges
+from qaqc.features import INPUT_COLUMNS
+
+
+def _cohort(n=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame(rng.normal(100, 10, (n, len(MONITORED_COLUMNS))), columns=MONITORED_COLUMNS)
+    frame["smoking_prob_0"] = rng.uniform(0, 1, n)
+    return frame
+
+
+def test_bin_edges_ignore_missing_values():
+    values = _cohort()["HDL"].to_numpy()
+    values[::7] = np.nan
+    values[3] = np.inf
+    edges = bin_edges(values)
+
+    assert len(edges) == BINS - 1
+    assert np.isfinite(edges).all()
+    assert (np.diff(edges) > 0).all()
+
+
+def test_bin_edges_for_codes_are_midpoints():
+    assert bin_edges(np.array([1.0, 2.0, 2.0, np.nan, 1.0])).tolist() == [1.5]
+
+
+def test_psi_flags_shift_in_column_with_missing_values():
+    cohort = _cohort()
+    cohort.loc[::5, "HDL"] = np.nan
+    reference = Reference.from_frame(cohort)
+
+    same = DriftMonitor(reference, window=np.inf)
+    same.update(cohort[INPUT_COLUMNS].to_numpy(), cohort["smoking_prob_0"].to_numpy())
+    assert same.report().set_index("컬럼")["PSI"].max() < 1e-9
+
+    shifted = _cohort(seed=1)
+    shifted["HDL"] += 15
+    monitor = DriftMonitor(reference, window=np.inf)
+    monitor.update(shifted[INPUT_COLUMNS].to_numpy(), shifted["smoking_prob_0"].to_numpy())
+    psi = monitor.report().set_index("컬럼")["PSI"]
+    assert psi["HDL"] > PSI_ALERT
+    assert psi.drop("HDL").max() < 0.1
+
+
+def test_small_batch_path_matches_bulk_path():
+    cohort = _cohort()
+    reference = Reference.from_frame(cohort)
+    rows = cohort[INPUT_COLUMNS].to_numpy()[:300]
+    prob0 = cohort["smoking_prob_0"].to_numpy()[:300]
+    single = sum(reference.histogram(row, p) for row, p in zip(rows, prob0))
+    np.testing.assert_array_equal(single, reference.histogram(rows, prob0))
+
+
+
+@pytest.mark.parametrize("distinct", [6, BINS])
+def test_infinite_values_land_in_end_bins_on_both_paths(distinct):
+    cohort = _cohort()
+    # 값 종류가 적은 컬럼 (경계 distinct - 1 개, BINS 이면 채움 칸 없음)
+    cohort["Urine protein"] = np.arange(len(cohort)) % distinct
+    reference = Reference.from_frame(cohort)
+    i = MONITORED_COLUMNS.index("Urine protein")
+    n_bins = len(reference.edges[i]) + 1
+    assert n_bins == distinct
+
+    rows = cohort[INPUT_COLUMNS].to_numpy()[:3].copy()
+    rows[0, INPUT_COLUMNS.index("Urine protein")] = np.inf
+    rows[1, INPUT_COLUMNS.index("Urine protein")] = -np.inf
+    rows[2, INPUT_COLUMNS.index("HDL")] = np.inf
+    single = reference.histogram(rows)
+    # 같은 행을 반복해 SMALL_BATCH 보다 크게 만들면 searchsorted 경로
+    bulk = reference.histogram(np.repeat(rows, 100, axis=0)) // 100
+    np.testing.assert_array_equal(single, bulk)
+    # +inf 는 마지막 구간, -inf 는 첫 구간 (사용하지 않는 구간으로 빠지지 않음)
+    assert single[i, n_bins - 1] >= 1 and single[i, 0] >= 1
+    assert single[i, n_bins:].sum() == 0
+    assert single[:, :n_bins].sum(axis=1)[i] == 3
+    assert single.sum(axis=1).tolist() == [3] * len(INPUT_COLUMNS) + [0]
@@ -0,0 +1,43 @@
+import time
+
+import numpy as np
+
+from qaqc import explain
+from qaqc.explain import cached_importance, clear_importances, get_explanation_cache
+from qaqc.features import FEATURE_COLUMNS
+from qaqc.prediction_cache import get_prediction_cache
+
+
+class FakeModel:
+    version = "fake-shap"
+
+    def __init__(self):
+        self.calls = 0
+
+    def get_feature_importance(self, pool, **kwargs):
+        self.calls += 1
+        # 금연 기준으로 부호가 바뀌므로 음수로 두면 첫 Feature 가 가장 중요
+        values = np.zeros((pool.num_row(), len(FEATURE_COLUMNS) + 1))
+        values[:, 0] = -1.0
+        return values
+
+
+def test_global_importance_is_computed_in_background():
+    clear_importances()
+    model = FakeModel()
+    assert cached_importance(model, sample=50) is None
+    deadline = time.monotonic() + 10
+    importance = None
+    while importance is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+        importance = cached_importance(model, sample=50)
+    assert importance is not None
+    assert importance.index[0] == FEATURE_COLUMNS[0]
+    assert cached_importance(model, sample=50) is importance
+    assert model.calls == 1
+    assert not explain._warming
+
+
+def test_explanation_cache_is_separate_from_prediction_cache():
+    assert get_explanation_cache() is not get_prediction_cache()
+    assert get_explanation_cache().stats()["maxsize"] == explain.EXPLANATION_CACHE_SIZE
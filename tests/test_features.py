@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from qaqc.cohort_store import COHORT_CSV
+from qaqc.features import (
+    BMI_CATEGORIES, DERIVED_COLUMNS, DUMMY_COLUMNS, FEATURE_COLUMNS, INPUT_COLUMNS, FeatureTransformer,
+    bmi_category_codes, transform, transform_array,
+)
+
+
+def test_transform_matches_reference_csv():
+    cohort = pd.read_csv(COHORT_CSV)
+    features = transform(cohort[INPUT_COLUMNS])
+
+    assert list(features.columns) == FEATURE_COLUMNS
+    np.testing.assert_allclose(features[DERIVED_COLUMNS].to_numpy(), cohort[DERIVED_COLUMNS].to_numpy(), rtol=1e-12)
+    pd.testing.assert_frame_equal(features[DUMMY_COLUMNS], cohort[DUMMY_COLUMNS])
+
+
+@pytest.mark.parametrize("bmi, category", [
+    (10.0, "Underweight"),
+    (18.5, "Underweight"),
+    (np.nextafter(18.5, np.inf), "Normal"),
+    (24.9, "Normal"),
+    (25.0, "Overweight"),
+    (29.9, "Overweight"),
+    (30.0, "Obesity"),
+])
+def test_bmi_bins_match_pd_cut(bmi, category):
+    # main.py 원래 구현: pd.cut(bins=[0, 18.5, 24.9, 29.9, inf], labels=BMI_CATEGORIES)
+    expected = pd.cut([bmi], bins=[0, 18.5, 24.9, 29.9, np.inf], labels=BMI_CATEGORIES)[0]
+    assert expected == category
+    assert BMI_CATEGORIES[bmi_category_codes([bmi])[0]] == category
+
+
+def test_bmi_category_of_invalid_bmi():
+    assert bmi_category_codes([0.0, -1.0, np.nan]).tolist() == [-1, -1, -1]
+
+
+def test_dummies_drop_first_category_but_keep_the_rest():
+    # 170cm: 50kg -> 저체중, 65kg -> 정상, 80kg -> 과체중, 100kg -> 비만
+    rows = np.tile(np.array([40, 170, 65, 80] + [1] * 18, dtype=np.float64), (4, 1))
+    rows[:, INPUT_COLUMNS.index("weight(kg)")] = [50, 65, 80, 100]
+    dummies = transform(pd.DataFrame(rows, columns=INPUT_COLUMNS))[DUMMY_COLUMNS]
+    assert dummies.to_numpy().tolist() == [
+        [False, False, False],
+        [True, False, False],
+        [False, True, False],
+        [False, False, True],
+    ]
+
+
+def test_input_forms_agree():
+    cohort = pd.read_csv(COHORT_CSV, nrows=3)
+    expected = transform_array(cohort)
+    row = cohort[INPUT_COLUMNS].iloc[0]
+    np.testing.assert_array_equal(transform_array(row.to_dict()), expected[:1])
+    np.testing.assert_array_equal(transform_array(row.to_numpy()), expected[:1])
+    np.testing.assert_array_equal(FeatureTransformer().fit_transform(cohort[INPUT_COLUMNS]), expected)
+    assert list(FeatureTransformer().get_feature_names_out()) == FEATURE_COLUMNS
+
+
+def test_wrong_number_of_columns():
+    with pytest.raises(ValueError):
+        transform_array(np.zeros((2, len(INPUT_COLUMNS) - 1)))
+
+
+def test_zero_denominators_follow_pandas():
+    values = dict(zip(INPUT_COLUMNS, [40, 170, 65, 80] + [1] * 18))
+    values["HDL"] = 0
+    features = transform_array(values)[0]
+    assert np.isinf(features[FEATURE_COLUMNS.index("triglyceride/HDL")])
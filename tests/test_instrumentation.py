@@ -0,0 +1,48 @@
+import threading
+
+import pytest
+
+from qaqc import instrumentation
+from qaqc.instrumentation import begin_request, count, end_request, is_enabled, stage
+
+
+@pytest.fixture(autouse=True)
+def clean_state():
+    assert not is_enabled()
+    instrumentation.reset()
+    yield
+    end_request()
+    instrumentation.reset()
+
+
+def test_disabled_stage_is_noop():
+    begin_request("main")
+    assert stage("predict") is instrumentation._NOOP
+    assert end_request() is None
+
+
+def test_per_request_enable_only_measures_this_thread():
+    other = []
+
+    def other_session():
+        # 다른 세션(스레드)은 측정하지 않는 요청을 실행
+        begin_request("main", enabled=False)
+        other.append(stage("predict") is instrumentation._NOOP)
+        end_request()
+
+    begin_request("main", enabled=True)
+    with stage("predict"):
+        with stage("features"):
+            pass
+    count("clicks")
+    thread = threading.Thread(target=other_session)
+    thread.start()
+    thread.join()
+    record = end_request()
+
+    assert other == [True]
+    assert not is_enabled()
+    assert [item["path"] for item in record["stages"]] == [["predict"], ["predict", "features"]]
+    assert 'qaqc_events_total{name="clicks"} 1' in instrumentation.prometheus_text()
+    # 요청이 끝나면 다시 no-op
+    assert stage("predict") is instrumentation._NOOP
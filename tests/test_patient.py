@@ -0,0 +1,48 @@
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from qaqc.cohort_store import COHORT_CSV
+from qaqc.features import INPUT_COLUMNS
+from qaqc.patient import PatientRecord
+
+
+@pytest.fixture
+def record():
+    return PatientRecord.from_columns(pd.read_csv(COHORT_CSV, nrows=1)[INPUT_COLUMNS].iloc[0].to_dict())
+
+
+def test_columns_round_trip(record):
+    assert PatientRecord.from_columns(record.to_columns()) == record
+    assert list(record.to_columns()) == INPUT_COLUMNS
+    assert record.value("HDL") == record.HDL
+    assert record.as_array().tolist() == list(record.to_columns().values())
+
+
+def test_bmi(record):
+    assert record.bmi == pytest.approx(record.weight / (record.height / 100) ** 2)
+
+
+def test_valid_record_has_no_errors(record):
+    assert record.validate() == []
+
+
+@pytest.mark.parametrize("field, text", [
+    ("age", "나이"), ("height", "키"), ("weight", "몸무게"), ("waist", "허리 둘레"),
+    ("HDL", "HDL"), ("relaxation", "이완기 혈압"),
+])
+@pytest.mark.parametrize("value", [0.0, -1.0])
+def test_non_positive_values_are_rejected(record, field, text, value):
+    errors = replace(record, **{field: value}).validate()
+    assert len(errors) == 1
+    assert text in errors[0]
+
+
+def test_invalid_mask_agrees_with_validate():
+    rng = np.random.default_rng(0)
+    rows = rng.choice([-1.0, 0.0, 1.0, 50.0], size=(500, len(INPUT_COLUMNS)), p=[0.02, 0.03, 0.45, 0.5])
+    expected = [bool(PatientRecord(*row).validate()) for row in rows]
+    assert PatientRecord.invalid_mask(rows).tolist() == expected
+    assert any(expected) and not all(expected)
@@ -0,0 +1,53 @@
+import time
+
+import numpy as np
+
+from qaqc.prediction_cache import PredictionCache, prediction_key
+
+
+def test_key_is_canonical():
+    values = [40.0, 0.0, 1.5]
+    assert prediction_key(values, "v1") == prediction_key(np.array(values, dtype=np.float32), "v1")
+    assert prediction_key([40.0, -0.0, 1.5], "v1") == prediction_key(values, "v1")
+    assert prediction_key(values, "v1") != prediction_key(values, "v2")
+    assert prediction_key(values, "v1") != prediction_key([40.0, 0.0, 1.6], "v1")
+
+
+def test_compute_runs_once_per_key():
+    cache = PredictionCache(maxsize=8, ttl=60)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return "result"
+
+    assert cache.get_or_compute("a", compute) == "result"
+    assert cache.get_or_compute("a", compute) == "result"
+    assert len(calls) == 1
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+
+
+def test_lru_eviction_is_counted():
+    cache = PredictionCache(maxsize=2, ttl=60)
+    for key in "abc":
+        cache.get_or_compute(key, lambda: key)
+    stats = cache.stats()
+    assert (stats["size"], stats["evictions"]) == (2, 1)
+
+
+def test_entries_expire_after_ttl():
+    cache = PredictionCache(maxsize=8, ttl=0.05)
+    cache.get_or_compute("a", lambda: 1)
+    time.sleep(0.1)
+    assert cache.get_or_compute("a", lambda: 2) == 2
+    stats = cache.stats()
+    assert stats["misses"] == 2
+    assert stats["expirations"] >= 1
+
+
+def test_clear():
+    cache = PredictionCache(maxsize=8, ttl=60)
+    cache.get_or_compute("a", lambda: 1)
+    cache.clear()
+    assert cache.get_or_compute("a", lambda: 2) == 2
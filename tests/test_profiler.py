@@ -0,0 +1,67 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from qaqc.profiler import Profile, profile_file, to_html
+
+DIRTY_CSV = """\
+"Patient_ID","age","HDL","relaxation","hearing(left)","note"
+1,40,41,70,1,ok
+2,45,abc,0,1,ok
+3,,55,80,3,"a, b"
+3,50,60,seventy,1,ok
+x,30,0,75,2,ok
+"""
+
+
+@pytest.fixture
+def dirty_csv(tmp_path):
+    path = tmp_path / "dirty.csv"
+    path.write_text(DIRTY_CSV, encoding="utf-8")
+    return str(path)
+
+
+def _violations(report):
+    return {item["rule"]: item for item in report["violations"]}
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_dirty_cells_are_reported_not_raised(dirty_csv, workers):
+    report = profile_file(dirty_csv, workers=workers, chunk_size=2).to_dict()
+    violations = _violations(report)
+
+    assert report["rows"] == 5
+    assert violations["HDL_non_numeric"]["count"] == 1
+    assert violations["HDL_non_numeric"]["examples"] == [2]
+    assert violations["relaxation_non_numeric"]["count"] == 1
+    assert violations["Patient_ID_non_numeric"]["count"] == 1
+    assert violations["HDL_positive"]["count"] == 1
+    assert violations["relaxation_positive"]["count"] == 1
+    assert violations["hearing(left)_code"]["examples"] == [3]
+    assert report["columns"]["HDL"]["count"] == 4
+    # 숫자가 아닌 칸은 결측과 따로 셈
+    assert report["columns"]["HDL"]["non_numeric"] == 1
+    assert report["columns"]["HDL"]["missing"] == 0
+    assert report["columns"]["age"]["missing"] == 1
+    assert report["columns"]["age"]["non_numeric"] == 0
+    assert report["text_columns"] == ["note"]
+    assert report["patient_id"]["duplicates"] == 1
+    json.dumps(report, allow_nan=False)
+    assert "HDL_non_numeric" in to_html(report)
+
+
+def test_matches_pandas_on_clean_columns():
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame({"Patient_ID": np.arange(1000), "age": rng.normal(45, 10, 1000)})
+    profile = Profile()
+    for start in range(0, 1000, 300):
+        profile.update(frame.iloc[start:start + 300])
+    stats = profile.to_dict()["columns"]["age"]
+
+    assert stats["count"] == 1000
+    assert stats["mean"] == pytest.approx(frame["age"].mean())
+    assert stats["std"] == pytest.approx(frame["age"].std())
+    assert stats["skew"] == pytest.approx(frame["age"].skew(), abs=1e-2)
+    assert stats["quantiles"]["p50"] == pytest.approx(frame["age"].median(), rel=0.02)
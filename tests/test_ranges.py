@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from qaqc.ranges import DANGER, NORMAL, RANGES, WARNING, classify, flag_frame, get_range
+
+
+@pytest.mark.parametrize("key", sorted(RANGES, key=str))
+def test_bands_are_ordered(key):
+    reference_range = RANGES[key]
+    assert (np.diff(reference_range.edges) > 0).all()
+    assert any(band.severity == NORMAL for band in reference_range.bands)
+
+
+@pytest.mark.parametrize("column, value, label", [
+    ("hemoglobin", 13.4, "경고 (낮음)"),
+    ("hemoglobin", 13.5, "정상"),
+    ("hemoglobin", 17.5, "경고 (높음)"),
+    ("BMI", 24.9, "정상"),
+    ("BMI", 30, "비만"),
+    ("HDL", 39.9, "위험"),
+    ("HDL", 60, "정상"),
+    ("Cholesterol", 240, "위험"),
+    # AST/ALT/Gtp 는 상한 '초과' 부터 높음
+    ("AST", 40, "정상"),
+    ("AST", 40.01, "높음"),
+    ("Gtp", 71, "정상"),
+    # 혈청 크레아티닌은 mg/dL (정상 0.5~1.2, 1.2 초과부터 높음)
+    ("serum creatinine", 0.49, "낮음"),
+    ("serum creatinine", 0.5, "정상"),
+    ("serum creatinine", 0.9, "정상"),
+    ("serum creatinine", 1.2, "정상"),
+    ("serum creatinine", 1.21, "높음"),
+])
+def test_band_boundaries(column, value, label):
+    assert get_range(column).band(value).label == label
+
+
+def test_classify_is_vectorised():
+    values = np.array([5, 10, 15, 18, 22])
+    assert classify("hemoglobin", values).tolist() == [0, 1, 2, 3, 4]
+    assert [get_range("hemoglobin").bands[i].severity for i in classify("hemoglobin", values)] == [
+        DANGER, WARNING, NORMAL, WARNING, DANGER,
+    ]
+
+
+def test_reference_value():
+    assert get_range("Cholesterol").reference_value == 200
+    # HDL 은 높을수록 좋으므로 정상 구간의 하한
+    assert get_range("HDL").reference_value == 60
+
+
+def test_sex_specific_range_falls_back_to_common():
+    assert get_range("waist(cm)", sex="F") is get_range("waist(cm)")
+
+
+def test_creatinine_sex_specific_ranges():
+    assert get_range("serum creatinine", sex="M").band(1.25).label == "정상"
+    assert get_range("serum creatinine", sex="F").band(1.15).label == "높음"
+    assert get_range("serum creatinine").unit == "mg/dL"
+
+
+def test_flag_frame():
+    frame = pd.DataFrame({"hemoglobin": [15.0, 8.0], "AST": [20.0, 80.0], "note": ["a", "b"]}, index=[10, 11])
+    flags = flag_frame(frame)
+    assert list(flags.columns) == ["hemoglobin_abnormal", "AST_abnormal"]
+    assert list(flags.index) == [10, 11]
+    assert flags.to_numpy().tolist() == [[False, False], [True, True]]
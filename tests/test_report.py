@@ -0,0 +1,60 @@
+import io
+import zipfile
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from qaqc import report
+from qaqc.features import INPUT_COLUMNS
+from tests.test_service import VALID
+
+
+class FakePredictor:
+    """모델 없이 age/100 을 smoking_prob_0 으로 돌려주는 예측기."""
+
+    model = SimpleNamespace(version="fake")
+
+    def __init__(self, *args, **kwargs):
+        self.rows = 0
+
+    def predict_proba(self, rows):
+        self.rows += len(rows)
+        prob0 = rows[:, INPUT_COLUMNS.index("age")] / 100
+        return np.column_stack([prob0, 1 - prob0])
+
+
+@pytest.fixture
+def renderer(monkeypatch):
+    monkeypatch.setattr(report, "get_model", lambda path: None)
+    monkeypatch.setattr(report, "Predictor", FakePredictor)
+    return report.ReportRenderer()
+
+
+def test_non_finite_rows_get_no_report(renderer):
+    chunk = pd.DataFrame([VALID] * 4, dtype=np.float64)
+    chunk.loc[1, "weight(kg)"] = np.nan
+    chunk.loc[2, "Gtp"] = np.inf
+    chunk.loc[3, "HDL"] = 0
+    results = renderer.render_chunk(chunk)
+
+    assert [name for name, _, _ in results] == ["patient_1.html", None, None, None]
+    assert renderer.predictor.rows == 1
+    errors = [row[3] for _, _, row in results]
+    assert errors[0] == ""
+    assert "유한한 숫자" in errors[1] and "유한한 숫자" in errors[2]
+    assert "HDL" in errors[3]
+
+
+def test_invalid_rows_are_listed_in_manifest(renderer, tmp_path):
+    writer = report.ReportWriter(str(tmp_path / "reports.zip"))
+    chunk = pd.DataFrame([VALID, {**VALID, "waist(cm)": np.nan}]).assign(Patient_ID=["a", "b"])
+    writer.add(renderer.render_chunk(chunk))
+    writer.close()
+
+    with zipfile.ZipFile(tmp_path / "reports.zip") as archive:
+        manifest = pd.read_csv(io.BytesIO(archive.read(report.MANIFEST_NAME)))
+        assert "patient_b.html" not in archive.namelist()
+    assert manifest["file"].isna().tolist() == [False, True]
+    assert manifest["error"].isna().tolist() == [True, False]
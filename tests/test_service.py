@@ -0,0 +1,88 @@
+import json
+
+from tornado.testing import AsyncHTTPTestCase
+
+from qaqc.features import INPUT_COLUMNS
+from qaqc.service import NDJSON, MicroBatcher, make_app
+
+VALID = {
+    "age": 40, "height(cm)": 170, "weight(kg)": 65, "waist(cm)": 75.1, "eyesight(left)": 1.0,
+    "eyesight(right)": 0.9, "hearing(left)": 1, "hearing(right)": 1, "systolic": 120, "relaxation": 70,
+    "fasting blood sugar": 102, "Cholesterol": 225, "triglyceride": 260, "HDL": 41, "LDL": 132,
+    "hemoglobin": 15.7, "Urine protein": 1, "serum creatinine": 0.8, "AST": 24, "ALT": 26, "Gtp": 32,
+    "dental caries": 0,
+}
+INVALID = {**VALID, "HDL": 0, "relaxation": 0}
+
+
+class FakeBatcher(MicroBatcher):
+    """모델 없이 age/100 을 smoking_prob_0 으로 돌려주는 배처."""
+
+    def __init__(self):
+        super().__init__(max_wait=0)
+        self.scored = 0
+
+    def _score(self, rows):
+        self.scored += len(rows)
+        prob0 = rows[:, INPUT_COLUMNS.index("age")] / 100
+        return (prob0 < 0.5).astype(int), prob0, "fake"
+
+
+class ServiceTest(AsyncHTTPTestCase):
+    def get_app(self):
+        self.batcher = FakeBatcher()
+        return make_app(self.batcher)
+
+    def post(self, path, body, **headers):
+        return self.fetch(path, method="POST", body=body, headers=headers)
+
+    def test_predict_valid(self):
+        response = self.post("/predict", json.dumps(VALID))
+        self.assertEqual(response.code, 200)
+        self.assertEqual(json.loads(response.body),
+                         {"smoking_pred": 1, "smoking_prob_0": 0.4, "model_version": "fake"})
+
+    def test_predict_rejects_invalid_record(self):
+        response = self.post("/predict", json.dumps(INVALID))
+        self.assertEqual(response.code, 422)
+        body = json.loads(response.body)
+        self.assertEqual(body["invalid"][0]["index"], 0)
+        self.assertEqual(len(body["invalid"][0]["errors"]), 2)
+        self.assertEqual(self.batcher.scored, 0)
+
+    def test_predict_missing_field(self):
+        record = dict(VALID)
+        del record["HDL"]
+        response = self.post("/predict", json.dumps(record))
+        self.assertEqual(response.code, 400)
+        self.assertEqual(json.loads(response.body), {"error": "missing field: HDL"})
+
+    def test_batch_rejects_whole_array(self):
+        response = self.post("/predict/batch", json.dumps([VALID, INVALID, VALID]))
+        self.assertEqual(response.code, 422)
+        self.assertEqual([item["index"] for item in json.loads(response.body)["invalid"]], [1])
+        self.assertEqual(self.batcher.scored, 0)
+
+    def test_batch_valid(self):
+        response = self.post("/predict/batch", json.dumps([VALID, {**VALID, "age": 60}]))
+        self.assertEqual(response.code, 200)
+        results = json.loads(response.body)["results"]
+        self.assertEqual([r["smoking_pred"] for r in results], [1, 0])
+
+    def test_ndjson_reports_bad_lines_in_place(self):
+        lines = [json.dumps(VALID), json.dumps(INVALID), "{not json", json.dumps({"age": 1}), json.dumps(VALID)]
+        response = self.post("/predict/batch", "\n".join(lines) + "\n", **{"Content-Type": NDJSON})
+        self.assertEqual(response.code, 200)
+        out = [json.loads(line) for line in response.body.decode().splitlines()]
+        self.assertEqual(len(out), 5)
+        self.assertEqual(out[0]["smoking_prob_0"], 0.4)
+        self.assertEqual(out[1]["error"], "invalid input")
+        self.assertEqual(len(out[1]["errors"]), 2)
+        self.assertEqual(out[2], {"error": "invalid NDJSON line"})
+        self.assertTrue(out[3]["error"].startswith("missing field"))
+        self.assertEqual(out[4]["smoking_prob_0"], 0.4)
+        self.assertEqual(self.batcher.scored, 2)
+
+    def test_non_finite_values_rejected(self):
+        response = self.post("/predict", json.dumps({**VALID, "LDL": float("nan")}))
+        self.assertEqual(response.code, 422)
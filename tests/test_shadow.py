@@ -0,0 +1,43 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from qaqc.model_registry import LoadedModel, wrap_model
+from qaqc.shadow import CHAMPION, ShadowScorer
+
+
+class PlainEstimator:
+    """sklearn 처럼 predict_proba(X) 만 받는 모델 (thread_count 를 넘기면 TypeError)."""
+
+    classes_ = np.array([0, 1])
+
+    def __init__(self, prob0):
+        self.prob0 = prob0
+
+    def predict_proba(self, features):
+        return np.tile([self.prob0, 1 - self.prob0], (len(features), 1))
+
+
+def test_wrap_model():
+    model = wrap_model(PlainEstimator(0.9))
+    assert isinstance(model, LoadedModel)
+    assert model.path is None and model.size > 0
+    assert wrap_model(model) is model
+    assert wrap_model(PlainEstimator(0.9)).version == model.version
+    assert wrap_model(PlainEstimator(0.1)).version != model.version
+
+
+def test_object_challenger_does_not_get_catboost_kwargs():
+    champion = wrap_model(PlainEstimator(0.9))
+    scorer = ShadowScorer({"plain": PlainEstimator(0.8), "flipped": PlainEstimator(0.2)})
+    result = SimpleNamespace(features=np.zeros(31), prediction=np.array([0]), probability=0.9)
+    for _ in range(3):
+        assert scorer.submit(champion, result)
+    scorer.flush()
+
+    report = scorer.report().set_index("모델")
+    assert report["오류"].tolist() == [0, 0, 0]
+    assert report["요청 수"].tolist() == [3, 3, 3]
+    assert report.loc["plain", "라벨 일치율(%)"] == 100.0
+    assert report.loc["flipped", "라벨 일치율(%)"] == 0.0
+    assert report.loc[CHAMPION, "버전"] == champion.version
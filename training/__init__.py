@@ -0,0 +1,31 @@
+# ✅ 학습 전용 패키지
+# sklearn / imblearn / joblib 은 import 비용이 크고 추론(main.py)에서는 쓰이지 않으므로,
+# 실제로 이름에 접근할 때만 import 합니다. (예: `from training import SMOTE`)
+import importlib
+
+_LAZY_IMPORTS = {
+    "resample": "sklearn.utils",
+    "train_test_split": "sklearn.model_selection",
+    "StratifiedKFold": "sklearn.model_selection",
+    "RandomizedSearchCV": "sklearn.model_selection",
+    "StandardScaler": "sklearn.preprocessing",
+    "SMOTE": "imblearn.over_sampling",
+    "Pipeline": "imblearn.pipeline",
+    "CatBoostClassifier": "catboost",
+    "joblib": None,
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name):
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name = _LAZY_IMPORTS[name]
+    if module_name is None:
+        value = importlib.import_module(name)
+    else:
+        value = getattr(importlib.import_module(module_name), name)
+    # 한 번 import 한 뒤에는 모듈 속성으로 캐시
+    globals()[name] = value
+    return value
@@ -0,0 +1,220 @@
+"""코호트 파일로부터 CatBoost 모델을 다시 학습합니다.
+
+학습한 모델은 기본적으로 files/models/catboost_<시각>.pkl 에 새 버전으로 저장합니다.
+운영 모델(files/catboost_model(final).pkl, 앱이 파일 변경을 감지해 바로 다시 로드)은
+--replace-production 을 줄 때만 덮어씁니다.
+
+단계: features(파일 읽기 + Feature Engineering, 디스크 캐시) -> split -> search(RandomizedSearchCV) -> evaluate -> save
+SMOTE 는 imblearn Pipeline 안에 두어 각 fold 의 학습 데이터에만 적용됩니다.
+(fold 나누기 전에 SMOTE 를 하면 검증 fold 에 합성 샘플이 섞여 점수가 부풀려짐)
+
+    python -m training.pipeline files/test_with_predictions.csv --target smoking_pred --n-iter 20 --jobs 4
+    python -m training.pipeline cohort.parquet --replace-production
+"""
+import argparse
+import json
+import os
+import pickle
+import sys
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from qaqc.features import FEATURE_COLUMNS, INPUT_COLUMNS, transform
+from qaqc.model_registry import MODEL_PATH
+from training import (
+    SMOTE,
+    CatBoostClassifier,
+    Pipeline,
+    RandomizedSearchCV,
+    StratifiedKFold,
+    joblib,
+    resample,
+    train_test_split,
+)
+
+CACHE_DIR = "files/.training_cache"
+MODELS_DIR = "files/models"
+REPORT_PATH = "files/training_report.json"
+DEFAULT_TARGET = "smoking"
+RANDOM_STATE = 42
+
+# ✅ 탐색 범위 (SMOTE 이웃 수도 함께 탐색)
+PARAM_DISTRIBUTIONS = {
+    "smote__k_neighbors": [3, 5, 7],
+    "model__iterations": [300, 500, 800],
+    "model__depth": [4, 6, 8],
+    "model__learning_rate": [0.03, 0.05, 0.1],
+    "model__l2_leaf_reg": [1, 3, 5, 9],
+}
+
+
+class StageTimer:
+    """단계별 경과 시간(초)을 기록합니다."""
+
+    def __init__(self, log=sys.stderr):
+        self.timings = {}
+        self.log = log
+
+    @contextmanager
+    def stage(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            self.timings[name] = round(elapsed, 3)
+            print(f"  ⏱️ {name:10s} {elapsed:8.2f}s", file=self.log)
+
+
+def read_cohort_file(path):
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+
+def _engineer(path, target, fingerprint):
+    # fingerprint(mtime, 크기)는 캐시 키 용도: 파일이 바뀌면 다시 계산
+    cohort = read_cohort_file(path)
+    if target not in cohort.columns:
+        raise KeyError(f"대상 컬럼 {target!r} 이(가) {path} 에 없습니다.")
+    features = transform(cohort[INPUT_COLUMNS])[FEATURE_COLUMNS].astype(np.float32)
+    return features, cohort[target].to_numpy()
+
+
+def engineer_features(path, target, cache_dir=CACHE_DIR):
+    """Feature Engineering 결과(X, y)를 joblib.Memory 로 디스크에 캐시합니다."""
+    stat = os.stat(path)
+    cached = joblib.Memory(cache_dir, verbose=0).cache(_engineer)
+    return cached(os.path.abspath(path), target, (stat.st_mtime_ns, stat.st_size))
+
+
+def build_search(n_iter, cv, jobs, threads_per_job):
+    pipeline = Pipeline([
+        ("smote", SMOTE(random_state=RANDOM_STATE)),
+        ("model", CatBoostClassifier(
+            thread_count=threads_per_job, random_seed=RANDOM_STATE, verbose=0, allow_writing_files=False,
+        )),
+    ])
+    return RandomizedSearchCV(
+        pipeline,
+        PARAM_DISTRIBUTIONS,
+        n_iter=n_iter,
+        scoring="roc_auc",
+        cv=StratifiedKFold(n_splits=cv, shuffle=True, random_state=RANDOM_STATE),
+        n_jobs=jobs,
+        random_state=RANDOM_STATE,
+        refit=True,
+    )
+
+
+def versioned_path(directory=MODELS_DIR):
+    """새 모델 파일 경로 (files/models/catboost_<YYYYmmdd-HHMMSS>.pkl)."""
+    return os.path.join(directory, f"catboost_{time.strftime('%Y%m%d-%H%M%S')}.pkl")
+
+
+def _is_production(path):
+    return os.path.abspath(path) == os.path.abspath(MODEL_PATH)
+
+
+def train(cohort_path, output_path=None, target=DEFAULT_TARGET, n_iter=20, cv=5, jobs=None,
+          sample=None, test_size=0.2, cache_dir=CACHE_DIR, replace_production=False, log=sys.stderr):
+    """모델을 학습해 pickle 로 저장하고 보고서(dict)를 반환합니다.
+
+    output_path=None 이면 versioned_path(). 운영 모델 경로(MODEL_PATH)는 replace_production=True 일 때만 씁니다.
+    """
+    from sklearn.metrics import accuracy_score, roc_auc_score
+
+    if output_path is None:
+        output_path = MODEL_PATH if replace_production else versioned_path()
+    if _is_production(output_path) and not replace_production:
+        # 🚨 실행 중인 앱이 바로 다시 로드하므로 실수로 덮어쓰지 않도록
+        raise ValueError(f"운영 모델 {MODEL_PATH} 을(를) 덮어쓰려면 replace_production=True (--replace-production) 가 필요합니다.")
+
+    timer = StageTimer(log)
+    cpus = os.cpu_count() or 1
+    jobs = min(jobs or cpus, n_iter * cv)
+    # 프로세스 수 x 프로세스당 스레드 수가 코어 수를 넘지 않도록 제한 (과다 구독 방지)
+    threads_per_job = max(1, cpus // jobs)
+
+    with timer.stage("features"):
+        features, labels = engineer_features(cohort_path, target, cache_dir)
+
+    with timer.stage("split"):
+        if sample and sample < len(features):
+            features, labels = resample(
+                features, labels, n_samples=sample, replace=False, stratify=labels, random_state=RANDOM_STATE,
+            )
+        x_train, x_test, y_train, y_test = train_test_split(
+            features, labels, test_size=test_size, stratify=labels, random_state=RANDOM_STATE,
+        )
+
+    with timer.stage("search"):
+        search = build_search(n_iter, cv, jobs, threads_per_job)
+        # loky 워커 프로세스 안의 OpenMP/BLAS 스레드 수도 같은 값으로 제한
+        with joblib.parallel_config(backend="loky", inner_max_num_threads=threads_per_job):
+            search.fit(x_train, y_train)
+
+    with timer.stage("evaluate"):
+        model = search.best_estimator_.named_steps["model"]
+        prob = model.predict_proba(x_test)
+        metrics = {
+            "roc_auc": float(roc_auc_score(y_test, prob[:, 1])),
+            "accuracy": float(accuracy_score(y_test, model.classes_[prob.argmax(axis=1)])),
+        }
+
+    with timer.stage("save"):
+        # 추론에는 SMOTE 가 필요 없으므로 CatBoost 모델만 저장 (qaqc.model_registry 가 pickle 로 로드)
+        # 임시 파일에 쓴 뒤 교체: 앱이 반쯤 쓰인 파일을 다시 로드하지 않도록
+        os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+        tmp_path = f"{output_path}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(model, f)
+        os.replace(tmp_path, output_path)
+
+    return {
+        "cohort": cohort_path,
+        "target": target,
+        "rows": {"train": len(x_train), "test": len(x_test)},
+        "jobs": jobs,
+        "threads_per_job": threads_per_job,
+        "best_params": search.best_params_,
+        "cv_roc_auc": float(search.best_score_),
+        "test": metrics,
+        "timings": timer.timings,
+        "output": output_path,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CatBoost 흡연 예측 모델 재학습")
+    parser.add_argument("cohort", help="학습용 코호트 CSV 또는 Parquet")
+    parser.add_argument("--output", default=None, help=f"저장할 모델(pickle) 경로 (기본: {MODELS_DIR}/catboost_<시각>.pkl)")
+    parser.add_argument("--replace-production", action="store_true",
+                        help=f"운영 모델 {MODEL_PATH} 을(를) 덮어씀 (실행 중인 앱이 바로 다시 로드)")
+    parser.add_argument("--target", default=DEFAULT_TARGET, help="정답 컬럼 이름")
+    parser.add_argument("--n-iter", type=int, default=20, help="RandomizedSearchCV 후보 수")
+    parser.add_argument("--cv", type=int, default=5, help="fold 수")
+    parser.add_argument("--jobs", type=int, default=None, help="워커 프로세스 수 (기본: 코어 수)")
+    parser.add_argument("--sample", type=int, default=None, help="층화 샘플링할 행 수 (빠른 확인용)")
+    parser.add_argument("--cache-dir", default=CACHE_DIR, help="Feature 캐시 디렉터리")
+    parser.add_argument("--report", default=REPORT_PATH, help="결과/단계별 시간 JSON 경로")
+    args = parser.parse_args(argv)
+    if args.output is not None and _is_production(args.output) and not args.replace_production:
+        parser.error(f"운영 모델 {MODEL_PATH} 을(를) 덮어쓰려면 --replace-production 을 함께 지정하세요")
+
+    report = train(
+        args.cohort, args.output, args.target, args.n_iter, args.cv, args.jobs, args.sample,
+        cache_dir=args.cache_dir, replace_production=args.replace_production,
+    )
+    with open(args.report, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2, default=str)
+    print(f"✅ {report['output']}  test ROC AUC {report['test']['roc_auc']:.4f}  "
+          f"total {sum(report['timings'].values()):.1f}s  -> {args.report}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())